@@ -0,0 +1,55 @@
+"""
+Сравнение памяти и времени преобразования строк результата запроса:
+словари (DBManager._vacancy_row_to_dict) против компактных VacancyRow.
+
+Запуск: python -m benchmarks.bench_rows [количество строк]
+"""
+# Импортируем необходимые библиотеки и модули
+import gc
+import sys
+import time
+import tracemalloc
+
+# Импортируем нужные классы
+from scr.db_manager import DBManager, VacancyRow
+
+
+def make_rows(count: int):
+    """Создает строки в том виде, в котором их возвращает курсор psycopg2."""
+    return [(f"Employer {i % 100}", f"Vacancy {i}", 100000 + i, 150000 + i, "RUR", f"https://hh.ru/vacancy/{i}")
+            for i in range(count)]
+
+
+def measure(convert, rows):
+    """Возвращает (время преобразования в секундах, дополнительную память на строку в байтах)."""
+    gc.collect()
+    start = time.perf_counter()
+    convert(rows)
+    elapsed = time.perf_counter() - start
+
+    # Память измеряется отдельным прогоном: tracemalloc заметно замедляет выделения
+    gc.collect()
+    tracemalloc.start()
+    result = convert(rows)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, memory / len(rows)
+
+
+def main(count: int = 200_000) -> None:
+    rows = make_rows(count)
+    variants = {
+        "dict": lambda data: DBManager._process_vacancy_rows(data),
+        "VacancyRow": lambda data: DBManager._process_vacancy_rows(data, compact=True),
+    }
+    print(f"Строк: {count}")
+    for name, convert in variants.items():
+        elapsed, per_row = measure(convert, rows)
+        print(f"{name:>10}: {elapsed * 1000:8.1f} мс, {per_row:6.0f} байт на строку")
+    print(f"sys.getsizeof: dict = {sys.getsizeof(DBManager._vacancy_row_to_dict(rows[0]))} байт, "
+          f"VacancyRow = {sys.getsizeof(VacancyRow._make(rows[0]))} байт")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,134 @@
+"""
+Локальный HTTP-сервер, имитирующий API HH.ru на синтетических данных (SyntheticData):
+/vacancies (employer_id, page, per_page, date_from, date_to), /employers/{id} и /dictionaries.
+Как и настоящий API, отдает не больше max_results вакансий по одному запросу поиска.
+"""
+# Импортируем необходимые библиотеки и модули
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from math import ceil
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+
+# Импортируем нужные классы
+from benchmarks.synthetic import SyntheticData
+
+
+class FakeHHHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов к поддельному API HH.ru. Данные и настройки берутся из сервера."""
+
+    def do_GET(self):
+        server: FakeHHServer = self.server.owner
+        if server.delay:
+            time.sleep(server.delay)
+        server.count_request()
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+
+        if parsed.path == "/vacancies":
+            if "employer_id" not in query:
+                self._send_empty(400)  # Поддельный API умеет искать только вакансии работодателя
+                return
+            body = self._vacancies(server, query)
+        elif parsed.path.startswith("/employers/"):
+            body = server.data.employer(int(parsed.path.rsplit("/", 1)[1]))
+        elif parsed.path == "/dictionaries":
+            body = server.data.currency_dictionary()
+        else:
+            body = None
+
+        if body is None:
+            self._send_empty(404)
+            return
+        payload = json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_empty(self, status: int) -> None:
+        """Отправляет ответ с кодом status без тела."""
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    @staticmethod
+    def _vacancies(server: "FakeHHServer", query) -> Optional[dict]:
+        """Формирует страницу результатов поиска вакансий работодателя."""
+        employer_id = int(query["employer_id"][0])
+        if server.data.employer(employer_id) is None:
+            return {"items": [], "found": 0, "pages": 0, "page": 0}
+        page = int(query.get("page", ["0"])[0])
+        per_page = int(query.get("per_page", ["20"])[0])
+        date_from = datetime.fromisoformat(query["date_from"][0]) if "date_from" in query else None
+        date_to = datetime.fromisoformat(query["date_to"][0]) if "date_to" in query else None
+
+        start, stop = server.data.index_range(date_from, date_to)
+        found = stop - start
+        if (page + 1) * per_page > server.max_results:
+            return None  # Настоящий API не отдает страницы за пределом 2000 результатов
+        first = start + page * per_page
+        items = list(server.data.vacancies(employer_id, first, min(first + per_page, stop)))
+        return {"items": items, "found": found, "pages": ceil(min(found, server.max_results) / per_page),
+                "page": page, "per_page": per_page}
+
+    def log_message(self, format, *args):
+        pass  # Не засоряем вывод замеров
+
+
+class FakeHHServer:
+    """
+    Поддельный API HH.ru в отдельном потоке. Поддерживает протокол контекстного менеджера:
+    сервер запускается при входе в блок with и останавливается при выходе.
+    """
+
+    def __init__(self, data: SyntheticData, delay: float = 0.0, max_results: int = 2000):
+        """
+        Инициализирует экземпляр класса.
+        data: Синтетические данные, которые отдает сервер.
+        delay: Искусственная задержка ответа в секундах (имитация сети).
+        max_results: Сколько результатов поиска можно получить постранично.
+        """
+        self.data = data
+        self.delay = delay
+        self.max_results = max_results
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Адрес сервера, который передается в HHApi как base_url."""
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def count_request(self) -> None:
+        """Учитывает обработанный запрос."""
+        with self._lock:
+            self.requests += 1
+
+    def start(self) -> "FakeHHServer":
+        """Запускает сервер на свободном порту."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), FakeHHHandler)
+        self._server.daemon_threads = True
+        self._server.owner = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Останавливает сервер."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeHHServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
@@ -0,0 +1,239 @@
+"""
+Замеры производительности загрузки и запросов на синтетических данных.
+
+Поднимает поддельный API HH.ru (benchmarks.fake_server) с заданным объемом данных и замеряет:
+  - hh_api_fetch: получение всех вакансий через HHApi (с разбиением по датам публикации);
+  - fill: заполнение базы тем же путем, что и команда ingest в main.py (нужен PostgreSQL);
+  - queries: каждый запрос DBManager без кэша (нужен PostgreSQL).
+Результаты сохраняются в JSON вместе с текущим коммитом, чтобы сравнивать их между версиями.
+
+Запуск:
+    python -m benchmarks.run --employers 10 --vacancies 5000 --output results.json
+    python -m benchmarks.run --skip-db --compare old.json
+Для замеров с базой данных нужна переменная окружения POSTGRES_PASSWORD (как для main.py);
+база данных для замеров создается заново и удаляется в конце (если не указан --keep-db).
+"""
+# Импортируем необходимые библиотеки и модули
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+# Импортируем нужные классы и методы
+from benchmarks.fake_server import FakeHHServer
+from benchmarks.synthetic import SyntheticData
+from scr.api_function import HHApi
+
+BENCH_DB_NAME = "hh_benchmark"
+
+
+def timed(function: Callable, repeat: int = 5) -> Dict[str, float]:
+    """Выполняет функцию repeat раз и возвращает минимальное, медианное и максимальное время в секундах."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    stats = {"min": min(times), "median": statistics.median(times), "max": max(times), "repeat": repeat}
+    if isinstance(result, (list, dict)):
+        stats["rows"] = len(result)
+    elif hasattr(result, "items") and isinstance(result.items, list):
+        stats["rows"] = len(result.items)  # Страница вакансий (VacancyPage)
+    return stats
+
+
+def create_bench_api(server: FakeHHServer, max_workers: int) -> HHApi:
+    """Создает HHApi, который получает все вакансии с поддельного сервера без ограничения частоты запросов."""
+    hh_api = HHApi(base_url=server.url, max_workers=max_workers, backoff_base=0)
+    hh_api.max_vacancies = None  # Все вакансии, с разбиением поиска по датам публикации
+    return hh_api
+
+
+def bench_fetch(data: SyntheticData, server: FakeHHServer, max_workers: int) -> Dict[str, float]:
+    """Замеряет получение всех вакансий всех работодателей через HHApi."""
+    hh_api = create_bench_api(server, max_workers)
+    requests_before = server.requests
+    start = time.perf_counter()
+    rows = sum(len(items) for _, _, items in hh_api.iter_partitioned_vacancy_pages(data.employer_ids()))
+    elapsed = time.perf_counter() - start
+    hh_api.close()
+    return {"seconds": elapsed, "rows": rows, "rows_per_second": rows / elapsed if elapsed else 0.0,
+            "requests": server.requests - requests_before}
+
+
+def drop_bench_database(params: Dict) -> None:
+    """Удаляет базу данных для замеров, если она существует."""
+    import psycopg2
+
+    conn = psycopg2.connect(dbname="postgres", **params)
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute(f"DROP DATABASE IF EXISTS {BENCH_DB_NAME}")
+    conn.close()
+
+
+def bench_fill(data: SyntheticData, server: FakeHHServer, params: Dict, max_workers: int) -> Dict[str, float]:
+    """
+    Замеряет заполнение пустой базы данных тем же путем, что и команда ingest:
+    работодатели, вакансии через конвейер загрузки, пересчет статистики.
+    """
+    import psycopg2
+    import main
+    from scr.create_db import DatabaseCreator
+    from scr.loader import refresh_statistics, bump_data_version
+
+    drop_bench_database(params)
+    db_creator = DatabaseCreator(BENCH_DB_NAME, params)
+    db_creator.create_database()
+    db_creator.create_tables()
+    db_creator.create_indexes()
+
+    hh_api = create_bench_api(server, max_workers)
+    result = {}
+    with psycopg2.connect(dbname=BENCH_DB_NAME, **params) as conn:
+        with conn.cursor() as cur:
+            start = time.perf_counter()
+            main.fill_employers_table(cur, data.employer_ids(), hh_api)
+            result["employers_seconds"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            main.fill_vacancies_table(cur, data.employer_ids(), hh_api)
+            result["vacancies_seconds"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            refresh_statistics(cur)
+            bump_data_version(cur)
+            conn.commit()
+            result["statistics_seconds"] = time.perf_counter() - start
+
+            cur.execute("SELECT COUNT(*) FROM vacancies")
+            result["rows"] = cur.fetchone()[0]
+    hh_api.close()
+    result["rows_per_second"] = result["rows"] / result["vacancies_seconds"] if result["vacancies_seconds"] else 0.0
+    return result
+
+
+def bench_queries(data: SyntheticData, params: Dict, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Замеряет каждый запрос DBManager на заполненной базе данных. Кэш результатов отключен."""
+    from scr.db_manager import DBManager
+
+    middle_key = (data.employers // 2 + 1, 0)  # Ключ страницы из середины списка вакансий
+    with DBManager(BENCH_DB_NAME, params, cache_size=0) as db_manager:
+        queries = {
+            "get_companies_and_vacancies_count": db_manager.get_companies_and_vacancies_count,
+            "get_all_vacancies": lambda: db_manager.get_all_vacancies(compact=True),
+            "get_avg_salary": db_manager.get_avg_salary,
+            "get_vacancies_with_higher_salary": lambda: db_manager.get_vacancies_with_higher_salary(compact=True),
+            "get_vacancies_with_keyword": lambda: db_manager.get_vacancies_with_keyword("Python", compact=True),
+            "search_vacancies_trigram": lambda: db_manager.search_vacancies("senior python", mode='trigram'),
+            "search_vacancies_fulltext": lambda: db_manager.search_vacancies("аналитик данных", mode='fulltext'),
+            "get_vacancies_page_first": lambda: db_manager.get_vacancies_page(page_size=50),
+            "get_vacancies_page_middle": lambda: db_manager.get_vacancies_page(after=middle_key, page_size=50),
+            "iter_all_vacancies": lambda: sum(1 for _ in db_manager.iter_all_vacancies(compact=True)),
+        }
+        return {name: timed(query, repeat) for name, query in queries.items()}
+
+
+def current_commit() -> Optional[str]:
+    """Возвращает хэш текущего коммита git или None, если он недоступен."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: Dict, baseline: Dict) -> List[str]:
+    """
+    Сравнивает результаты с сохраненными ранее: для каждого замера времени выводит отношение
+    новое/старое (больше 1 — стало медленнее).
+    """
+    lines = []
+    for section, measures in results["results"].items():
+        old_measures = baseline.get("results", {}).get(section, {})
+        if "seconds" in measures or "vacancies_seconds" in measures:
+            measures, old_measures = {section: measures}, {section: old_measures}
+        for name, values in measures.items():
+            old_values = old_measures.get(name) or {}
+            for key in ("median", "seconds", "vacancies_seconds"):
+                if key in values and old_values.get(key):
+                    lines.append(f"{name}.{key}: {values[key]:.4f} с против {old_values[key]:.4f} с "
+                                 f"(x{values[key] / old_values[key]:.2f})")
+    return lines
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создает парсер аргументов командной строки."""
+    parser = argparse.ArgumentParser(description="Замеры производительности на синтетических данных.")
+    parser.add_argument("--employers", type=int, default=10, help="Количество работодателей.")
+    parser.add_argument("--vacancies", type=int, default=5000, help="Количество вакансий у каждого работодателя.")
+    parser.add_argument("--seed", type=int, default=0, help="Начальное значение генератора данных.")
+    parser.add_argument("--delay", type=float, default=0.0, help="Задержка ответа поддельного API в секундах.")
+    parser.add_argument("--workers", type=int, default=8, help="Количество потоков HHApi.")
+    parser.add_argument("--repeat", type=int, default=5, help="Сколько раз повторять каждый запрос к базе.")
+    parser.add_argument("--skip-db", action="store_true", help="Не выполнять замеры, которым нужен PostgreSQL.")
+    parser.add_argument("--keep-db", action="store_true", help="Не удалять базу данных для замеров.")
+    parser.add_argument("--output", help="Файл для сохранения результатов в JSON.")
+    parser.add_argument("--compare", metavar="FILE", help="Сравнить с результатами из файла JSON.")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> Dict:
+    args = build_parser().parse_args(argv)
+    data = SyntheticData(args.employers, args.vacancies, seed=args.seed)
+    results: Dict = {
+        "meta": {
+            "commit": current_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "employers": args.employers,
+            "vacancies_per_employer": args.vacancies,
+            "total_vacancies": data.total_vacancies,
+            "delay": args.delay,
+            "workers": args.workers,
+        },
+        "results": {},
+    }
+
+    with FakeHHServer(data, delay=args.delay) as server:
+        print(f"Получение {data.total_vacancies} вакансий через HHApi...")
+        results["results"]["hh_api_fetch"] = bench_fetch(data, server, args.workers)
+
+        params = None
+        if not args.skip_db:
+            from main import get_db_params
+            try:
+                params = get_db_params()
+            except ValueError as e:
+                print(f"Замеры с базой данных пропущены: {e}")
+        if params is not None:
+            try:
+                print("Заполнение базы данных...")
+                results["results"]["fill"] = bench_fill(data, server, params, args.workers)
+                print("Запросы DBManager...")
+                results["results"]["queries"] = bench_queries(data, params, args.repeat)
+            finally:
+                if not args.keep_db:
+                    drop_bench_database(params)
+
+    print(json.dumps(results["results"], indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, ensure_ascii=False)
+        print(f"Результаты сохранены в {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        print(f"\nСравнение с {args.compare} (коммит {baseline.get('meta', {}).get('commit')}):")
+        print("\n".join(compare(results, baseline)) or "Нет общих замеров.")
+    return results
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
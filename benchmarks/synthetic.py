@@ -0,0 +1,109 @@
+"""
+Генератор синтетических работодателей и вакансий в формате ответов API HH.ru.
+
+Вакансии не хранятся в памяти: вакансия с номером index у работодателя вычисляется по номеру
+(детерминированно для заданного seed), поэтому объем данных ограничен только временем генерации.
+Вакансии работодателя опубликованы с равным шагом назад от момента создания набора данных, так что
+фильтры date_from/date_to превращаются в диапазон номеров без перебора.
+"""
+# Импортируем необходимые библиотеки и модули
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, Optional, Tuple
+
+TITLES = ["Python-разработчик", "Java-разработчик", "Аналитик данных", "Инженер по тестированию",
+          "DevOps-инженер", "Frontend-разработчик", "Менеджер проекта", "Специалист поддержки",
+          "Data Scientist", "Системный администратор", "Backend-разработчик", "Продуктовый аналитик"]
+LEVELS = ["Junior", "Middle", "Senior", "Lead", "Стажер"]
+REQUIREMENTS = ["Опыт работы с Python от 2 лет", "Знание SQL и PostgreSQL", "Опыт работы с Docker и Kubernetes",
+                "Высшее техническое образование", "Английский язык не ниже B1", "Знание Linux",
+                "Опыт работы в команде по Scrum", "Понимание принципов REST"]
+# Валюта и доля вакансий в ней; курсы — сколько единиц валюты стоит один рубль, как в /dictionaries
+CURRENCIES = [("RUR", 0.9), ("USD", 0.07), ("EUR", 0.03)]
+RATES = {"RUR": 1.0, "USD": 0.011, "EUR": 0.0102}
+# Наибольший ID вакансии: столбец vacancies.vacancy_id имеет тип INTEGER
+MAX_VACANCY_ID = 2 ** 31 - 1
+
+
+class SyntheticData:
+    """Набор синтетических данных: employers работодателей, у каждого vacancies_per_employer вакансий."""
+
+    def __init__(self, employers: int = 10, vacancies_per_employer: int = 1000, seed: int = 0,
+                 now: Optional[datetime] = None, span: timedelta = timedelta(days=25)):
+        """
+        Инициализирует экземпляр класса.
+        employers: Количество работодателей (ID от 1 до employers).
+        vacancies_per_employer: Количество вакансий у каждого работодателя.
+        seed: Начальное значение генератора случайных чисел.
+        now: Дата публикации самой свежей вакансии (по умолчанию — момент создания набора).
+        span: Период, на который распределены даты публикации вакансий работодателя.
+        """
+        if employers * vacancies_per_employer > MAX_VACANCY_ID:
+            raise ValueError(f"Слишком много вакансий: ID не поместятся в INTEGER (не больше {MAX_VACANCY_ID}).")
+        self.employers = employers
+        self.vacancies_per_employer = vacancies_per_employer
+        self.seed = seed
+        self.now = (now or datetime.now(timezone.utc)).replace(microsecond=0)
+        # Шаг между публикациями не меньше секунды: в окно в одну минуту попадает не больше 60 вакансий
+        self.step = timedelta(seconds=max(1, int(span.total_seconds()) // max(vacancies_per_employer, 1)))
+
+    @property
+    def total_vacancies(self) -> int:
+        """Общее количество вакансий в наборе."""
+        return self.employers * self.vacancies_per_employer
+
+    def employer_ids(self):
+        """Возвращает ID работодателей."""
+        return list(range(1, self.employers + 1))
+
+    def employer(self, employer_id: int) -> Optional[Dict]:
+        """Возвращает работодателя в формате ответа /employers/{id} или None, если такого нет."""
+        if not 1 <= employer_id <= self.employers:
+            return None
+        return {"id": str(employer_id), "name": f"Synthetic Employer {employer_id}"}
+
+    def published_at(self, index: int) -> datetime:
+        """Возвращает дату публикации вакансии с номером index (вакансии упорядочены от свежих к старым)."""
+        return self.now - self.step * index
+
+    def index_range(self, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None) -> Tuple[int, int]:
+        """Возвращает диапазон номеров [start, stop) вакансий, опубликованных в окне [date_from, date_to]."""
+        step = self.step.total_seconds()
+        start, stop = 0, self.vacancies_per_employer
+        if date_to is not None:
+            start = max(start, math.ceil((self.now - date_to).total_seconds() / step))
+        if date_from is not None:
+            stop = min(stop, math.floor((self.now - date_from).total_seconds() / step) + 1)
+        return start, max(start, stop)
+
+    def vacancy(self, employer_id: int, index: int) -> Dict:
+        """Возвращает вакансию с номером index у работодателя в формате элемента ответа /vacancies."""
+        # ID идут подряд без пропусков, чтобы и тысячи работодателей с миллионами вакансий поместились в INTEGER
+        vacancy_id = (employer_id - 1) * self.vacancies_per_employer + index + 1
+        rng = random.Random(self.seed * 1_000_003 + vacancy_id)
+        salary = None
+        if rng.random() < 0.7:
+            currency = rng.choices([code for code, _ in CURRENCIES], [share for _, share in CURRENCIES])[0]
+            base = rng.lognormvariate(math.log(120000), 0.5) * RATES[currency]
+            salary_from = int(base // 1000 * 1000) if rng.random() < 0.85 else None
+            salary_to = int(base * rng.uniform(1.1, 1.6) // 1000 * 1000) if rng.random() < 0.6 else None
+            if salary_from is not None or salary_to is not None:
+                salary = {"from": salary_from, "to": salary_to, "currency": currency}
+        return {
+            "id": str(vacancy_id),
+            "name": f"{rng.choice(LEVELS)} {rng.choice(TITLES)}",
+            "salary": salary,
+            "alternate_url": f"https://hh.ru/vacancy/{vacancy_id}",
+            "snippet": {"requirement": ". ".join(rng.sample(REQUIREMENTS, 2))},
+            "published_at": self.published_at(index).isoformat(),
+        }
+
+    def vacancies(self, employer_id: int, start: int, stop: int) -> Iterator[Dict]:
+        """Отдает вакансии работодателя с номерами из диапазона [start, stop)."""
+        for index in range(start, stop):
+            yield self.vacancy(employer_id, index)
+
+    def currency_dictionary(self) -> Dict:
+        """Возвращает справочник валют в формате ответа /dictionaries."""
+        return {"currency": [{"code": code, "rate": rate} for code, rate in RATES.items()]}
@@ -1,15 +1,12 @@
 #                                        develop by Polexa
 
-# Импортируем необходимые библиотеки и модули
+# Импортируем необходимые библиотеки и модули.
+# Модули проекта (и requests, psycopg2, numpy) импортируются внутри команд: импорт main.py ничего не делает,
+# а команды query и stats не загружают код для работы с API и не обращаются к сети.
+import argparse
 import os
-from dotenv import load_dotenv
-import psycopg2
-
-# Импортируем нужные классы и методы
-from scr.api_function import HHApi
-from scr.create_db import DatabaseCreator
-from scr.db_manager import DBManager
-from scr.sql_queries import get_insert_vacancy_query
+import time
+from typing import Dict, List, Optional
 
 # Добавляем список работодателей с их ID
 employer_ids = [
@@ -25,101 +22,178 @@ employer_ids = [
     78638,   # Тинькофф (Т-банк)
 ]
 
-# Загружаем переменные окружения из .env файла
-load_dotenv()
+# Имя базы данных
+DB_NAME = "hh_database"
+
+# Допустимая частота запросов к API HH.ru в секунду (общая для всех потоков загрузки)
+API_RATE_LIMIT = 10
+
+# Количество вакансий на одной странице в интерактивном меню
+PAGE_SIZE = 20
+
+
+def get_db_params() -> Dict[str, Optional[str]]:
+    """
+    Возвращает параметры подключения к базе данных. Пароль берется из переменной окружения
+    POSTGRES_PASSWORD (или из .env файла).
+    """
+    from dotenv import load_dotenv
+
+    # Загружаем переменные окружения из .env файла
+    load_dotenv()
+    params = {
+        'host': '127.0.0.1',
+        'port': '5432',
+        'user': 'postgres',
+        'password': os.getenv('POSTGRES_PASSWORD')  # Пароль из .env
+    }
+
+    # Проверка, что пароль установлен
+    if params['password'] is None:
+        raise ValueError("Необходимо установить переменную окружения POSTGRES_PASSWORD в .env файле.")
+    return params
+
 
-# Параметры подключения к базе данных (из .env)
-DB_NAME = "hh_database"  # Имя базы данных
+def create_hh_api(requests_per_second: float = API_RATE_LIMIT, max_vacancies: Optional[int] = None):
+    """
+    Создает экземпляр HHApi для работы с API HH.ru (одна сессия с пулом соединений на весь запуск).
+    Каталог кэша ответов API задается переменной окружения HH_CACHE_DIR; HH_OFFLINE=1 включает
+    автономный режим, в котором сеть не используется.
+    requests_per_second: Допустимая частота запросов этого экземпляра.
+    max_vacancies: Максимальное количество вакансий на работодателя (None — все вакансии: поиск делится
+                   на окна дат публикации, чтобы обойти предел пагинации API).
+    """
+    from scr.api_function import HHApi
+    from scr.http_cache import HTTPCache
 
-PARAMS = {
-    'host': '127.0.0.1',
-    'port': '5432',
-    'user': 'postgres',
-    'password': os.getenv('POSTGRES_PASSWORD')  # Пароль из .env
-}
+    cache_dir = os.getenv('HH_CACHE_DIR')
+    http_cache = HTTPCache(cache_dir, offline=os.getenv('HH_OFFLINE') == '1') if cache_dir else None
+    hh_api = HHApi(requests_per_second=requests_per_second, cache=http_cache)
+    hh_api.max_vacancies = max_vacancies
+    return hh_api
 
-# Проверка, что пароль установлен
-if PARAMS['password'] is None:
-    raise ValueError("Необходимо установить переменную окружения POSTGRES_PASSWORD в .env файле.")
 
-# Создаем экземпляр класса DatabaseCreator для создания базы данных и таблиц
-db_creator = DatabaseCreator(DB_NAME, PARAMS)
-db_creator.create_database()
-db_creator.create_tables()
+def load_employer_names_cache(cur, hh_api):
+    """Заполняет кэш имен работодателей в HHApi данными из таблицы employers."""
+    from scr.sql_queries import get_employer_names_query
+
+    cur.execute(get_employer_names_query())
+    hh_api.preload_employer_names(dict(cur.fetchall()))
 
-# Создаем экземпляр класса HHApi для работы с API HH.ru
-hh_api = HHApi()
 
 def fill_employers_table(cur, employer_ids, hh_api):
     """Заполняет таблицу employers информацией о работодателях."""
-    for employer_id in employer_ids:
-        employer_name = hh_api.get_employer_name(employer_id)
-
-        if not employer_name:
-            continue
+    from scr.loader import bulk_upsert_employers
 
-        cur.execute("SELECT employer_id FROM employers WHERE employer_id = %s", (employer_id,))
-        if not cur.fetchone():
-            cur.execute("INSERT INTO employers (employer_id, employer_name) VALUES (%s, %s)",
-                        (employer_id, employer_name))
-            print(f"Добавлена компания: {employer_name} (ID: {employer_id})")
-        else:
-            print(f"Компания {employer_name} (ID: {employer_id}) уже существует в базе данных.")
+    employer_names = hh_api.get_employers_names(employer_ids)  # Имена запрашиваются конкурентно
+    rows = [(employer_id, employer_names[employer_id]) for employer_id in employer_ids
+            if employer_names.get(employer_id)]
+    stats = bulk_upsert_employers(cur, rows)
+    print(f"Компании: добавлено {stats['inserted']}, обновлено {stats['updated']}, "
+          f"без изменений {stats['skipped']}.")
 
 
 def fill_vacancies_table(cur, employer_ids, hh_api):
-    """Заполняет таблицу vacancies."""
-    insert_vacancy_query = get_insert_vacancy_query()
-
-    for employer_id in employer_ids:
-        vacancies = hh_api.get_employer_vacancies(employer_id)
-        if vacancies:
-            for vacancy in vacancies:
-                vacancy_id = vacancy.get("id")
-                cur.execute("SELECT vacancy_id FROM vacancies WHERE vacancy_id = %s", (vacancy_id,))
-                if not cur.fetchone():
-                    salary_data = vacancy.get("salary")
-                    salary_from = salary_data.get("from") if salary_data else None
-                    salary_to = salary_data.get("to") if salary_data else None
-                    salary_currency = salary_data.get("currency") if salary_data else None
-
-                    cur.execute(insert_vacancy_query, (
-                        vacancy_id, employer_id, vacancy.get("name"),
-                        salary_from, salary_to,
-                        salary_currency, vacancy.get("alternate_url"),
-                        vacancy.get("snippet", {}).get("requirement")
-                    ))
-                    print(f"Добавлена вакансия: {vacancy.get('name')} от {hh_api.get_employer_name(employer_id)}")
+    """
+    Заполняет таблицу vacancies. При повторных запусках загружаются только вакансии,
+    опубликованные после предыдущей синхронизации, а исчезнувшие с сайта помечаются архивными.
+    """
+    from scr.loader import load_currency_rates, backfill_salary_rub
+    from scr.pipeline import IngestPipeline
+    from scr.sync import sync_vacancies
+
+    rates = load_currency_rates(cur, hh_api)  # Зарплаты пересчитываются в рубли при загрузке
+    if rates:
+        backfill_salary_rub(cur)  # Вакансии, загруженные до пересчета в рубли
+    # Получение страниц, разбор и запись в базу выполняются одновременно в отдельных стадиях конвейера
+    pipeline = IngestPipeline()
+    stats = sync_vacancies(cur, hh_api, employer_ids, rates=rates, pipeline=pipeline)
+    print(f"Вакансии: добавлено {stats['inserted']}, обновлено {stats['updated']}, "
+          f"без изменений {stats['skipped']}, перенесено в архив {stats['archived']}.")
+    if stats['failed_employers']:
+        print(f"Вакансии работодателей {stats['failed_employers']} получены не полностью: "
+              f"при следующем запуске они будут запрошены повторно.")
+    for name, metrics in pipeline.get_metrics().items():
+        print(f"Стадия {name}: {metrics['items']} элементов, работа {metrics['busy_time']:.2f} с, "
+              f"ожидание данных {metrics['input_wait']:.2f} с, ожидание записи {metrics['output_wait']:.2f} с.")
+    print(f"Самая медленная стадия: {pipeline.bottleneck()}.")
+
+
+def fill_vacancies_sharded(cur, params, employer_ids, hh_api, workers, max_vacancies=None):
+    """
+    Заполняет таблицы employers и vacancies в workers процессов: работодатели делятся на порции
+    через очередь ingest_queue, каждый процесс сам получает и записывает данные своих порций.
+    Прерванная загрузка при следующем запуске продолжается с незавершенных порций.
+    """
+    from functools import partial
+    from scr.loader import load_currency_rates, backfill_salary_rub
+    from scr.sharded_ingest import run_sharded_ingest
+
+    rates = load_currency_rates(cur, hh_api)  # Курсы загружаются один раз и передаются всем процессам
+    if rates:
+        backfill_salary_rub(cur)  # Вакансии, загруженные до пересчета в рубли
+    cur.connection.commit()
+    # Общая частота запросов к API делится между процессами
+    stats = run_sharded_ingest(DB_NAME, params, employer_ids, workers,
+                               partial(create_hh_api, API_RATE_LIMIT / max(workers, 1), max_vacancies), rates=rates)
+    print(f"Вакансии: добавлено {stats['inserted']}, обновлено {stats['updated']}, "
+          f"без изменений {stats['skipped']}, перенесено в архив {stats['archived']}.")
+    print(f"Порций загружено: {stats['shards']}, с ошибкой: {stats['failed']}. Очередь: {stats['queue']}.")
+
+
+def run_ingest(params: Dict[str, Optional[str]], partitioned: bool = False,
+               keep_months: Optional[int] = None, workers: Optional[int] = None,
+               max_vacancies: Optional[int] = None) -> None:
+    """
+    Создает базу данных и таблицы (если их нет) и загружает в них данные из API HH.ru.
+    partitioned: Секционировать таблицу vacancies по месяцам публикации.
+    keep_months: После загрузки отсоединить секции старше стольких месяцев (перенести в архивную схему).
+    workers: Загружать в несколько процессов через очередь ingest_queue (None — в текущем процессе).
+    max_vacancies: Загружать не больше стольких вакансий на работодателя (None — все вакансии).
+    """
+    import psycopg2
+    from scr.create_db import DatabaseCreator
+    from scr.loader import refresh_statistics, bump_data_version
+
+    # Создаем экземпляр класса DatabaseCreator для создания базы данных и таблиц
+    db_creator = DatabaseCreator(DB_NAME, params, partitioned=partitioned)
+    db_creator.create_database()
+    db_creator.create_tables()
+    db_creator.create_indexes()
+
+    hh_api = create_hh_api(max_vacancies=max_vacancies)
+    # Подключаемся к базе данных и заполняем таблицы
+    try:
+        with psycopg2.connect(dbname=DB_NAME, **params) as conn:
+            with conn.cursor() as cur:
+                if workers:
+                    fill_vacancies_sharded(cur, params, employer_ids, hh_api, workers, max_vacancies)
                 else:
-                    print(f"Вакансия {vacancy.get('name')} уже существует в базе данных.")
-
-# Подключаемся к базе данных и заполняем таблицы
-try:
-    with psycopg2.connect(dbname=DB_NAME, **PARAMS) as conn:
-        with conn.cursor() as cur:
-            fill_employers_table(cur, employer_ids, hh_api)
-            fill_vacancies_table(cur, employer_ids, hh_api)
-            conn.commit()  # Сохраняем изменения
-except psycopg2.Error as e:
-    print(f"Ошибка при работе с базой данных: {e}")
-print("Заполнение базы данных завершено.")
-
-# Создаем экземпляр класса DBManager
-db_manager = DBManager(DB_NAME, PARAMS)
+                    load_employer_names_cache(cur, hh_api)
+                    fill_employers_table(cur, employer_ids, hh_api)
+                    fill_vacancies_table(cur, employer_ids, hh_api)
+                refresh_statistics(cur)  # Пересчитываем статистику для меню
+                bump_data_version(cur)  # Сбрасываем кэш запросов DBManager
+                conn.commit()  # Сохраняем изменения
+    except psycopg2.Error as e:
+        print(f"Ошибка при работе с базой данных: {e}")
+    finally:
+        hh_api.close()
+    if keep_months is not None:
+        db_creator.detach_old_partitions(keep_months)
+    api_stats = hh_api.get_stats()
+    print(f"Заполнение базы данных завершено. Запросов к API: {api_stats['requests']}, "
+          f"средняя задержка: {api_stats['avg_time'] * 1000:.0f} мс.")
 
-def print_vacancies(vacancies):
-    """Выводит информацию о вакансиях."""
-    if not vacancies:
-        print("Нет данных о вакансиях.")
-        return
 
+def print_vacancies(vacancies):
+    """
+    Выводит информацию о вакансиях (VacancyRow). Принимает список или итератор:
+    вывод начинается с первой же строки.
+    """
+    printed = 0
     for vacancy in vacancies:
-        employer_name = vacancy['employer_name']
-        vacancy_name = vacancy['vacancy_name']
-        salary_from = vacancy['salary_from']
-        salary_to = vacancy['salary_to']
-        currency = vacancy['currency']
-        vacancy_url = vacancy['vacancy_url']
+        salary_from, salary_to, currency = vacancy.salary_from, vacancy.salary_to, vacancy.currency
 
         if salary_from and salary_to:
             salary_info = f"Зарплата: от {salary_from} до {salary_to} {currency}"
@@ -130,9 +204,69 @@ def print_vacancies(vacancies):
         else:
             salary_info = "Зарплата не указана"
 
-        print(f"Компания: {employer_name}\nВакансия: {vacancy_name}\n{salary_info}\nURL: {vacancy_url}\n")
+        print(f"Компания: {vacancy.employer_name}\nВакансия: {vacancy.vacancy_name}\n{salary_info}\n"
+              f"URL: {vacancy.vacancy_url}\n")
+        printed += 1
+
+    if not printed:
+        print("Нет данных о вакансиях.")
+
+
+def browse_pages(get_page) -> None:
+    """
+    Выводит вакансии постранично. get_page(after) возвращает страницу (VacancyPage);
+    следующая страница запрашивается по ключу последней строки текущей.
+    """
+    after = None
+    while True:
+        page = get_page(after)
+        print_vacancies(page.items)
+        if page.next_cursor is None:
+            break
+        if input("Enter — следующая страница, 0 — вернуться в меню: ") == '0':
+            break
+        after = page.next_cursor
+
+
+def print_companies(db_manager) -> None:
+    """Выводит список компаний и количество вакансий у каждой из них."""
+    companies = db_manager.get_companies_and_vacancies_count()
+    if companies:
+        print("\nКомпании и количество вакансий:")
+        for company in companies:
+            print(f"{company['employer_name']}: {company['vacancies_count']}")
+    else:
+        print("Не удалось получить данные.")
+
+
+def print_avg_salary(db_manager) -> None:
+    """Выводит среднюю зарплату по вакансиям."""
+    avg_salary = db_manager.get_avg_salary()
+    if avg_salary is not None:
+        print(f"\nСредняя зарплата: {round(avg_salary)} руб.")
+    else:
+        print("Не удалось получить данные.")
+
+
+def print_salary_distribution(db_manager) -> None:
+    """Выводит процентили зарплат и количество вакансий по диапазонам зарплат."""
+    from scr.analytics import SalaryAnalytics  # NumPy загружается только для этой статистики
+
+    salary_analytics = SalaryAnalytics(db_manager)
+    salary_percentiles = salary_analytics.get_percentiles()
+    if salary_percentiles:
+        print("\nПроцентили зарплат:")
+        for percentile, value in salary_percentiles.items():
+            print(f"{percentile}%: {round(value)} руб.")
+        print("\nКоличество вакансий по диапазонам зарплат:")
+        for band in salary_analytics.get_salary_bands():
+            upper = f"до {band['salary_to']}" if band['salary_to'] is not None else "и выше"
+            print(f"от {band['salary_from']} {upper} руб.: {band['count']}")
+    else:
+        print("Не удалось получить данные.")
+
 
-def user_interaction():
+def user_interaction(db_manager):
     """Функция для взаимодействия с пользователем."""
     while True:
         print("\nВыберите действие:")
@@ -141,52 +275,163 @@ def user_interaction():
         print("3 - Получить среднюю зарплату по вакансиям.")
         print("4 - Получить список вакансий с зарплатой выше средней.")
         print("5 - Получить список вакансий по ключевому слову.")
+        print("6 - Полнотекстовый поиск вакансий по названию и описанию.")
+        print("7 - Получить распределение зарплат (процентили и диапазоны).")
         print("0 - Выйти")
 
         choice = input("Введите номер действия: ")
 
         if choice == '1':
-            companies = db_manager.get_companies_and_vacancies_count()
-            if companies:
-                print("\nКомпании и количество вакансий:")
-                for company in companies:
-                    print(f"{company['employer_name']}: {company['vacancies_count']}")
-            else:
-                print("Не удалось получить данные.")
+            print_companies(db_manager)
         elif choice == '2':
-            vacancies = db_manager.get_all_vacancies()
-            if vacancies:
-                print("\nВсе вакансии:")
-                print_vacancies(vacancies)  # Используем вынесенную функцию
-            else:
-                print("Не удалось получить данные.")
+            print("\nВсе вакансии:")
+            browse_pages(lambda after: db_manager.get_vacancies_page(after, PAGE_SIZE, compact=True))
         elif choice == '3':
-            avg_salary = db_manager.get_avg_salary()
-            if avg_salary is not None:
-                print(f"\nСредняя зарплата: {round(avg_salary)}")
-            else:
-                print("Не удалось получить данные.")
+            print_avg_salary(db_manager)
         elif choice == '4':
-            higher_salary_vacancies = db_manager.get_vacancies_with_higher_salary()
-            if higher_salary_vacancies:
-                print("\nВакансии с зарплатой выше средней:")
-                print_vacancies(higher_salary_vacancies)  # Используем вынесенную функцию
-            else:
-                print("Не удалось получить данные.")
+            print("\nВакансии с зарплатой выше средней:")
+            browse_pages(lambda after: db_manager.get_vacancies_with_higher_salary_page(after, PAGE_SIZE,
+                                                                                        compact=True))
         elif choice == '5':
             keyword = input("Введите ключевое слово: ")
-            keyword_vacancies = db_manager.get_vacancies_with_keyword(keyword)
-            if keyword_vacancies:
-                print(f"\nВакансии, содержащие '{keyword}':")
-                print_vacancies(keyword_vacancies)  # Используем вынесенную функцию
-            else:
-                print("Не удалось получить данные.")
+            print(f"\nВакансии, содержащие '{keyword}':")
+            browse_pages(lambda after: db_manager.get_vacancies_with_keyword_page(keyword, after, PAGE_SIZE,
+                                                                                  compact=True))
+        elif choice == '6':
+            query = input("Введите поисковый запрос: ")
+            print(f"\nВакансии по запросу '{query}':")
+            print_vacancies(db_manager.search_vacancies(query, mode='fulltext', compact=True))
+        elif choice == '7':
+            print_salary_distribution(db_manager)
         elif choice == '0':
             print("Выход.")
             break
         else:
             print("Неверный выбор. Пожалуйста, выберите действие из списка.")
 
+
+def run_query(params: Dict[str, Optional[str]], args: argparse.Namespace, slow_query_log=None) -> None:
+    """
+    Выполняет запрос к уже заполненной базе данных: без аргументов открывает меню,
+    иначе выводит результат одного запроса. Таблицы не создаются, к API HH.ru запросы не выполняются.
+    slow_query_log: Журнал медленных запросов (SlowQueryLog) или None.
+    """
+    from scr.db_manager import DBManager
+
+    # Соединения пула переиспользуются между действиями меню и закрываются при выходе
+    with DBManager(DB_NAME, params, slow_query_log=slow_query_log) as db_manager:
+        if args.companies:
+            print_companies(db_manager)
+        elif args.all:
+            print_vacancies(db_manager.iter_all_vacancies(compact=True))
+        elif args.higher:
+            print_vacancies(db_manager.iter_vacancies_with_higher_salary(compact=True))
+        elif args.keyword:
+            print_vacancies(db_manager.search_vacancies(args.keyword, mode='trigram', limit=args.limit,
+                                                        compact=True))
+        elif args.search:
+            print_vacancies(db_manager.search_vacancies(args.search, mode='fulltext', limit=args.limit,
+                                                        compact=True))
+        else:
+            user_interaction(db_manager)
+
+
+def run_stats(params: Dict[str, Optional[str]], slow_query_log=None) -> None:
+    """
+    Выводит сводную статистику: вакансии по компаниям, среднюю зарплату и распределение зарплат.
+    slow_query_log: Журнал медленных запросов (SlowQueryLog) или None.
+    """
+    from scr.db_manager import DBManager
+
+    with DBManager(DB_NAME, params, slow_query_log=slow_query_log) as db_manager:
+        print_companies(db_manager)
+        print_avg_salary(db_manager)
+        print_salary_distribution(db_manager)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создает парсер аргументов командной строки с командами ingest, query и stats."""
+    parser = argparse.ArgumentParser(description="Сбор вакансий с hh.ru в PostgreSQL и запросы к собранным данным.")
+    commands = parser.add_subparsers(dest="command")
+
+    # Параметры метрик, общие для всех команд
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--metrics", metavar="FILE",
+                        help="Сохранить метрики в файл: в JSON для *.json, иначе в формате Prometheus.")
+    # Параметры журнала медленных запросов для команд, читающих базу данных
+    tracing = argparse.ArgumentParser(add_help=False)
+    tracing.add_argument("--slow-query-ms", type=float, metavar="MS",
+                         help="Сохранять запросы дольше MS миллисекунд вместе с планом выполнения.")
+    tracing.add_argument("--slow-query-log", metavar="FILE",
+                         help="Дописывать медленные запросы в файл (строка JSON на запрос).")
+
+    ingest = commands.add_parser("ingest", parents=[common], help="Создать таблицы и загрузить данные из API HH.ru.")
+    ingest.add_argument("--every", type=float, metavar="MINUTES",
+                        help="Повторять загрузку каждые MINUTES минут (до прерывания Ctrl+C).")
+    ingest.add_argument("--partitioned", action="store_true",
+                        help="Секционировать таблицу vacancies по месяцам публикации (существующие данные переносятся).")
+    ingest.add_argument("--keep-months", type=int, metavar="N",
+                        help="Отсоединять секции старше N месяцев в архивную схему vacancies_archive.")
+    ingest.add_argument("--workers", type=int, metavar="N",
+                        help="Загружать в N процессов через общую очередь в базе данных (прерванная загрузка "
+                             "продолжается при следующем запуске).")
+    ingest.add_argument("--max-vacancies", type=int, metavar="N",
+                        help="Загружать не больше N вакансий на работодателя (по умолчанию — все вакансии).")
+
+    query = commands.add_parser("query", parents=[common, tracing],
+                                help="Запросы к собранным данным (без аргументов — интерактивное меню).")
+    actions = query.add_mutually_exclusive_group()
+    actions.add_argument("--companies", action="store_true", help="Компании и количество вакансий.")
+    actions.add_argument("--all", action="store_true", help="Все вакансии.")
+    actions.add_argument("--higher", action="store_true", help="Вакансии с зарплатой выше средней.")
+    actions.add_argument("--keyword", metavar="WORDS", help="Вакансии, в названии которых есть все слова.")
+    actions.add_argument("--search", metavar="QUERY", help="Полнотекстовый поиск по названию и описанию.")
+    query.add_argument("--limit", type=int, default=100, help="Максимальное количество результатов поиска.")
+
+    commands.add_parser("stats", parents=[common, tracing], help="Сводная статистика по компаниям и зарплатам.")
+    return parser
+
+
+def write_metrics(path: Optional[str]) -> None:
+    """Сохраняет накопленные метрики в файл, если он задан."""
+    if path:
+        from scr.metrics import REGISTRY
+        REGISTRY.write(path)
+        print(f"Метрики сохранены в {path}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Точка входа командной строки. Без команды открывает меню запросов (как query)."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        args = parser.parse_args(["query"])
+    params = get_db_params()
+
+    slow_query_log = None
+    if getattr(args, "slow_query_ms", None) is not None:
+        from scr.metrics import SlowQueryLog
+        slow_query_log = SlowQueryLog(args.slow_query_ms / 1000, args.slow_query_log)
+
+    if args.command == "ingest":
+        while True:
+            run_ingest(params, args.partitioned, args.keep_months, args.workers, args.max_vacancies)
+            write_metrics(args.metrics)  # При загрузке по расписанию файл обновляется после каждого запуска
+            if not args.every:
+                break
+            time.sleep(args.every * 60)
+    else:
+        if args.command == "stats":
+            run_stats(params, slow_query_log)
+        else:
+            run_query(params, args, slow_query_log)
+        write_metrics(args.metrics)
+        if slow_query_log is not None and slow_query_log.entries():
+            print(f"\nМедленных запросов: {len(slow_query_log.entries())}")
+            for entry in slow_query_log.entries():
+                print(f"{entry['query']}: {entry['seconds'] * 1000:.0f} мс")
+
+
 # Вызываем функцию взаимодействия с пользователем
 if __name__ == '__main__':
-    user_interaction()
\ No newline at end of file
+    main()
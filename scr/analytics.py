@@ -0,0 +1,212 @@
+# Импортируем необходимые библиотеки и модули
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import psycopg2
+
+# Импортируем нужные классы и методы
+from scr.db_manager import DBManager
+from scr.sql_queries import (
+    get_salary_count_query,
+    get_salary_columns_query,
+    get_salary_percentiles_query,
+    get_salary_range_query,
+    get_salary_histogram_query,
+    get_employer_median_salaries_query,
+    get_salary_bands_query
+)
+
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+# Нижние границы диапазонов зарплат в рублях; последний диапазон не ограничен сверху
+DEFAULT_SALARY_BANDS = (0, 50000, 100000, 150000, 200000, 300000)
+
+
+def percentiles(salaries: np.ndarray, q: Sequence[float] = DEFAULT_PERCENTILES) -> Dict[float, float]:
+    """Возвращает процентили зарплат: {процентиль: значение}. Для пустого массива — пустой словарь."""
+    if salaries.size == 0:
+        return {}
+    return dict(zip(q, np.percentile(salaries, q).tolist()))
+
+
+def histogram(salaries: np.ndarray, bins: int = 20) -> Dict[str, List]:
+    """Возвращает гистограмму зарплат: количество вакансий в интервалах ('counts') и границы интервалов ('edges')."""
+    if salaries.size == 0:
+        return {'counts': [], 'edges': []}
+    counts, edges = np.histogram(salaries, bins=bins)
+    return {'counts': counts.tolist(), 'edges': edges.tolist()}
+
+
+def employer_medians(employer_ids: np.ndarray, salaries: np.ndarray) -> Dict[int, float]:
+    """
+    Возвращает медианную зарплату у каждой компании. Зарплаты сортируются один раз внутри групп
+    по компаниям, после чего медианы всех групп берутся по индексам без цикла по строкам.
+    """
+    if salaries.size == 0:
+        return {}
+    order = np.lexsort((salaries, employer_ids))
+    sorted_ids, sorted_salaries = employer_ids[order], salaries[order]
+    groups, starts, counts = np.unique(sorted_ids, return_index=True, return_counts=True)
+    lower = sorted_salaries[starts + (counts - 1) // 2]
+    upper = sorted_salaries[starts + counts // 2]
+    return dict(zip(groups.tolist(), ((lower + upper) / 2).tolist()))
+
+
+def _band_rows(band_counts: np.ndarray, bands: Sequence[int]) -> List[Dict]:
+    """Преобразует количество вакансий по номерам диапазонов в список словарей с границами диапазонов."""
+    uppers = list(bands[1:]) + [None]
+    return [{'salary_from': lower, 'salary_to': upper, 'count': int(count)}
+            for lower, upper, count in zip(bands, uppers, band_counts)]
+
+
+def salary_bands(salaries: np.ndarray, bands: Sequence[int] = DEFAULT_SALARY_BANDS) -> List[Dict]:
+    """
+    Считает вакансии по диапазонам зарплат [bands[i], bands[i + 1]).
+    Зарплаты ниже первой границы не учитываются.
+    """
+    band_numbers = np.searchsorted(np.asarray(bands), salaries, side='right')  # Как width_bucket в PostgreSQL
+    band_counts = np.bincount(band_numbers, minlength=len(bands) + 1)[1:]
+    return _band_rows(band_counts, bands)
+
+
+class SalaryAnalytics:
+    """
+    Статистика по зарплатам в рублях (середина вилки) неархивных вакансий.
+    Небольшие объемы данных загружаются из базы одним запросом в виде массивов NumPy и обрабатываются
+    векторно; при большом количестве вакансий агрегаты считаются на стороне PostgreSQL
+    (percentile_cont, width_bucket), и по сети передается только результат.
+    Результаты запросов кэшируются в DBManager до следующей загрузки данных; массивы зарплат длиннее
+    cache_max_rows в кэш не попадают и загружаются заново при каждом расчете.
+    """
+
+    def __init__(self, db_manager: DBManager, pushdown_threshold: Optional[int] = 1_000_000):
+        """
+        Инициализирует экземпляр класса.
+        db_manager: Экземпляр DBManager, через пул и кэш которого выполняются запросы.
+        pushdown_threshold: Количество вакансий с зарплатой, начиная с которого агрегаты считаются в базе данных
+                            (None — всегда загружать данные и считать на стороне Python).
+        """
+        self.db_manager = db_manager
+        self.pushdown_threshold = pushdown_threshold
+
+    @staticmethod
+    def _process_salary_columns(cursor) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Преобразует строку с массивами employer_id и зарплат в пару массивов NumPy.
+        Массивы хранятся в кэше DBManager и отдаются всем вызывающим, поэтому они доступны только для чтения.
+        """
+        employer_ids, salaries = cursor.fetchone()
+        arrays = np.asarray(employer_ids, dtype=np.int64), np.asarray(salaries, dtype=np.float64)
+        for array in arrays:
+            array.setflags(write=False)
+        return arrays
+
+    @staticmethod
+    def _process_first_value(cursor):
+        """Возвращает первое значение первой строки курсора."""
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _process_first_row(cursor) -> Tuple:
+        """Возвращает первую строку курсора."""
+        return tuple(cursor.fetchone())
+
+    @staticmethod
+    def _process_pairs(cursor) -> List[Tuple]:
+        """Возвращает строки курсора из двух столбцов списком кортежей."""
+        return [tuple(row) for row in cursor]
+
+    def fetch_salaries(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Загружает employer_id и зарплаты в рублях всех неархивных вакансий в виде двух массивов NumPy
+        (только для чтения: для изменения нужна копия).
+        """
+        try:
+            return self.db_manager.query(get_salary_columns_query(), None, SalaryAnalytics._process_salary_columns)
+        except psycopg2.Error as e:
+            print(f"Ошибка при загрузке зарплат: {e}")
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+    def _use_pushdown(self, pushdown: Optional[bool]) -> bool:
+        """Определяет, считать ли агрегаты в базе данных: по явному флагу или по количеству вакансий."""
+        if pushdown is not None:
+            return pushdown
+        if self.pushdown_threshold is None:
+            return False
+        count = self.db_manager.query(get_salary_count_query(), None, SalaryAnalytics._process_first_value)
+        return (count or 0) >= self.pushdown_threshold
+
+    def get_percentiles(self, q: Sequence[float] = DEFAULT_PERCENTILES,
+                        pushdown: Optional[bool] = None) -> Dict[float, float]:
+        """
+        Возвращает процентили зарплат: {процентиль: значение в рублях}.
+        pushdown: Считать в базе данных (True), в Python (False) или выбрать по количеству вакансий (None).
+        """
+        try:
+            if self._use_pushdown(pushdown):
+                values = self.db_manager.query(get_salary_percentiles_query(), ([p / 100 for p in q],),
+                                               SalaryAnalytics._process_first_value)
+                return dict(zip(q, values)) if values and values[0] is not None else {}
+            return percentiles(self.fetch_salaries()[1], q)
+        except psycopg2.Error as e:
+            print(f"Ошибка при расчете процентилей зарплат: {e}")
+            return {}
+
+    def get_histogram(self, bins: int = 20, pushdown: Optional[bool] = None) -> Dict[str, List]:
+        """
+        Возвращает гистограмму зарплат: количество вакансий в интервалах ('counts') и границы интервалов ('edges').
+        pushdown: Считать в базе данных (True), в Python (False) или выбрать по количеству вакансий (None).
+        """
+        try:
+            if not self._use_pushdown(pushdown):
+                return histogram(self.fetch_salaries()[1], bins)
+
+            low, high = self.db_manager.query(get_salary_range_query(), None, SalaryAnalytics._process_first_row)
+            if low is None:
+                return {'counts': [], 'edges': []}
+            # Границы считаются так же, как в numpy.histogram, чтобы результаты обоих способов совпадали
+            edges = np.histogram_bin_edges(np.array([low, high], dtype=np.float64), bins=bins)
+            rows = self.db_manager.query(get_salary_histogram_query(),
+                                         {'low': float(edges[0]), 'high': float(edges[-1]), 'bins': bins},
+                                         SalaryAnalytics._process_pairs)
+            counts = np.zeros(bins, dtype=np.int64)
+            for bucket, count in rows:
+                counts[bucket - 1] = count
+            return {'counts': counts.tolist(), 'edges': edges.tolist()}
+        except psycopg2.Error as e:
+            print(f"Ошибка при построении гистограммы зарплат: {e}")
+            return {'counts': [], 'edges': []}
+
+    def get_employer_medians(self, pushdown: Optional[bool] = None) -> Dict[int, float]:
+        """
+        Возвращает медианную зарплату в рублях у каждой компании: {employer_id: медиана}.
+        pushdown: Считать в базе данных (True), в Python (False) или выбрать по количеству вакансий (None).
+        """
+        try:
+            if self._use_pushdown(pushdown):
+                return dict(self.db_manager.query(get_employer_median_salaries_query(), None,
+                                                  SalaryAnalytics._process_pairs))
+            return employer_medians(*self.fetch_salaries())
+        except psycopg2.Error as e:
+            print(f"Ошибка при расчете медианных зарплат по компаниям: {e}")
+            return {}
+
+    def get_salary_bands(self, bands: Sequence[int] = DEFAULT_SALARY_BANDS,
+                         pushdown: Optional[bool] = None) -> List[Dict]:
+        """
+        Возвращает количество вакансий по диапазонам зарплат: список словарей с ключами
+        'salary_from', 'salary_to' (None для последнего диапазона) и 'count'.
+        pushdown: Считать в базе данных (True), в Python (False) или выбрать по количеству вакансий (None).
+        """
+        try:
+            if self._use_pushdown(pushdown):
+                rows = self.db_manager.query(get_salary_bands_query(), (list(bands),),
+                                             SalaryAnalytics._process_pairs)
+                band_counts = np.zeros(len(bands) + 1, dtype=np.int64)
+                for band, count in rows:
+                    band_counts[band] = count
+                return _band_rows(band_counts[1:], bands)
+            return salary_bands(self.fetch_salaries()[1], bands)
+        except psycopg2.Error as e:
+            print(f"Ошибка при подсчете вакансий по диапазонам зарплат: {e}")
+            return []
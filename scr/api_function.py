@@ -1,39 +1,273 @@
 # Импортируем необходимые библиотеки и модули
 import requests
 import json
-from typing import List, Dict, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from math import ceil
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Iterable, Iterator, Set, Tuple
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+
+from scr.cache import TTLCache
+from scr.http_cache import HTTPCache, CacheMissError
+from scr.metrics import MetricsRegistry, REGISTRY
+from scr.resilience import (RateLimiter, CircuitBreaker, CircuitOpenError, backoff_delay, parse_retry_after,
+                            MAX_RETRY_AFTER)
+
+# Коды ответа, после которых запрос имеет смысл повторить
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def create_session(pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = True) -> requests.Session:
+    """
+    Создает HTTP-сессию с пулом keep-alive соединений.
+    pool_connections: Количество хостов, для которых хранится отдельный пул соединений.
+    pool_maxsize: Максимальное количество соединений с одним хостом.
+    pool_block: Ждать освобождения соединения вместо открытия лишнего сверх pool_maxsize.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
 class HHApi:
     """Класс для взаимодействия с API HH.ru."""
 
-    def __init__(self):
-        """Инициализируем экземпляр класса. Устанавливает базовый URL API."""
-        self.base_url = "https://api.hh.ru"
-        self.max_vacancies = 10  # Максимальное количество вакансий
+    def __init__(self, base_url: str = "https://api.hh.ru", max_workers: int = 8,
+                 session: Optional[requests.Session] = None, pool_connections: int = 10,
+                 pool_maxsize: Optional[int] = None, timeout: float = 10.0,
+                 employer_cache_size: int = 1024, employer_cache_ttl: Optional[float] = 24 * 60 * 60,
+                 requests_per_second: Optional[float] = None, rate_limiter: Optional[RateLimiter] = None,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_cap: float = 30.0,
+                 max_retry_after: float = MAX_RETRY_AFTER,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0, cache: Optional[HTTPCache] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        """
+        Инициализируем экземпляр класса. Устанавливает базовый URL API.
+        base_url: Базовый URL API (можно подменить на локальный сервер для тестов).
+        max_workers: Максимальное количество одновременных запросов в конкурентном режиме.
+        session: Готовая HTTP-сессия, общая для нескольких экземпляров (если не задана, создается своя).
+        pool_connections: Количество хостов, для которых хранится пул соединений.
+        pool_maxsize: Максимальное количество соединений с одним хостом (по умолчанию max_workers).
+        timeout: Таймаут одного запроса в секундах.
+        employer_cache_size: Максимальное количество работодателей в кэше имен.
+        employer_cache_ttl: Время жизни записи в кэше имен в секундах (None — без ограничения).
+        requests_per_second: Допустимая частота запросов (None — без ограничения).
+        rate_limiter: Готовый ограничитель частоты, общий для нескольких экземпляров (вместо requests_per_second).
+        max_retries: Количество повторов запроса после ошибки соединения или ответов 429/5xx.
+        backoff_base: Базовая задержка экспоненциального ожидания между повторами в секундах.
+        backoff_cap: Максимальная задержка между повторами в секундах.
+        max_retry_after: Максимальное ожидание по заголовку Retry-After в секундах.
+        failure_threshold: Количество ошибок подряд, после которого запросы к хосту временно прекращаются.
+        reset_timeout: Время в секундах, через которое к недоступному хосту отправляется пробный запрос.
+        cache: Кэш ответов на диске для условных запросов и автономного режима (None — без кэша).
+        metrics: Хранилище метрик запросов (по умолчанию общее REGISTRY).
+        """
+        self.base_url = base_url
+        self.max_vacancies = 10  # Максимальное количество вакансий (None — без ограничения)
+        self.max_results = 2000  # Предел пагинации API: больше результатов на один запрос не отдается
+        self.partition_lookback = timedelta(days=30)  # Период, с которого начинается разбиение по датам
+        self.min_partition_window = timedelta(minutes=1)  # Минимальное окно дат при разбиении поиска
+        self.per_page = 100  # Количество вакансий на одной странице
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = session or create_session(pool_connections, pool_maxsize or max_workers)
+        # Счетчики задержек запросов
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "errors": 0, "retries": 0, "total_time": 0.0, "max_time": 0.0}
+        # Ограничение частоты, повторы и автоматы для хостов, общие для всех потоков экземпляра
+        self.rate_limiter = rate_limiter or (RateLimiter(requests_per_second) if requests_per_second else None)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_retry_after = max_retry_after
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        self.cache = cache
+        self.metrics = metrics or REGISTRY
+        # Кэш имен работодателей, чтобы не запрашивать одно и то же имя повторно
+        self.employer_cache = TTLCache(maxsize=employer_cache_size, ttl=employer_cache_ttl)
 
-    def get_employer_vacancies(self, employer_id: int) -> List[Dict]:
-        """Получает список вакансий работодателя с HH.ru с учетом пагинации."""
-        url = f"{self.base_url}/vacancies"
-        vacancies = []
+    def _get_breaker(self, host: str) -> CircuitBreaker:
+        """Возвращает автомат для хоста, создавая его при первом обращении."""
+        with self._breakers_lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self._breakers[host]
+
+    def _get(self, url: str, params: Optional[Dict] = None) -> requests.Response:
+        """
+        Выполняет GET-запрос. Если задан кэш, запрос отправляется условным (If-None-Match / If-Modified-Since),
+        и ответ 304 восстанавливается из кэша. В автономном режиме кэша запрос в сеть не отправляется,
+        а при отсутствии записи возбуждается CacheMissError.
+        """
+        if self.cache is None:
+            return self._send(url, params)
+
+        key = HTTPCache.make_key(url, params)
+        entry = self.cache.get(key)
+        if self.cache.offline:
+            if entry is None:
+                self.cache.record("misses")
+                self.metrics.inc("hh_http_cache_total", result="miss")
+                raise CacheMissError(f"Ответа на запрос {url} нет в кэше")
+            self.cache.record("hits")
+            self.metrics.inc("hh_http_cache_total", result="hit")
+            return HTTPCache.to_response(entry)
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self._send(url, params, headers)
+        if response.status_code == 304 and entry:
+            self.cache.record("revalidated")
+            self.metrics.inc("hh_http_cache_total", result="revalidated")
+            return HTTPCache.to_response(entry)
+
+        self.cache.record("misses")
+        self.metrics.inc("hh_http_cache_total", result="miss")
+        if response.status_code == 200:
+            self.cache.set(key, {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "body": response.content.decode("utf-8"),
+            })
+        return response
+
+    def _send(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None) -> requests.Response:
+        """
+        Выполняет GET-запрос через общую сессию с учетом ограничения частоты.
+        Ошибки соединения и ответы 429/5xx повторяются с экспоненциальной задержкой и учетом Retry-After.
+        Если хост отвечает ошибками подряд, запросы к нему временно отклоняются с CircuitOpenError.
+        """
+        parsed = urlparse(url)
+        host = parsed.netloc
+        # Метка раздела API (/vacancies, /employers, ...) без ID, чтобы число рядов метрик не росло
+        endpoint = "/" + parsed.path.strip("/").split("/")[0]
+        breaker = self._get_breaker(host)
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                self.metrics.inc("hh_http_circuit_open_total", host=host)
+                raise CircuitOpenError(f"Запросы к {host} временно приостановлены после серии ошибок")
+            if self.rate_limiter:
+                with self.metrics.time("hh_http_rate_limit_wait_seconds", host=host):
+                    self.rate_limiter.acquire()
+
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except requests.exceptions.RequestException:
+                elapsed = time.perf_counter() - start
+                self._record(elapsed, error=True)
+                self.metrics.observe("hh_http_request_seconds", elapsed, endpoint=endpoint)
+                self.metrics.inc("hh_http_requests_total", endpoint=endpoint, status="error")
+                breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise
+                retry_after = None
+            else:
+                elapsed = time.perf_counter() - start
+                self._record(elapsed)
+                self.metrics.observe("hh_http_request_seconds", elapsed, endpoint=endpoint)
+                self.metrics.inc("hh_http_requests_total", endpoint=endpoint, status=response.status_code)
+                self.metrics.inc("hh_http_response_bytes_total", len(response.content), endpoint=endpoint)
+                if response.status_code not in RETRY_STATUSES:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                if attempt >= self.max_retries:
+                    return response  # Ошибку обработает raise_for_status вызывающего кода
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+            self._record_retry()
+            self.metrics.inc("hh_http_retries_total", endpoint=endpoint)
+            time.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_cap, retry_after, self.max_retry_after))
+            attempt += 1
+
+    def _record(self, elapsed: float, error: bool = False) -> None:
+        """Обновляет счетчики задержек."""
+        with self._stats_lock:
+            self._stats["requests"] += 1
+            self._stats["errors"] += int(error)
+            self._stats["total_time"] += elapsed
+            self._stats["max_time"] = max(self._stats["max_time"], elapsed)
+
+    def _record_retry(self) -> None:
+        """Увеличивает счетчик повторных попыток."""
+        with self._stats_lock:
+            self._stats["retries"] += 1
+
+    def get_stats(self) -> Dict[str, float]:
+        """Возвращает счетчики запросов: количество, ошибки, повторы, суммарную, среднюю и максимальную задержку."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["avg_time"] = stats["total_time"] / stats["requests"] if stats["requests"] else 0.0
+        return stats
+
+    def reset_stats(self) -> None:
+        """Обнуляет счетчики запросов."""
+        with self._stats_lock:
+            self._stats = {"requests": 0, "errors": 0, "retries": 0, "total_time": 0.0, "max_time": 0.0}
+
+    def close(self) -> None:
+        """Закрывает HTTP-сессию и все соединения пула."""
+        self.session.close()
+
+    def _get_vacancies_page(self, employer_id: int, page: int, per_page: int,
+                            filters: Optional[Dict] = None) -> Dict:
+        """
+        Получает одну страницу вакансий работодателя. Ошибки пробрасываются вызывающему коду.
+        filters: Дополнительные параметры поиска /vacancies (например, date_from).
+        """
+        params = {"employer_id": employer_id, "per_page": per_page, "page": page, **(filters or {})}
+        response = self._get(f"{self.base_url}/vacancies", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def _page_plan(self, limit: Optional[int]) -> Tuple[int, int]:
+        """
+        Возвращает размер страницы и максимальное количество страниц для заданного лимита вакансий.
+        API HH.ru не отдает больше max_results результатов на один запрос, поэтому лимит ограничивается им.
+        """
+        limit = min(limit, self.max_results) if limit is not None else self.max_results
+        per_page = max(1, min(self.per_page, limit))
+        return per_page, ceil(limit / per_page)
+
+    def iter_employer_vacancies(self, employer_id: int, limit: Optional[int] = None,
+                                filters: Optional[Dict] = None) -> Iterator[Dict]:
+        """
+        Постранично отдает вакансии работодателя, не накапливая их в памяти.
+        limit: Максимальное количество вакансий (None — все, до предела пагинации API).
+        filters: Дополнительные параметры поиска /vacancies (например, date_from).
+        """
+        per_page, max_pages = self._page_plan(limit)
+        remaining = limit if limit is not None else self.max_results
         page = 0
-        per_page = 100
-        total_vacancies = 0  # Счетчик полученных вакансий
 
         try:
-            while total_vacancies < self.max_vacancies:
-                params = {"employer_id": employer_id, "per_page": per_page, "page": page}
-                response = requests.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
+            while page < max_pages and remaining > 0:
+                data = self._get_vacancies_page(employer_id, page, per_page, filters)
                 items = data.get("items", [])
 
                 if not items:
                     break  # Если нет вакансий на текущей странице
-                vacancies.extend(items[:self.max_vacancies - total_vacancies]) # Добавляем вакансии с учетом лимита
-                total_vacancies += len(items)
+                yield from items[:remaining]  # Отдаем вакансии с учетом лимита
+                remaining -= len(items)
 
-                if len(items) < per_page:
-                    break  # Если на странице меньше, чем per_page, значит, это последняя страница
+                if len(items) < per_page or page + 1 >= data.get("pages", max_pages):
+                    break  # Это последняя страница
                 page += 1
 
         except requests.exceptions.RequestException as e:
@@ -41,16 +275,244 @@ class HHApi:
         except json.JSONDecodeError as e:
             print(f"Ошибка при разборе JSON: {e}")
 
-        return vacancies
+    def get_employer_vacancies(self, employer_id: int) -> List[Dict]:
+        """Получает список вакансий работодателя с HH.ru с учетом пагинации (не более max_vacancies)."""
+        return list(self.iter_employer_vacancies(employer_id, limit=self.max_vacancies))
+
+    def _iter_query_pages(self, queries: List[Tuple[int, Optional[Dict]]], limit: Optional[int] = None,
+                          max_workers: Optional[int] = None,
+                          failed: Optional[Set[int]] = None) -> Iterator[Tuple[int, int, List[Dict]]]:
+        """
+        Конкурентно выполняет несколько поисковых запросов (employer_id, параметры) и отдает страницы
+        по мере готовности в виде кортежей (employer_id, номер страницы, вакансии).
+        Сначала запрашиваются первые страницы, а как только становится известно общее число страниц,
+        в очередь ставятся остальные. Одновременно выполняется не больше max_workers запросов,
+        и новые запросы не отправляются, пока потребитель не заберет готовые страницы,
+        поэтому расход памяти не зависит от количества вакансий.
+        failed: Множество, в которое добавляются работодатели, часть страниц которых получить не удалось.
+        """
+        per_page, max_pages = self._page_plan(limit)
+        workers = max_workers or self.max_workers
+        pending = deque((query, 0) for query in range(len(queries)))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            while pending or futures:
+                while pending and len(futures) < workers:
+                    query, page = pending.popleft()
+                    employer_id, filters = queries[query]
+                    future = executor.submit(self._get_vacancies_page, employer_id, page, per_page, filters)
+                    futures[future] = (query, page)
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    query, page = futures.pop(future)
+                    employer_id = queries[query][0]
+                    try:
+                        data = future.result()
+                    except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+                        print(f"Ошибка при получении вакансий для работодателя {employer_id}: {e}")
+                        if failed is not None:
+                            failed.add(employer_id)
+                        continue
+
+                    if page == 0:
+                        # Общее число страниц известно после первой страницы — ставим в очередь остальные
+                        total_pages = min(data.get("pages", 1), max_pages)
+                        pending.extend((query, next_page) for next_page in range(1, total_pages))
+
+                    items = data.get("items", [])
+                    if limit is not None:
+                        items = items[:max(0, limit - page * per_page)]
+                    if items:
+                        yield employer_id, page, items
+
+    def iter_employers_vacancy_pages(self, employer_ids: Iterable[int], limit: Optional[int] = None,
+                                     max_workers: Optional[int] = None,
+                                     filters: Optional[Dict[int, Dict]] = None,
+                                     failed: Optional[Set[int]] = None) -> Iterator[Tuple[int, int, List[Dict]]]:
+        """
+        Конкурентно получает страницы вакансий нескольких работодателей и отдает их по мере готовности
+        в виде кортежей (employer_id, номер страницы, вакансии). Расход памяти ограничен max_workers страницами.
+        limit: Максимальное количество вакансий на работодателя (None — до предела пагинации API).
+        filters: Дополнительные параметры поиска для каждого работодателя {employer_id: параметры}.
+        failed: Множество, в которое добавляются работодатели, часть страниц которых получить не удалось.
+        """
+        filters = filters or {}
+        queries = [(employer_id, filters.get(employer_id)) for employer_id in employer_ids]
+        return self._iter_query_pages(queries, limit, max_workers, failed)
+
+    def _count_vacancies(self, employer_id: int, filters: Optional[Dict] = None) -> Optional[int]:
+        """Возвращает количество вакансий работодателя, подходящих под параметры поиска, или None при ошибке."""
+        try:
+            return self._get_vacancies_page(employer_id, 0, 1, filters).get("found", 0)
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            print(f"Ошибка при получении количества вакансий работодателя {employer_id}: {e}")
+            return None
+
+    def _split_window(self, employer_id: int, start: Optional[datetime], end: datetime) -> List[Dict]:
+        """
+        Рекурсивно делит окно дат публикации [start, end] пополам, пока в каждой части
+        не окажется не больше max_results вакансий. start = None означает окно без нижней границы.
+        """
+        filters = {"date_to": end.isoformat()}
+        if start is not None:
+            filters["date_from"] = start.isoformat()
+
+        found = self._count_vacancies(employer_id, filters)
+        if found == 0:
+            return []
+        if found is None or found <= self.max_results:
+            return [filters]
+        if start is None:
+            # Окно без нижней границы: отделяем от него последний период partition_lookback
+            start = end - self.partition_lookback
+            if start.year < 2000:
+                return [filters]
+            return self._split_window(employer_id, None, start) + self._split_window(employer_id, start, end)
+        if end - start <= self.min_partition_window:
+            print(f"Работодатель {employer_id}: в окне {start:%Y-%m-%d %H:%M} больше {self.max_results} вакансий, "
+                  f"часть из них не будет получена.")
+            return [filters]
+
+        middle = start + (end - start) / 2
+        return self._split_window(employer_id, start, middle) + self._split_window(employer_id, middle, end)
+
+    def plan_vacancy_partitions(self, employer_id: int, date_from: Optional[datetime] = None) -> List[Dict]:
+        """
+        Составляет список параметров поиска (окон дат публикации), каждое из которых возвращает
+        не больше max_results вакансий, так что вместе они покрывают все вакансии работодателя.
+        Если вакансий меньше предела пагинации, возвращается один запрос без дополнительного разбиения.
+        date_from: Нижняя граница даты публикации (например, отметка инкрементальной синхронизации).
+        """
+        filters = {"date_from": date_from.isoformat()} if date_from else {}
+        found = self._count_vacancies(employer_id, filters)
+        if found == 0:
+            return []
+        if found is None or found <= self.max_results:
+            return [filters]
+        return self._split_window(employer_id, date_from, datetime.now(timezone.utc))
+
+    def iter_partitioned_vacancy_pages(self, employer_ids: Iterable[int], max_workers: Optional[int] = None,
+                                       date_from: Optional[Dict[int, datetime]] = None,
+                                       failed: Optional[Set[int]] = None) -> Iterator[Tuple[int, int, List[Dict]]]:
+        """
+        Получает все вакансии работодателей в обход предела пагинации API: поиск каждого работодателя
+        делится на окна дат публикации (plan_vacancy_partitions), окна запрашиваются конкурентно,
+        а вакансии, попавшие на границу соседних окон, отбрасываются по ID.
+        Отдает кортежи (employer_id, номер страницы внутри окна, вакансии).
+        date_from: Нижняя граница даты публикации для каждого работодателя {employer_id: дата}.
+        failed: Множество, в которое добавляются работодатели, часть страниц которых получить не удалось.
+        """
+        employer_ids = list(employer_ids)
+        date_from = date_from or {}
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+            plans = executor.map(lambda employer_id: self.plan_vacancy_partitions(employer_id,
+                                                                                 date_from.get(employer_id)),
+                                 employer_ids)
+            queries = [(employer_id, filters) for employer_id, plan in zip(employer_ids, plans) for filters in plan]
+
+        seen_ids: Set[str] = set()
+        for employer_id, page, items in self._iter_query_pages(queries, None, max_workers, failed):
+            unique_items = [item for item in items if item["id"] not in seen_ids]
+            seen_ids.update(item["id"] for item in unique_items)
+            if unique_items:
+                yield employer_id, page, unique_items
+
+    def get_employer_vacancy_count(self, employer_id: int) -> Optional[int]:
+        """Возвращает количество открытых вакансий работодателя на сайте или None при ошибке."""
+        return self._count_vacancies(employer_id)
+
+    def get_employer_vacancy_ids(self, employer_id: int) -> Optional[Set[int]]:
+        """
+        Возвращает ID всех открытых вакансий работодателя или None, если полный список получить не удалось.
+        Поиск отдает не больше max_results вакансий, поэтому ID собираются по окнам дат публикации
+        (plan_vacancy_partitions). Если в каком-либо окне получено меньше ID, чем найдено, список неполон.
+        """
+        per_page, max_pages = self._page_plan(None)
+        vacancy_ids: Set[int] = set()
+        try:
+            for filters in self.plan_vacancy_partitions(employer_id):
+                window_ids: Set[int] = set()
+                found = 0
+                for page in range(max_pages):
+                    data = self._get_vacancies_page(employer_id, page, per_page, filters)
+                    if page == 0:
+                        found = data.get("found", 0)
+                    window_ids.update(int(item["id"]) for item in data.get("items", []))
+                    if page + 1 >= data.get("pages", 0):
+                        break
+                if len(window_ids) < found:
+                    print(f"Работодатель {employer_id}: получено {len(window_ids)} ID вакансий из {found}, "
+                          f"список неполон.")
+                    return None
+                vacancy_ids |= window_ids
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            print(f"Ошибка при получении списка вакансий работодателя {employer_id}: {e}")
+            return None
+        return vacancy_ids
+
+    def get_employers_vacancies(self, employer_ids: Iterable[int],
+                                max_workers: Optional[int] = None) -> Dict[int, List[Dict]]:
+        """
+        Конкурентно получает вакансии сразу нескольких работодателей.
+        Возвращает словарь {employer_id: список вакансий}, не более max_vacancies на работодателя.
+        """
+        employer_ids = list(employer_ids)
+        pages: Dict[int, Dict[int, List[Dict]]] = {employer_id: {} for employer_id in employer_ids}
+        for employer_id, page, items in self.iter_employers_vacancy_pages(employer_ids, self.max_vacancies,
+                                                                          max_workers):
+            pages[employer_id][page] = items
+
+        result: Dict[int, List[Dict]] = {}
+        for employer_id, employer_pages in pages.items():
+            vacancies = []
+            for page in sorted(employer_pages):
+                vacancies.extend(employer_pages[page])
+            result[employer_id] = vacancies
+        return result
 
     def get_employer_name(self, employer_id: int) -> Optional[str]:
-        """Получает имя работодателя по его ID."""
+        """Получает имя работодателя по его ID. Повторные запросы обслуживаются из кэша."""
+        cached_name = self.employer_cache.get(employer_id)
+        if cached_name is not None:
+            return cached_name
+
         url = f"{self.base_url}/employers/{employer_id}"
         try:
-            response = requests.get(url)
+            response = self._get(url)
             response.raise_for_status()
             employer_data = response.json()
-            return employer_data.get('name')
+            employer_name = employer_data.get('name')
+            if employer_name:
+                self.employer_cache.set(employer_id, employer_name)
+            return employer_name
         except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
             print(f"Ошибка при получении данных о работодателе {employer_id}: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def get_currency_rates(self) -> Dict[str, float]:
+        """
+        Получает курсы валют из справочника /dictionaries: {код валюты: сколько единиц валюты стоит один рубль}.
+        При ошибке возвращает пустой словарь.
+        """
+        try:
+            response = self._get(f"{self.base_url}/dictionaries")
+            response.raise_for_status()
+            currencies = response.json().get("currency", [])
+            return {currency["code"]: float(currency["rate"]) for currency in currencies if currency.get("rate")}
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            print(f"Ошибка при получении курсов валют: {e}")
+            return {}
+
+    def preload_employer_names(self, employer_names: Dict[int, str]) -> None:
+        """Заполняет кэш имен заранее известными значениями (например, из таблицы employers)."""
+        self.employer_cache.update({employer_id: name for employer_id, name in employer_names.items() if name})
+
+    def get_employers_names(self, employer_ids: Iterable[int],
+                            max_workers: Optional[int] = None) -> Dict[int, Optional[str]]:
+        """Конкурентно получает имена нескольких работодателей. Возвращает словарь {employer_id: имя}."""
+        employer_ids = list(employer_ids)
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+            names = executor.map(self.get_employer_name, employer_ids)
+            return dict(zip(employer_ids, names))
@@ -0,0 +1,69 @@
+# Импортируем необходимые библиотеки и модули
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """Потокобезопасный кэш в памяти с ограничением размера (LRU) и временем жизни записей."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """
+        Инициализирует экземпляр класса.
+        maxsize: Максимальное количество записей, при превышении вытесняются самые давно использованные.
+        ttl: Время жизни записи в секундах (None — записи не устаревают).
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Возвращает значение по ключу или default, если записи нет или она устарела."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Сохраняет значение, при переполнении вытесняет самую давно использованную запись."""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def update(self, mapping: Dict[Hashable, Any]) -> None:
+        """Сохраняет сразу несколько значений."""
+        for key, value in mapping.items():
+            self.set(key, value)
+
+    def clear(self) -> None:
+        """Удаляет все записи."""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает количество попаданий, промахов и текущий размер кэша."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
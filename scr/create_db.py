@@ -1,15 +1,35 @@
 # Импортируем необходимые библиотеки и модули
 import psycopg2
-from typing import Dict, Optional
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional
 
 # Импортируем нужные методы
-from scr.sql_queries import check_db_exists, create_db, create_employers_table, create_vacancies_table
+from scr.sql_queries import (check_db_exists, create_db, create_employers_table, create_vacancies_table,
+                             alter_vacancies_table, create_sync_state_table, create_indexes, create_search_vector,
+                             create_statistics_views, create_meta_table, create_currency_rates_table,
+                             create_partitioned_vacancies_table, rename_unpartitioned_vacancies_table,
+                             get_unpartitioned_vacancies_range_query, copy_unpartitioned_vacancies,
+                             create_ingest_queue_table)
+from scr.metrics import MetricsRegistry, REGISTRY
+from scr.partitions import (ARCHIVE_SCHEMA, add_months, month_start, is_partitioned, ensure_partitions,
+                            detach_old_partitions, move_default_rows)
 
 class DatabaseCreator:
     """Класс для создания базы данных и таблиц в PostgreSQL."""
-    def __init__(self, db_name: str, params: Dict[str, str]):
-        """Инициализирует экземпляр класса."""
+    def __init__(self, db_name: str, params: Dict[str, str], metrics: Optional[MetricsRegistry] = None,
+                 partitioned: bool = False, months_ahead: int = 1):
+        """
+        Инициализирует экземпляр класса.
+        metrics: Хранилище метрик, в которое записывается время создания базы, таблиц и индексов
+                 (по умолчанию общее REGISTRY).
+        partitioned: Создать таблицу vacancies секционированной по месяцам публикации. Существующая обычная
+                     таблица переводится на секционирование вместе с данными.
+        months_ahead: На сколько месяцев вперед заранее создавать секции (для секционированной таблицы).
+        """
         self.db_name = db_name
+        self.metrics = metrics or REGISTRY
+        self.partitioned = partitioned
+        self.months_ahead = months_ahead
         self.conn: Optional= None # Инициализируем соединение
         self.cur: Optional = None # Инициализируем курсор
         # Создаем копию параметров, чтобы не изменять исходные
@@ -24,44 +44,156 @@ class DatabaseCreator:
 
     def create_database(self) -> None:
         """Создает базу данных, если она не существует."""
-        try:
-            # Подключаемся к базе данных postgres для создания новой
-            self.conn = psycopg2.connect(database='postgres', **self.params)
-            self.conn.autocommit = True  # Включаем автокоммит для выполнения команд DDL
-            self.cur = self.conn.cursor()
-
-            # Проверяем, существует ли база данных
-            self.cur.execute(check_db_exists(self.db_name))
-            exists = self.cur.fetchone()
-            if not exists:
-                # Создаем базу данных
-                self.cur.execute(create_db(self.db_name))
-                print(f"База данных '{self.db_name}' успешно создана.")
-            else:
-                print(f"База данных '{self.db_name}' уже существует.")
-
-        except psycopg2.Error as e:
-            print(f"Ошибка при создании базы данных: {e}")
-        finally:
-            self._close()
+        with self.metrics.time("db_ddl_seconds", step="create_database"):
+            try:
+                # Подключаемся к базе данных postgres для создания новой
+                self.conn = psycopg2.connect(database='postgres', **self.params)
+                self.conn.autocommit = True  # Включаем автокоммит для выполнения команд DDL
+                self.cur = self.conn.cursor()
+
+                # Проверяем, существует ли база данных
+                self.cur.execute(check_db_exists(self.db_name))
+                exists = self.cur.fetchone()
+                if not exists:
+                    # Создаем базу данных
+                    self.cur.execute(create_db(self.db_name))
+                    print(f"База данных '{self.db_name}' успешно создана.")
+                else:
+                    print(f"База данных '{self.db_name}' уже существует.")
+
+            except psycopg2.Error as e:
+                print(f"Ошибка при создании базы данных: {e}")
+            finally:
+                self._close()
 
     def create_tables(self) -> None:
-        """Создает таблицы employers и vacancies."""
-        try:
-            # Подключаемся к созданной базе данных
-            self.conn = psycopg2.connect(dbname=self.db_name, **self.params)  # используем dbname
-            self.cur = self.conn.cursor()
+        """
+        Создает таблицы employers, vacancies, sync_state, meta, currency_rates, ingest_queue
+        и представления со статистикой.
+        """
+        with self.metrics.time("db_ddl_seconds", step="create_tables"):
+            try:
+                # Подключаемся к созданной базе данных
+                self.conn = psycopg2.connect(dbname=self.db_name, **self.params)  # используем dbname
+                self.cur = self.conn.cursor()
+
+                # SQL-запрос для создания таблицы employers
+                self.cur.execute(create_employers_table())
+
+                # SQL-запрос для создания таблицы vacancies
+                if self.partitioned:
+                    self._create_partitioned_vacancies()
+                else:
+                    self.cur.execute(create_vacancies_table())
+                # Добавляем новые столбцы в таблицу, созданную предыдущими версиями программы
+                self.cur.execute(alter_vacancies_table())
+                if is_partitioned(self.cur):
+                    # Секции прошлого, текущего и следующих месяцев создаются заранее: API отдает в основном
+                    # вакансии этих месяцев, и загрузке почти никогда не нужно создавать секции самой
+                    # (создание секции блокирует таблицу vacancies до конца транзакции загрузки)
+                    current = month_start(datetime.now(timezone.utc))
+                    ensure_partitions(self.cur, add_months(current, -1), add_months(current, self.months_ahead))
+                    # Вакансии, попавшие в секцию по умолчанию, переносятся в месячные секции,
+                    # чтобы на них распространялось отсоединение старых секций
+                    move_default_rows(self.cur)
+
+                # SQL-запрос для создания таблицы sync_state с отметками инкрементальной синхронизации
+                self.cur.execute(create_sync_state_table())
+
+                # SQL-запрос для создания таблицы meta с версией данных
+                self.cur.execute(create_meta_table())
+
+                # SQL-запрос для создания таблицы currency_rates с курсами валют
+                self.cur.execute(create_currency_rates_table())
+
+                # SQL-запрос для создания таблицы ingest_queue с очередью загрузки в несколько процессов
+                self.cur.execute(create_ingest_queue_table())
+
+                # Материализованные представления со статистикой для меню
+                self.cur.execute(create_statistics_views())
+
+                self.conn.commit()
+                print("Таблицы 'employers', 'vacancies', 'sync_state', 'meta', 'currency_rates' и 'ingest_queue' "
+                      "успешно созданы или уже существуют.")
+
+            except psycopg2.Error as e:
+                print(f"Ошибка при создании таблиц: {e}")
+            finally:
+                self._close()
+
+    def create_indexes(self, full_text: bool = True) -> None:
+        """
+        Создает индексы для соединений, фильтров по зарплате и поиска по названию (pg_trgm).
+        full_text: Дополнительно создать столбец search_vector и индекс для полнотекстового поиска.
+        """
+        with self.metrics.time("db_ddl_seconds", step="create_indexes"):
+            try:
+                self.conn = psycopg2.connect(dbname=self.db_name, **self.params)
+                self.cur = self.conn.cursor()
+
+                self.cur.execute(create_indexes())
+                if full_text:
+                    self.cur.execute(create_search_vector())
+
+                self.conn.commit()
+                print("Индексы таблицы 'vacancies' успешно созданы или уже существуют.")
+
+            except psycopg2.Error as e:
+                print(f"Ошибка при создании индексов: {e}")
+            finally:
+                self._close()
+
+    def _create_partitioned_vacancies(self) -> None:
+        """
+        Создает секционированную таблицу vacancies. Если уже есть обычная таблица, ее данные переносятся
+        в новую: сначала создаются секции для всех месяцев публикации (чтобы строки не попали в секцию
+        по умолчанию), затем строки копируются.
+        Индексы создаются заново методом create_indexes.
+        """
+        self.cur.execute("SELECT to_regclass('vacancies') IS NOT NULL")
+        exists = self.cur.fetchone()[0]
+        if exists and is_partitioned(self.cur):
+            return
+        if not exists:
+            self.cur.execute(create_partitioned_vacancies_table())
+            return
+
+        # Таблица предыдущих версий может не иметь столбцов, которые читает перенос (published_at, archived, ...)
+        self.cur.execute(alter_vacancies_table())
+        self.cur.execute(rename_unpartitioned_vacancies_table())
+        self.cur.execute(create_partitioned_vacancies_table())
+        self.cur.execute(get_unpartitioned_vacancies_range_query())
+        first, last = self.cur.fetchone()
+        # Вакансии без даты публикации получают текущую дату, поэтому секции нужны до текущего месяца включительно
+        current = month_start(datetime.now(timezone.utc))
+        ensure_partitions(self.cur, min(month_start(first), current) if first else current,
+                          max(month_start(last), current) if last else current)
+        self.cur.execute(copy_unpartitioned_vacancies())
+        print("Таблица 'vacancies' переведена на секционирование по месяцам публикации.")
 
-            # SQL-запрос для создания таблицы employers
-            self.cur.execute(create_employers_table())
+    def detach_old_partitions(self, keep_months: int, today: Optional[date] = None) -> List[str]:
+        """
+        Отсоединяет секции таблицы vacancies старше keep_months месяцев и переносит их в архивную схему
+        (vacancies_archive). Возвращает имена отсоединенных секций.
+        """
+        detached: List[str] = []
+        with self.metrics.time("db_ddl_seconds", step="detach_old_partitions"):
+            try:
+                self.conn = psycopg2.connect(dbname=self.db_name, **self.params)
+                self.cur = self.conn.cursor()
 
-            # SQL-запрос для создания таблицы vacancies
-            self.cur.execute(create_vacancies_table())
+                if not is_partitioned(self.cur):
+                    print("Таблица 'vacancies' не секционирована, отсоединять нечего.")
+                    return detached
+                detached = detach_old_partitions(self.cur, keep_months, today)
 
-            self.conn.commit()
-            print("Таблицы 'employers' и 'vacancies' успешно созданы или уже существуют.")
+                self.conn.commit()
+                if detached:
+                    print(f"Секции перенесены в схему '{ARCHIVE_SCHEMA}': {', '.join(detached)}.")
 
-        except psycopg2.Error as e:
-            print(f"Ошибка при создании таблиц: {e}")
-        finally:
-            self._close()
\ No newline at end of file
+            except psycopg2.Error as e:
+                print(f"Ошибка при отсоединении секций: {e}")
+                detached = []
+            finally:
+                self._close()
+        return detached
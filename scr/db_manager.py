@@ -1,125 +1,543 @@
 # Импортируем необходимые библиотеки и модули
+import inspect
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, List, Dict, Optional, Iterator, NamedTuple, Tuple, Union
+
 import psycopg2
-from typing import List, Dict, Optional
+from psycopg2.pool import ThreadedConnectionPool
 
-# Импортируем нужные методы
+# Импортируем нужные классы и методы
+from scr import sql_queries
+from scr.cache import TTLCache
+from scr.metrics import MetricsRegistry, SlowQueryLog, REGISTRY
 from scr.sql_queries import (
+    get_data_version_query,
     get_companies_and_vacancies_count,
     get_all_vacancies,
     get_avg_salary,
     get_vacancies_with_higher_salary,
-    get_vacancies_with_keyword
+    get_vacancies_with_keyword,
+    get_all_vacancies_page,
+    get_vacancies_with_higher_salary_page,
+    get_vacancies_with_keyword_page,
+    search_vacancies_fulltext,
+    search_vacancies_trigram
 )
 
+_MISSING = object()  # Признак отсутствия записи в кэше или следующей строки курсора
+_QUERY_NAMES: Optional[Dict[str, str]] = None  # Текст запроса -> имя функции из sql_queries
+
+
+def query_name(sql: str) -> str:
+    """
+    Возвращает имя функции из sql_queries, которая строит запрос sql (для меток метрик и журнала
+    медленных запросов). Запросы функций с параметрами и посторонние запросы получают имя 'other'.
+    """
+    global _QUERY_NAMES
+    if _QUERY_NAMES is None:
+        _QUERY_NAMES = {function(): name for name, function in inspect.getmembers(sql_queries, inspect.isfunction)
+                        if function.__module__ == sql_queries.__name__
+                        and not inspect.signature(function).parameters}
+    return _QUERY_NAMES.get(sql, 'other')
+
+
+class VacancyRow(NamedTuple):
+    """
+    Компактное представление строки о вакансии: кортеж без словаря атрибутов (__slots__ = ()),
+    с доступом к полям по имени. В несколько раз легче словаря из шести ключей.
+    """
+    employer_name: str
+    vacancy_name: str
+    salary_from: Optional[int]
+    salary_to: Optional[int]
+    currency: Optional[str]
+    vacancy_url: Optional[str]
+
+
+class VacancyPage(NamedTuple):
+    """
+    Страница вакансий. next_cursor — ключ последней строки, который передается в параметре after
+    для получения следующей страницы (None, если страница последняя).
+    """
+    items: List[Union[Dict, VacancyRow]]
+    next_cursor: Optional[Tuple]
+
+
 class DBManager:
-    """Класс для работы с базой данных PostgreSQL, содержащей информацию о компаниях и вакансиях."""
+    """
+    Класс для работы с базой данных PostgreSQL, содержащей информацию о компаниях и вакансиях.
+    Соединения берутся из общего пула, поэтому экземпляр можно использовать из нескольких потоков.
+    Поддерживает протокол контекстного менеджера: при выходе из блока with пул закрывается.
+    """
 
-    def __init__(self, db_name: str, params: Dict[str, str]):
+    def __init__(self, db_name: str, params: Dict[str, str], minconn: int = 1, maxconn: int = 10,
+                 itersize: int = 2000, cache_size: int = 128, cache_ttl: Optional[float] = 300,
+                 version_check_interval: float = 1.0, metrics: Optional[MetricsRegistry] = None,
+                 slow_query_log: Optional[SlowQueryLog] = None, cache_max_rows: int = 1000):
         """
         Инициализирует экземпляр класса.
         db_namе: Имя базы данных.
         params: Параметры подключения к базе данных.
+        minconn: Количество соединений, которые пул держит открытыми.
+        maxconn: Максимальное количество одновременно открытых соединений.
+        itersize: Количество строк, которое потоковые методы iter_* получают с сервера за один раз.
+        cache_size: Максимальное количество результатов запросов в кэше (0 — кэш отключен).
+        cache_ttl: Время жизни результата в кэше в секундах (None — до смены версии данных).
+        cache_max_rows: Результаты длиннее стольких строк не кэшируются (кэш не должен хранить копии таблицы).
+        version_check_interval: Как часто (в секундах) сверять версию данных в таблице meta.
+        metrics: Хранилище метрик запросов (по умолчанию общее REGISTRY).
+        slow_query_log: Журнал медленных запросов (None — медленные запросы не сохраняются).
         """
         self.db_name: str = db_name
         self.params: Dict[str, str] = params
-        self.conn: Optional= None # Инициализируем соединение
-        self.cur: Optional = None # Инициализируем курсор
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.itersize = itersize
+        self._pool: Optional[ThreadedConnectionPool] = None  # Пул создается при первом запросе
+        self._pool_lock = threading.Lock()
+        # Ограничивает число потоков, одновременно держащих соединение: остальные ждут, а не получают ошибку
+        self._slots = threading.BoundedSemaphore(maxconn)
+        # Кэш результатов запросов; сбрасывается, когда загрузчик увеличивает версию данных
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self.cache_max_rows = cache_max_rows
+        self.version_check_interval = version_check_interval
+        self._data_version: Optional[int] = None
+        self._version_checked_at: Optional[float] = None
+        self._version_lock = threading.Lock()
+        self._invalidations = 0
+        self.metrics = metrics or REGISTRY
+        self.slow_query_log = slow_query_log
+
+    def __enter__(self) -> "DBManager":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _get_pool(self) -> ThreadedConnectionPool:
+        """Возвращает пул соединений, создавая его при первом обращении."""
+        with self._pool_lock:
+            if self._pool is None:
+                try:
+                    self._pool = ThreadedConnectionPool(self.minconn, self.maxconn,
+                                                        **{**self.params, 'dbname': self.db_name})
+                except psycopg2.Error as e:
+                    print(f"Ошибка при подключении к базе данных: {e}")
+                    raise
+            return self._pool
 
-    def _connect(self):
-        """Устанавливает соединение с базой данных и создает курсор."""
+    @contextmanager
+    def _cursor(self, name: Optional[str] = None) -> Iterator:
+        """
+        Берет соединение из пула и отдает курсор. После выполнения запроса транзакция завершается,
+        а соединение возвращается в пул (разорванное соединение закрывается).
+        name: Имя серверного курсора; если задано, строки передаются с сервера порциями по мере чтения.
+        """
+        pool = self._get_pool()
+        with self._slots:
+            conn = pool.getconn()
+            try:
+                with conn.cursor(name=name) as cur:
+                    yield cur
+                conn.commit()
+            except Exception:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+            finally:
+                pool.putconn(conn, close=bool(conn.closed))
+
+    def close(self) -> None:
+        """Закрывает все соединения пула."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+
+    def _execute(self, cur, sql: str, params: Any, name: Optional[str] = None) -> None:
+        """
+        Выполняет запрос, учитывая время выполнения и количество строк в метриках.
+        Запрос дольше порога журнала медленных запросов сохраняется в журнал вместе с планом выполнения.
+        """
+        name = name or query_name(sql)
+        start = time.perf_counter()
+        cur.execute(sql, params)
+        elapsed = time.perf_counter() - start
+        rows = cur.rowcount if cur.rowcount is not None and cur.rowcount >= 0 else None
+        self._observe_query(cur, name, sql, params, elapsed, rows)
+
+    def _observe_query(self, cur, name: str, sql: str, params: Any, elapsed: float, rows: Optional[int]) -> None:
+        """
+        Учитывает выполненный запрос в метриках (время, количество запросов и строк)
+        и сохраняет его в журнал медленных запросов, если он выполнялся дольше порога.
+        """
+        self.metrics.observe("db_query_seconds", elapsed, query=name)
+        self.metrics.inc("db_queries_total", query=name)
+        if rows is not None:
+            self.metrics.inc("db_query_rows_total", rows, query=name)
+        if self.slow_query_log is not None and elapsed >= self.slow_query_log.threshold:
+            plan = self._explain(cur, sql, params) if self.slow_query_log.explain else None
+            self.slow_query_log.record(name, sql, params, elapsed, plan)
+
+    @staticmethod
+    def _explain(cur, sql: str, params: Any) -> Any:
+        """Возвращает план выполнения запроса (EXPLAIN в формате JSON) или None, если его не удалось получить."""
+        if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+            return None  # Планы запросов, изменяющих данные, не сохраняем
         try:
-            self.conn = psycopg2.connect(dbname=self.db_name, **self.params)
-            self.cur = self.conn.cursor()
+            with cur.connection.cursor() as explain_cur:
+                explain_cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+                return explain_cur.fetchone()[0]
         except psycopg2.Error as e:
-            print(f"Ошибка при подключении к базе данных: {e}")
-            raise
+            print(f"Не удалось получить план медленного запроса: {e}")
+            return None
 
-    def _close(self):
-        """Закрывает соединение и курсор, если они были открыты."""
-        if self.cur:
-            self.cur.close()
-        if self.conn:
-            self.conn.close()
+    def _check_data_version(self) -> bool:
+        """
+        Сверяет версию данных в таблице meta (не чаще version_check_interval секунд)
+        и очищает кэш, если загрузчик успел ее изменить.
+        Возвращает False, если версию узнать не удалось (например, в базе нет таблицы meta):
+        тогда нельзя понять, устарел ли кэш, и результаты не кэшируются.
+        """
+        with self._version_lock:
+            now = time.monotonic()
+            if self._version_checked_at is not None and now - self._version_checked_at < self.version_check_interval:
+                return self._data_version is not None
+            try:
+                with self._cursor() as cur:
+                    self._execute(cur, get_data_version_query(), None)
+                    row = cur.fetchone()
+            except psycopg2.Error:
+                row = None
+            version = row[0] if row else None
+            self._version_checked_at = now
+            if version != self._data_version:
+                if self._data_version is not None:
+                    self._invalidations += 1
+                self._cache.clear()
+                self._data_version = version
+            return version is not None
 
     @staticmethod
-    def _process_vacancy_rows(cursor) -> List[Dict]:
-        """Преобразует строки из курсора в список словарей о вакансиях."""
-        result: List[Dict] = []
-        for row in cursor:
-            result.append({
-                'employer_name': row[0],
-                'vacancy_name': row[1],
-                'salary_from': row[2],
-                'salary_to': row[3],
-                'currency': row[4],
-                'vacancy_url': row[5]
-            })
+    def _copy_result(result: Any) -> Any:
+        """
+        Возвращает копию результата из кэша: новый список с копиями словарей, чтобы изменения
+        на стороне вызывающего кода не попадали в кэш (кортежи и VacancyRow неизменяемы).
+        """
+        if isinstance(result, list):
+            return [dict(row) if isinstance(row, dict) else row for row in result]
         return result
 
+    @staticmethod
+    def _result_rows(result: Any) -> int:
+        """
+        Возвращает количество строк результата для ограничения cache_max_rows: длину списка строк
+        или длину самого длинного столбца, если результат — кортеж столбцов (например, массивов NumPy).
+        """
+        if isinstance(result, list):
+            return len(result)
+        if isinstance(result, tuple):
+            return max((len(column) for column in result
+                        if hasattr(column, '__len__') and not isinstance(column, (str, bytes))), default=1)
+        return 1
+
+    def _query(self, sql: str, params: Any, convert: Callable, name: Optional[str] = None,
+               cache: bool = True) -> Any:
+        """
+        Выполняет запрос и преобразует курсор функцией convert. Результат кэшируется по тексту запроса,
+        параметрам и функции преобразования до истечения cache_ttl или смены версии данных.
+        Результаты длиннее cache_max_rows строк (или со столбцами такой длины) не кэшируются.
+        Ошибки базы данных не кэшируются и пробрасываются вызывающему коду.
+        name: Имя запроса в метриках (по умолчанию — имя функции из sql_queries).
+        cache: Использовать кэш (False — для запросов, возвращающих всю таблицу).
+        """
+        if self._cache.maxsize <= 0 or not cache or not self._check_data_version():
+            with self._cursor() as cur:
+                self._execute(cur, sql, params, name)
+                return convert(cur)
+
+        if isinstance(params, dict):
+            frozen_params = tuple(sorted(params.items()))
+        elif isinstance(params, tuple):
+            # Списки (параметры-массивы PostgreSQL) заменяются кортежами, чтобы ключ кэша был хэшируемым
+            frozen_params = tuple(tuple(param) if isinstance(param, list) else param for param in params)
+        else:
+            frozen_params = params
+        key = (sql, frozen_params, convert)
+        result = self._cache.get(key, _MISSING)
+        if result is _MISSING:
+            self.metrics.inc("db_query_cache_total", result="miss")
+            with self._cursor() as cur:
+                self._execute(cur, sql, params, name)
+                result = convert(cur)
+            if self._result_rows(result) <= self.cache_max_rows:
+                self._cache.set(key, result)  # Наружу отдаются только копии, поэтому кэш никто не изменит
+            else:
+                self.metrics.inc("db_query_cache_total", result="too_large")
+                return result
+        else:
+            self.metrics.inc("db_query_cache_total", result="hit")
+        return self._copy_result(result)
+
+    def query(self, sql: str, params: Any, convert: Callable, name: Optional[str] = None,
+              cache: bool = True) -> Any:
+        """
+        Выполняет произвольный запрос на чтение через пул соединений, метрики и кэш DBManager.
+        convert: Функция, преобразующая курсор в результат (уровня модуля или статический метод:
+                 она входит в ключ кэша). Кэшированный результат разделяется между вызовами,
+                 поэтому convert должна возвращать неизменяемые значения или списки строк.
+        name: Имя запроса в метриках (по умолчанию — имя функции из sql_queries).
+        cache: Использовать кэш.
+        Ошибки базы данных пробрасываются вызывающему коду.
+        """
+        return self._query(sql, params, convert, name, cache)
+
+    def invalidate_cache(self) -> None:
+        """Очищает кэш результатов запросов."""
+        self._cache.clear()
+        self._invalidations += 1
+
+    def cache_stats(self) -> Dict[str, Optional[int]]:
+        """Возвращает статистику кэша: попадания, промахи, размер, количество сбросов и текущую версию данных."""
+        stats: Dict[str, Optional[int]] = dict(self._cache.stats())
+        stats['invalidations'] = self._invalidations
+        stats['data_version'] = self._data_version
+        return stats
+
+    @staticmethod
+    def _process_company_rows(cursor) -> List[Dict]:
+        """Преобразует строки из курсора в список компаний с количеством вакансий."""
+        return [{'employer_name': row[0], 'vacancies_count': row[1]} for row in cursor]
+
+    @staticmethod
+    def _process_avg_salary(cursor) -> Optional[float]:
+        """Возвращает среднюю зарплату из первой строки курсора."""
+        avg_salary: Optional[float] = cursor.fetchone()[0]
+        return float(avg_salary) if avg_salary is not None else None
+
+    @staticmethod
+    def _process_compact_rows(cursor) -> List[VacancyRow]:
+        """Преобразует строки из курсора в список VacancyRow."""
+        return list(map(VacancyRow._make, cursor))
+
+    @staticmethod
+    def _vacancy_rows_converter(compact: bool) -> Callable:
+        """Возвращает функцию преобразования курсора в список вакансий нужного вида."""
+        return DBManager._process_compact_rows if compact else DBManager._process_vacancy_rows
+
+    @staticmethod
+    def _vacancy_row_to_dict(row) -> Dict:
+        """Преобразует строку результата запроса в словарь с информацией о вакансии."""
+        return dict(zip(VacancyRow._fields, row))
+
+    @staticmethod
+    def _process_vacancy_rows(cursor, compact: bool = False) -> Union[List[Dict], List[VacancyRow]]:
+        """
+        Преобразует строки из курсора в список вакансий.
+        compact: Вернуть VacancyRow вместо словарей.
+        """
+        if compact:
+            return DBManager._process_compact_rows(cursor)
+        return [DBManager._vacancy_row_to_dict(row) for row in cursor]
+
+    @staticmethod
+    def _process_raw_rows(cursor) -> List[Tuple]:
+        """Возвращает строки курсора без преобразования."""
+        return cursor.fetchall()
+
+    def _get_page(self, build_query: Callable[[bool], str], params: tuple, after: Optional[Tuple],
+                  page_size: int, compact: bool, error_message: str) -> VacancyPage:
+        """
+        Получает страницу вакансий по ключу (keyset pagination): вместо OFFSET запрос продолжает
+        с ключа последней строки предыдущей страницы, поэтому любая страница стоит столько же, сколько первая.
+        Запрашивается на одну строку больше page_size, чтобы узнать, есть ли следующая страница.
+        build_query: Функция, возвращающая SQL-запрос с условием по ключу или без него.
+        params: Параметры запроса, предшествующие ключу и размеру страницы.
+        """
+        try:
+            rows = self._query(build_query(after is not None), (*params, *(after or ()), page_size + 1),
+                               DBManager._process_raw_rows, name=build_query.__name__)
+        except psycopg2.Error as e:
+            print(f"{error_message}: {e}")
+            return VacancyPage([], None)
+
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        convert = VacancyRow._make if compact else DBManager._vacancy_row_to_dict
+        # Последние столбцы строки — ключ для следующей страницы, в результат они не попадают
+        items = [convert(row[:len(VacancyRow._fields)]) for row in rows]
+        next_cursor = tuple(rows[-1][len(VacancyRow._fields):]) if has_next else None
+        return VacancyPage(items, next_cursor)
+
+    def _iter_vacancies(self, query: str, params: Optional[tuple], error_message: str,
+                        itersize: Optional[int], compact: bool = False) -> Iterator[Union[Dict, VacancyRow]]:
+        """
+        Выполняет запрос через именованный серверный курсор и лениво отдает вакансии по одной.
+        С сервера строки получаются порциями по itersize, поэтому расход памяти не зависит от размера результата.
+        Соединение занято, пока итератор не будет исчерпан или закрыт.
+        """
+        name = query_name(query)
+        try:
+            with self._cursor(name=f"vacancies_{uuid.uuid4().hex}") as cur:
+                cur.itersize = itersize or self.itersize
+                convert = VacancyRow._make if compact else DBManager._vacancy_row_to_dict
+                # Для именованного курсора execute только объявляет его (DECLARE), а запрос выполняется
+                # при получении порций строк. Поэтому учитывается суммарное время execute и всех выборок,
+                # но не время, пока вызывающий код обрабатывает уже полученные вакансии.
+                rows = 0
+                elapsed = 0.0
+                start = time.perf_counter()
+                try:
+                    cur.execute(query, params)
+                    rows_iter = iter(cur)
+                    row = next(rows_iter, _MISSING)
+                    while row is not _MISSING:
+                        rows += 1
+                        elapsed += time.perf_counter() - start
+                        start = None
+                        yield convert(row)
+                        start = time.perf_counter()
+                        row = next(rows_iter, _MISSING)
+                finally:
+                    if start is not None:  # Итерация завершилась (или упала) во время запроса к серверу
+                        elapsed += time.perf_counter() - start
+                    # Серверный курсор не сообщает количество строк заранее, поэтому учитываем прочитанные
+                    self._observe_query(cur, name, query, params, elapsed, rows)
+        except psycopg2.Error as e:
+            print(f"{error_message}: {e}")
+
     def get_companies_and_vacancies_count(self) -> List[Dict]:
         """Получает список всех компаний и количество вакансий у каждой компании."""
         try:
-            self._connect()
-            self.cur.execute(get_companies_and_vacancies_count())
-
-            result: List[Dict] = []
-            for row in self.cur:
-                result.append({'employer_name': row[0], 'vacancies_count': row[1]})
-            return result
+            return self._query(get_companies_and_vacancies_count(), None, DBManager._process_company_rows)
         except psycopg2.Error as e:
             print(f"Ошибка при получении списка компаний и количества вакансий: {e}")
             return []
-        finally:
-            self._close()
 
-    def get_all_vacancies(self) -> List[Dict]:
+    def get_all_vacancies(self, compact: bool = False) -> Union[List[Dict], List[VacancyRow]]:
         """
         Получает список всех вакансий с указанием названия компании, названия вакансии, зарплаты и ссылки на вакансию.
+        compact: Вернуть VacancyRow вместо словарей.
         """
         try:
-            self._connect()
-            self.cur.execute(get_all_vacancies())
-            return DBManager._process_vacancy_rows(self.cur)  # Pass the cursor directly
+            return self._query(get_all_vacancies(), None, DBManager._vacancy_rows_converter(compact),
+                               cache=False)
         except psycopg2.Error as e:
             print(f"Ошибка при получении списка всех вакансий: {e}")
             return []
-        finally:
-            self._close()
 
     def get_avg_salary(self) -> Optional[float]:
         """Получает среднюю зарплату по вакансиям."""
         try:
-            self._connect()
-            self.cur.execute(get_avg_salary())
-
-            avg_salary: Optional[float] = self.cur.fetchone()[0]
-            return float(avg_salary) if avg_salary is not None else None
+            return self._query(get_avg_salary(), None, DBManager._process_avg_salary)
         except psycopg2.Error as e:
             print(f"Ошибка при получении средней зарплаты: {e}")
             return None
-        finally:
-            self._close()
 
-    def get_vacancies_with_higher_salary(self) -> List[Dict]:
-        """Получает список всех вакансий, у которых зарплата выше средней по всем вакансиям."""
+    def get_vacancies_with_higher_salary(self, compact: bool = False) -> Union[List[Dict], List[VacancyRow]]:
+        """
+        Получает список всех вакансий, у которых зарплата выше средней по всем вакансиям.
+        compact: Вернуть VacancyRow вместо словарей.
+        """
         try:
-            self._connect()
-            self.cur.execute(get_vacancies_with_higher_salary())
-            return DBManager._process_vacancy_rows(self.cur)  # Pass the cursor directly
+            return self._query(get_vacancies_with_higher_salary(), None, DBManager._vacancy_rows_converter(compact),
+                               cache=False)
         except psycopg2.Error as e:
             print(f"Ошибка при получении списка вакансий с зарплатой выше средней: {e}")
             return []
-        finally:
-            self._close()
 
-    def get_vacancies_with_keyword(self, keyword: str) -> List[Dict]:
-        """Получает список всех вакансий, в названии которых содержатся переданные в метод слова."""
+    def get_vacancies_with_keyword(self, keyword: str,
+                                   compact: bool = False) -> Union[List[Dict], List[VacancyRow]]:
+        """
+        Получает список всех вакансий, в названии которых содержатся переданные в метод слова.
+        compact: Вернуть VacancyRow вместо словарей.
+        """
         try:
-            self._connect()
-            self.cur.execute(get_vacancies_with_keyword(), ('%' + keyword + '%',))
-            return DBManager._process_vacancy_rows(self.cur)  # Pass the cursor directly
+            return self._query(get_vacancies_with_keyword(), ('%' + keyword + '%',),
+                               DBManager._vacancy_rows_converter(compact), cache=False)
         except psycopg2.Error as e:
             print(f"Ошибка при получении списка вакансий с ключевым словом '{keyword}': {e}")
             return []
-        finally:
-            self._close()
\ No newline at end of file
+
+    def search_vacancies(self, query: str, mode: str = 'fulltext', limit: int = 100,
+                         compact: bool = False) -> Union[List[Dict], List[VacancyRow]]:
+        """
+        Ищет вакансии по нескольким словам и возвращает их в порядке релевантности.
+        mode: 'fulltext' — полнотекстовый поиск по названию и описанию (нужен столбец search_vector);
+              'trigram' — в названии должны встречаться все слова запроса (как подстроки).
+        limit: Максимальное количество результатов.
+        compact: Вернуть VacancyRow вместо словарей.
+        """
+        if mode == 'fulltext':
+            sql, params = search_vacancies_fulltext(), {'query': query, 'limit': limit}
+        elif mode == 'trigram':
+            words = query.split()
+            if not words:
+                return []
+            # Экранируем спецсимволы LIKE, чтобы слова искались буквально
+            patterns = ['%' + word.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+                        for word in words]
+            sql, params = search_vacancies_trigram(len(words)), (*patterns, query, limit)
+        else:
+            raise ValueError(f"Неизвестный режим поиска: {mode}")
+
+        try:
+            return self._query(sql, params, DBManager._vacancy_rows_converter(compact), name=f"search_vacancies_{mode}")
+        except psycopg2.Error as e:
+            print(f"Ошибка при поиске вакансий по запросу '{query}': {e}")
+            return []
+
+    def get_vacancies_page(self, after: Optional[Tuple] = None, page_size: int = 50,
+                           compact: bool = False) -> VacancyPage:
+        """
+        Получает страницу списка всех вакансий (по компаниям, затем по ID вакансии).
+        after: next_cursor предыдущей страницы (None — первая страница).
+        page_size: Количество вакансий на странице.
+        compact: Вернуть VacancyRow вместо словарей.
+        """
+        return self._get_page(get_all_vacancies_page, (), after, page_size, compact,
+                              "Ошибка при получении страницы списка всех вакансий")
+
+    def get_vacancies_with_higher_salary_page(self, after: Optional[Tuple] = None, page_size: int = 50,
+                                              compact: bool = False) -> VacancyPage:
+        """
+        Получает страницу списка вакансий с зарплатой выше средней (по убыванию зарплаты в рублях).
+        after: next_cursor предыдущей страницы (None — первая страница).
+        page_size: Количество вакансий на странице.
+        compact: Вернуть VacancyRow вместо словарей.
+        """
+        return self._get_page(get_vacancies_with_higher_salary_page, (), after, page_size, compact,
+                              "Ошибка при получении страницы списка вакансий с зарплатой выше средней")
+
+    def get_vacancies_with_keyword_page(self, keyword: str, after: Optional[Tuple] = None, page_size: int = 50,
+                                        compact: bool = False) -> VacancyPage:
+        """
+        Получает страницу списка вакансий, в названии которых содержатся переданные слова.
+        after: next_cursor предыдущей страницы (None — первая страница).
+        page_size: Количество вакансий на странице.
+        compact: Вернуть VacancyRow вместо словарей.
+        """
+        return self._get_page(get_vacancies_with_keyword_page, ('%' + keyword + '%',), after, page_size, compact,
+                              f"Ошибка при получении страницы списка вакансий с ключевым словом '{keyword}'")
+
+    def iter_all_vacancies(self, itersize: Optional[int] = None,
+                           compact: bool = False) -> Iterator[Union[Dict, VacancyRow]]:
+        """Потоково отдает все вакансии (аналог get_all_vacancies без загрузки результата в память)."""
+        return self._iter_vacancies(get_all_vacancies(), None,
+                                    "Ошибка при получении списка всех вакансий", itersize, compact)
+
+    def iter_vacancies_with_higher_salary(self, itersize: Optional[int] = None,
+                                          compact: bool = False) -> Iterator[Union[Dict, VacancyRow]]:
+        """Потоково отдает вакансии с зарплатой выше средней (аналог get_vacancies_with_higher_salary)."""
+        return self._iter_vacancies(get_vacancies_with_higher_salary(), None,
+                                    "Ошибка при получении списка вакансий с зарплатой выше средней", itersize, compact)
+
+    def iter_vacancies_with_keyword(self, keyword: str, itersize: Optional[int] = None,
+                                    compact: bool = False) -> Iterator[Union[Dict, VacancyRow]]:
+        """Потоково отдает вакансии с ключевым словом в названии (аналог get_vacancies_with_keyword)."""
+        return self._iter_vacancies(get_vacancies_with_keyword(), ('%' + keyword + '%',),
+                                    f"Ошибка при получении списка вакансий с ключевым словом '{keyword}'",
+                                    itersize, compact)
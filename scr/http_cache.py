@@ -0,0 +1,117 @@
+# Импортируем необходимые библиотеки и модули
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class CacheMissError(requests.exceptions.RequestException):
+    """В автономном режиме запрошенного ответа нет в кэше."""
+
+
+class HTTPCache:
+    """
+    Кэш HTTP-ответов на диске. Хранит тело ответа вместе с ETag и Last-Modified, чтобы повторные
+    запросы можно было отправлять условными (If-None-Match / If-Modified-Since) и отвечать на 304 из кэша.
+    Общий размер ограничен max_bytes, при превышении удаляются давно использованные записи (LRU).
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 100 * 1024 * 1024, offline: bool = False):
+        """
+        Инициализирует экземпляр класса.
+        directory: Каталог для файлов кэша (создается при необходимости).
+        max_bytes: Максимальный суммарный размер файлов кэша в байтах.
+        offline: Автономный режим — ответы берутся только из кэша, запросы в сеть не отправляются.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0, "evicted": 0}
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(os.path.getsize(path) for path in self._files())
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """Возвращает ключ записи по URL и параметрам запроса (порядок параметров не важен)."""
+        query = json.dumps(sorted((params or {}).items()), default=str)
+        return hashlib.sha256(f"{url}?{query}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _files(self):
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".json")]
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Возвращает запись (url, etag, last_modified, body) или None. Обращение обновляет ее позицию в LRU."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as file:
+                entry = json.load(file)
+            os.utime(path)  # Время изменения файла служит отметкой последнего использования
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def set(self, key: str, entry: Dict) -> None:
+        """Атомарно сохраняет запись и при переполнении вытесняет самые давно использованные."""
+        path = self._path(key)
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        with self._lock:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self._size += len(data) - old_size
+            self.stats["stored"] += 1
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Удаляет самые давно использованные записи, пока размер кэша не станет меньше max_bytes."""
+        files = sorted(self._files(), key=os.path.getmtime)
+        for path in files:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                continue
+            self._size -= size
+            self.stats["evicted"] += 1
+
+    def record(self, event: str) -> None:
+        """Увеличивает счетчик события (hits, misses, revalidated)."""
+        with self._lock:
+            self.stats[event] += 1
+
+    @property
+    def size(self) -> int:
+        """Текущий суммарный размер файлов кэша в байтах."""
+        return self._size
+
+    def clear(self) -> None:
+        """Удаляет все записи кэша."""
+        with self._lock:
+            for path in self._files():
+                os.remove(path)
+            self._size = 0
+
+    @staticmethod
+    def to_response(entry: Dict) -> requests.Response:
+        """Восстанавливает объект Response из записи кэша."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry["url"]
+        response.encoding = "utf-8"
+        response._content = entry["body"].encode("utf-8")
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json", "X-Cache": "HIT"})
+        return response
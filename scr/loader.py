@@ -0,0 +1,185 @@
+# Импортируем необходимые библиотеки и модули
+import hashlib
+import json
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from psycopg2.extras import execute_values
+
+# Импортируем нужные методы
+from scr.sql_queries import (get_upsert_employers_query, get_upsert_vacancies_query, refresh_statistics_views,
+                             bump_data_version_query, get_currency_rates_query, get_upsert_currency_rates_query,
+                             get_delete_moved_vacancies_query, get_backfill_salary_rub_query)
+from scr.partitions import is_partitioned, ensure_partitions_for
+
+
+def content_hash(values: Tuple) -> str:
+    """Возвращает MD5-хэш содержимого строки, по которому определяется, изменилась ли вакансия."""
+    return hashlib.md5(json.dumps(values, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+def to_rub(amount: Optional[int], currency: Optional[str], rates: Dict[str, float]) -> Optional[int]:
+    """Переводит сумму в рубли по курсам справочника HH.ru. Для неизвестной валюты возвращает None."""
+    if amount is None:
+        return None
+    if currency in (None, "RUR", "RUB"):
+        return amount
+    rate = rates.get(currency)
+    return round(amount / rate) if rate else None
+
+
+def normalize_salary(salary_from: Optional[int], salary_to: Optional[int], currency: Optional[str],
+                     rates: Dict[str, float]) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    """
+    Возвращает границы вилки и ее середину в рублях. Если указана только одна граница,
+    серединой считается она.
+    """
+    salary_from_rub = to_rub(salary_from, currency, rates)
+    salary_to_rub = to_rub(salary_to, currency, rates)
+    if salary_from_rub is not None and salary_to_rub is not None:
+        salary_mid_rub = (salary_from_rub + salary_to_rub) // 2
+    else:
+        salary_mid_rub = salary_from_rub if salary_from_rub is not None else salary_to_rub
+    return salary_from_rub, salary_to_rub, salary_mid_rub
+
+
+def parse_vacancy(vacancy: Dict, employer_id: int, rates: Optional[Dict[str, float]] = None) -> Tuple:
+    """
+    Преобразует вакансию из ответа API HH.ru в строку для таблицы vacancies (последний элемент — хэш).
+    rates: Курсы валют для пересчета зарплаты в рубли; без них рублевыми считаются только зарплаты в RUR.
+    """
+    salary_data = vacancy.get("salary") or {}
+    values = (
+        int(vacancy["id"]),
+        employer_id,
+        vacancy.get("name"),
+        salary_data.get("from"),
+        salary_data.get("to"),
+        salary_data.get("currency"),
+        vacancy.get("alternate_url"),
+        (vacancy.get("snippet") or {}).get("requirement"),
+        vacancy.get("published_at"),
+    )
+    values += normalize_salary(values[3], values[4], values[5], rates or {})
+    return values + (content_hash(values),)
+
+
+def _bulk_upsert(cur, query: str, rows: Iterable[Tuple], page_size: int) -> Dict[str, int]:
+    """
+    Записывает пачку строк одним INSERT ... ON CONFLICT через execute_values.
+    Первый элемент строки — ключ. Возвращает количество вставленных, обновленных и пропущенных строк.
+    """
+    rows = list(rows)
+    # Одна команда INSERT ... ON CONFLICT не может изменить одну и ту же строку дважды,
+    # поэтому повторяющиеся ключи внутри пачки отбрасываем заранее
+    unique_rows: Dict = {}
+    for row in rows:
+        unique_rows.setdefault(row[0], row)
+
+    stats = {"inserted": 0, "updated": 0, "skipped": len(rows) - len(unique_rows)}
+    if not unique_rows:
+        return stats
+
+    results: List[Tuple] = execute_values(cur, query, list(unique_rows.values()), page_size=page_size, fetch=True)
+    stats["inserted"] = sum(1 for (inserted,) in results if inserted)
+    stats["updated"] = len(results) - stats["inserted"]
+    stats["skipped"] += len(unique_rows) - len(results)
+    return stats
+
+
+def bulk_upsert_employers(cur, rows: Iterable[Tuple], page_size: int = 1000) -> Dict[str, int]:
+    """
+    Записывает пачку работодателей (employer_id, employer_name) одним запросом.
+    Изменившиеся имена обновляются, остальные строки пропускаются без записи.
+    """
+    return _bulk_upsert(cur, get_upsert_employers_query(), rows, page_size)
+
+
+def bulk_upsert_vacancies(cur, rows: Iterable[Tuple], page_size: int = 1000,
+                          partitioned: Optional[bool] = None) -> Dict[str, int]:
+    """
+    Записывает пачку вакансий одним INSERT ... ON CONFLICT через execute_values.
+    Новые вакансии вставляются, вакансии с изменившимся хэшем обновляются,
+    неизмененные и повторы внутри пачки пропускаются без записи.
+    partitioned: Таблица vacancies секционирована (None — проверить по базе данных). В секционированной
+                 таблице сначала создаются секции для месяцев публикации пачки, а повторно опубликованные
+                 вакансии удаляются и затем вставляются в секцию нового месяца.
+    Возвращает словарь с количеством вставленных, обновленных и пропущенных строк.
+    """
+    if partitioned is None:
+        partitioned = is_partitioned(cur)
+    rows = list(rows)
+    if partitioned and rows:
+        # Индекс 8 — дата публикации (см. parse_vacancy)
+        ensure_partitions_for(cur, (row[8] for row in rows))
+        execute_values(cur, get_delete_moved_vacancies_query(), [(row[0], row[8]) for row in rows],
+                       template="(%s, %s::timestamptz)", page_size=page_size)
+    return _bulk_upsert(cur, get_upsert_vacancies_query(partitioned), rows, page_size)
+
+
+def load_vacancy_pages(cur, pages: Iterable[Tuple[int, int, List[Dict]]], batch_size: int = 1000,
+                       rates: Optional[Dict[str, float]] = None) -> Dict[str, int]:
+    """
+    Записывает в таблицу vacancies поток страниц (employer_id, номер страницы, вакансии),
+    накапливая не больше batch_size строк перед очередной пакетной записью.
+    rates: Курсы валют для пересчета зарплат в рубли.
+    Возвращает суммарное количество вставленных, обновленных и пропущенных строк.
+    """
+    totals = {"inserted": 0, "updated": 0, "skipped": 0}
+    batch: List[Tuple] = []
+    partitioned = is_partitioned(cur)  # Проверяем один раз, а не перед каждой пачкой
+
+    def flush():
+        for key, value in bulk_upsert_vacancies(cur, batch, page_size=batch_size, partitioned=partitioned).items():
+            totals[key] += value
+        batch.clear()
+
+    for employer_id, _, vacancies in pages:
+        batch.extend(parse_vacancy(vacancy, employer_id, rates) for vacancy in vacancies)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return totals
+
+
+def refresh_statistics(cur) -> None:
+    """Пересчитывает представления со статистикой (employer_stats, salary_stats) после загрузки данных."""
+    cur.execute(refresh_statistics_views())
+
+
+def bump_data_version(cur) -> None:
+    """Увеличивает версию данных, чтобы DBManager сбросил закэшированные результаты запросов."""
+    cur.execute(bump_data_version_query())
+
+
+def load_currency_rates(cur, hh_api, max_age: timedelta = timedelta(days=1)) -> Dict[str, float]:
+    """
+    Возвращает курсы валют. Сохраненные в таблице currency_rates курсы используются, если они
+    обновлялись не раньше max_age назад; иначе курсы запрашиваются у API и сохраняются в таблицу.
+    Если API курсов не вернул, используются устаревшие сохраненные курсы: без курсов зарплаты
+    в валюте были бы записаны без пересчета в рубли поверх уже пересчитанных.
+    """
+    cur.execute(get_currency_rates_query(), (max_age,))
+    rows = cur.fetchall()
+    stored = {code: float(rate) for code, rate, _ in rows}
+    if stored and all(fresh for _, _, fresh in rows):
+        return stored
+
+    rates = hh_api.get_currency_rates()
+    if rates:
+        execute_values(cur, get_upsert_currency_rates_query(), list(rates.items()), template="(%s, %s, NOW())")
+        return rates
+    if stored:
+        print("Не удалось обновить курсы валют, используются сохраненные ранее.")
+    return stored
+
+
+def backfill_salary_rub(cur) -> int:
+    """
+    Заполняет зарплаты в рублях у вакансий, где их нет: загруженных до появления этих столбцов
+    или в валюте, курса которой тогда не было (инкрементальная синхронизация старые вакансии
+    повторно не запрашивает). Запрос затрагивает только такие вакансии, поэтому выполняется при каждой загрузке.
+    Вызывается после load_currency_rates, когда курсы уже сохранены. Возвращает количество обновленных вакансий.
+    """
+    cur.execute(get_backfill_salary_rub_query())
+    return cur.rowcount
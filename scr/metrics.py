@@ -0,0 +1,239 @@
+# Импортируем необходимые библиотеки и модули
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Границы интервалов гистограмм по умолчанию (в секундах)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelsKey = Tuple[Tuple[str, str], ...]
+
+
+def _labels_key(labels: Dict[str, Any]) -> LabelsKey:
+    """Преобразует метки в хэшируемый ключ с упорядоченными именами."""
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelsKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Форматирует метки для текстового формата Prometheus: {name="value",...}."""
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in items)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(items, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Форматирует число для текстового формата Prometheus."""
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """
+    Хранилище метрик: счетчики, значения (gauge) и гистограммы с метками.
+    Потокобезопасно. Экспортируется в текстовом формате Prometheus или в JSON.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Инициализирует экземпляр класса.
+        buckets: Верхние границы интервалов гистограмм по возрастанию.
+        """
+        self.buckets = tuple(buckets)
+        self._counters: Dict[str, Dict[LabelsKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelsKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelsKey, List]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """Увеличивает счетчик name с метками labels на value."""
+        key = _labels_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        """Устанавливает значение name с метками labels."""
+        with self._lock:
+            self._gauges.setdefault(name, {})[_labels_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Добавляет наблюдение value в гистограмму name с метками labels."""
+        key = _labels_key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                # Количество наблюдений в каждом интервале (последний — выше всех границ), сумма, количество
+                histogram = series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            histogram[0][index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    @contextmanager
+    def time(self, name: str, **labels) -> Iterator[None]:
+        """Замеряет время выполнения блока with и добавляет его в гистограмму name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def get(self, name: str, **labels) -> float:
+        """Возвращает значение счетчика или gauge с метками labels (0, если его нет)."""
+        key = _labels_key(labels)
+        with self._lock:
+            for storage in (self._counters, self._gauges):
+                if key in storage.get(name, {}):
+                    return storage[name][key]
+        return 0
+
+    def get_histogram(self, name: str, **labels) -> Dict[str, float]:
+        """Возвращает количество и сумму наблюдений гистограммы с метками labels."""
+        with self._lock:
+            histogram = self._histograms.get(name, {}).get(_labels_key(labels))
+            if histogram is None:
+                return {"count": 0, "sum": 0.0}
+            return {"count": histogram[2], "sum": histogram[1]}
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Возвращает копию всех метрик в виде, который можно передать в другой процесс (pickle)
+        и добавить там в хранилище методом merge.
+        """
+        with self._lock:
+            return {
+                "buckets": self.buckets,
+                "counters": {name: dict(series) for name, series in self._counters.items()},
+                "gauges": {name: dict(series) for name, series in self._gauges.items()},
+                "histograms": {name: {key: [list(counts), total, count]
+                                      for key, (counts, total, count) in series.items()}
+                               for name, series in self._histograms.items()},
+            }
+
+    def merge(self, snapshot: Dict[str, Dict]) -> None:
+        """
+        Добавляет метрики из snapshot (например, полученного от дочернего процесса):
+        счетчики и гистограммы суммируются, значения gauge заменяются.
+        """
+        if tuple(snapshot["buckets"]) != self.buckets:
+            raise ValueError("Нельзя объединить гистограммы с разными границами интервалов.")
+        with self._lock:
+            for name, series in snapshot["counters"].items():
+                target = self._counters.setdefault(name, {})
+                for key, value in series.items():
+                    target[key] = target.get(key, 0) + value
+            for name, series in snapshot["gauges"].items():
+                self._gauges.setdefault(name, {}).update(series)
+            for name, series in snapshot["histograms"].items():
+                target = self._histograms.setdefault(name, {})
+                for key, (counts, total, count) in series.items():
+                    histogram = target.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0, 0])
+                    histogram[0] = [old + new for old, new in zip(histogram[0], counts)]
+                    histogram[1] += total
+                    histogram[2] += count
+
+    def reset(self) -> None:
+        """Удаляет все метрики."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def to_prometheus(self) -> str:
+        """Возвращает метрики в текстовом формате Prometheus."""
+        lines = []
+        with self._lock:
+            for metric_type, storage in (("counter", self._counters), ("gauge", self._gauges)):
+                for name in sorted(storage):
+                    lines.append(f"# TYPE {name} {metric_type}")
+                    for key, value in sorted(storage[name].items()):
+                        lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+            for name in sorted(self._histograms):
+                lines.append(f"# TYPE {name} histogram")
+                for key, (counts, total, count) in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, bucket_count in zip(self.buckets, counts):
+                        cumulative += bucket_count
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', repr(float(bound))))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(key, ('le', '+Inf'))} {count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_value(total)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> Dict[str, Dict[str, List[Dict]]]:
+        """Возвращает метрики в виде словаря, пригодного для json.dumps."""
+        with self._lock:
+            result: Dict[str, Dict[str, List[Dict]]] = {"counters": {}, "gauges": {}, "histograms": {}}
+            for section, storage in (("counters", self._counters), ("gauges", self._gauges)):
+                for name, series in storage.items():
+                    result[section][name] = [{"labels": dict(key), "value": value} for key, value in series.items()]
+            for name, series in self._histograms.items():
+                result["histograms"][name] = [
+                    {"labels": dict(key), "count": count, "sum": total,
+                     "buckets": dict(zip([str(bound) for bound in self.buckets] + ["+Inf"], counts))}
+                    for key, (counts, total, count) in series.items()
+                ]
+        return result
+
+    def write(self, path: str) -> None:
+        """Сохраняет метрики в файл: в JSON, если имя оканчивается на .json, иначе в формате Prometheus."""
+        with open(path, "w", encoding="utf-8") as file:
+            if path.endswith(".json"):
+                json.dump(self.to_json(), file, indent=2, ensure_ascii=False)
+            else:
+                file.write(self.to_prometheus())
+
+
+class SlowQueryLog:
+    """
+    Журнал медленных запросов: запросы дольше threshold секунд сохраняются вместе с параметрами
+    и планом выполнения (EXPLAIN). Последние maxlen записей хранятся в памяти,
+    при заданном path каждая запись также дописывается в файл строкой JSON.
+    """
+
+    def __init__(self, threshold: float = 0.5, path: Optional[str] = None, explain: bool = True,
+                 maxlen: int = 100):
+        """
+        Инициализирует экземпляр класса.
+        threshold: Время выполнения в секундах, начиная с которого запрос считается медленным.
+        path: Файл, в который дописываются записи (None — только в памяти).
+        explain: Сохранять план выполнения запроса (EXPLAIN без ANALYZE, запрос повторно не выполняется).
+        maxlen: Сколько последних записей хранить в памяти.
+        """
+        self.threshold = threshold
+        self.path = path
+        self.explain = explain
+        self._entries: deque = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, name: str, sql: str, params: Any, elapsed: float, plan: Any = None) -> None:
+        """Сохраняет запись о медленном запросе."""
+        entry = {
+            "time": datetime.now(timezone.utc).isoformat(),
+            "query": name,
+            "seconds": elapsed,
+            "sql": " ".join(sql.split()),
+            "params": params if isinstance(params, (dict, list, tuple, type(None))) else str(params),
+            "plan": plan,
+        }
+        with self._lock:
+            self._entries.append(entry)
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as file:
+                    file.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+    def entries(self) -> List[Dict]:
+        """Возвращает сохраненные в памяти записи, от старых к новым."""
+        with self._lock:
+            return list(self._entries)
+
+
+# Общее хранилище метрик, в которое по умолчанию пишут HHApi, DBManager, DatabaseCreator и IngestPipeline
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,138 @@
+# Импортируем необходимые библиотеки и модули
+import re
+from datetime import date, datetime, timezone
+from typing import Iterable, List, Optional, Union
+
+# Импортируем нужные методы
+from scr.sql_queries import (create_vacancies_partition, get_vacancies_partitioned_query,
+                             get_vacancies_partitions_query, get_partition_active_count_query,
+                             detach_vacancies_partition, get_default_partition_months_query,
+                             detach_default_partition, move_default_vacancies)
+
+# Схема, в которую переносятся отсоединенные секции с историей вакансий
+ARCHIVE_SCHEMA = "vacancies_archive"
+
+# Имена месячных секций: vacancies_pГГГГ_ММ
+_PARTITION_NAME = re.compile(r"^vacancies_p(\d{4})_(\d{2})$")
+
+
+def month_start(value: date) -> date:
+    """Возвращает первый день месяца даты value (дата и время с часовым поясом сначала переводятся в UTC)."""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Возвращает первый день месяца, отстоящего от month на months месяцев (months может быть отрицательным)."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Возвращает имя секции таблицы vacancies для месяца month."""
+    return f"vacancies_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Возвращает месяц секции по ее имени или None для секции по умолчанию и посторонних таблиц."""
+    match = _PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def _bound(month: date) -> str:
+    """Возвращает границу секции: начало месяца по UTC."""
+    return f"{month.isoformat()} 00:00:00+00"
+
+
+def is_partitioned(cur) -> bool:
+    """Проверяет, что таблица vacancies секционирована по месяцам публикации."""
+    cur.execute(get_vacancies_partitioned_query())
+    row = cur.fetchone()
+    return bool(row) and row[0] is True
+
+
+def ensure_partitions(cur, first: date, last: date) -> List[str]:
+    """
+    Создает недостающие месячные секции таблицы vacancies с first по last включительно.
+    Возвращает имена созданных секций.
+    """
+    cur.execute(get_vacancies_partitions_query())
+    existing = {name for (name,) in cur.fetchall()}
+    created = []
+    month = month_start(first)
+    while month <= last:
+        name = partition_name(month)
+        if name not in existing:
+            cur.execute(create_vacancies_partition(name, _bound(month), _bound(add_months(month, 1))))
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+def published_month(value: Union[str, datetime, None]) -> Optional[date]:
+    """Возвращает месяц (по UTC) даты публикации из ответа API (строка ISO 8601) или из базы данных."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            value = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")  # +0300 в старых версиях Python
+    return month_start(value)
+
+
+def ensure_partitions_for(cur, published: Iterable[Union[str, datetime, None]]) -> List[str]:
+    """
+    Создает секции для всех месяцев, в которые попадают даты публикации published (и месяцев между ними),
+    чтобы записываемые вакансии не оказались в секции по умолчанию. Возвращает имена созданных секций.
+    """
+    months = {month for month in map(published_month, published) if month is not None}
+    if not months:
+        return []
+    return ensure_partitions(cur, min(months), max(months))
+
+
+def move_default_rows(cur) -> List[str]:
+    """
+    Переносит вакансии из секции по умолчанию в месячные секции, создавая недостающие.
+    Пока секция по умолчанию присоединена, секцию для месяца с ее строками создать нельзя,
+    поэтому на время переноса она отсоединяется. Возвращает имена созданных секций.
+    """
+    cur.execute(get_default_partition_months_query())
+    months = [month for (month,) in cur.fetchall()]
+    if not months:
+        return []
+    cur.execute(detach_default_partition())
+    created = []
+    for month in sorted(months):
+        created += ensure_partitions(cur, month, month)
+    cur.execute(move_default_vacancies())
+    return created
+
+
+def detach_old_partitions(cur, keep_months: int, today: Optional[date] = None,
+                          schema: str = ARCHIVE_SCHEMA) -> List[str]:
+    """
+    Отсоединяет месячные секции старше keep_months месяцев (не считая текущего) и переносит их в схему schema.
+    Секции, в которых остались неархивные вакансии, не трогаются: отсоединенные вакансии исчезли бы из запросов.
+    Возвращает имена отсоединенных секций.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    cutoff = add_months(month_start(today), -keep_months)
+    cur.execute(get_vacancies_partitions_query())
+    names = [name for (name,) in cur.fetchall()]
+
+    detached = []
+    for name in names:
+        month = partition_month(name)
+        if month is None or month >= cutoff:
+            continue
+        cur.execute(get_partition_active_count_query(), (_bound(month), _bound(add_months(month, 1))))
+        active = cur.fetchone()[0]
+        if active:
+            print(f"Секция {name} не отсоединена: в ней {active} неархивных вакансий.")
+            continue
+        cur.execute(detach_vacancies_partition(name, schema))
+        detached.append(name)
+    return detached
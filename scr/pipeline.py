@@ -0,0 +1,207 @@
+# Импортируем необходимые библиотеки и модули
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Импортируем нужные классы и методы
+from scr.loader import parse_vacancy, bulk_upsert_vacancies
+from scr.partitions import is_partitioned
+from scr.metrics import MetricsRegistry, REGISTRY
+
+_DONE = object()  # Признак конца потока данных в очереди
+
+
+class StageMetrics:
+    """
+    Счетчики одной стадии конвейера: сколько элементов обработано, сколько времени стадия работала,
+    ждала входных данных и ждала места в следующей очереди (обратное давление).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy_time = 0.0
+        self.input_wait = 0.0
+        self.output_wait = 0.0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        """Время работы стадии от старта до завершения (или до текущего момента)."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def as_dict(self) -> Dict[str, float]:
+        """Возвращает счетчики стадии и ее пропускную способность (элементов в секунду собственной работы)."""
+        return {
+            "items": self.items,
+            "busy_time": self.busy_time,
+            "input_wait": self.input_wait,
+            "output_wait": self.output_wait,
+            "elapsed": self.elapsed,
+            "throughput": self.items / self.busy_time if self.busy_time else 0.0,
+        }
+
+
+class IngestPipeline:
+    """
+    Конвейер загрузки вакансий из трех стадий, работающих одновременно:
+    получение страниц из API → разбор и нормализация вакансий в строки → пакетная запись в базу данных.
+    Стадии связаны очередями ограниченного размера: если запись отстает, разбор и получение страниц
+    останавливаются, пока в очереди не освободится место, поэтому память не растет,
+    а общая скорость определяется самой медленной стадией, а не суммой всех.
+    """
+
+    def __init__(self, queue_size: int = 8, batch_size: int = 1000, poll_interval: float = 0.1,
+                 metrics: Optional[MetricsRegistry] = None):
+        """
+        Инициализирует экземпляр класса.
+        queue_size: Вместимость очередей между стадиями (в страницах и в пачках строк).
+        batch_size: Количество строк в одной пакетной записи.
+        poll_interval: Как часто (в секундах) заблокированная стадия проверяет, не остановлен ли конвейер.
+        metrics: Хранилище, в которое после каждого запуска записываются метрики стадий (по умолчанию общее REGISTRY).
+        """
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.metrics: Dict[str, StageMetrics] = {}
+        self.registry = metrics or REGISTRY
+
+    def _put(self, target: queue.Queue, item: Any, metrics: StageMetrics, stop: threading.Event) -> bool:
+        """Кладет элемент в очередь, ожидая свободного места. Возвращает False, если конвейер остановлен."""
+        start = time.perf_counter()
+        try:
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=self.poll_interval)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            metrics.output_wait += time.perf_counter() - start
+
+    def _get(self, source: queue.Queue, metrics: StageMetrics, stop: threading.Event) -> Any:
+        """Берет элемент из очереди, ожидая его появления. Возвращает _DONE, если конвейер остановлен."""
+        start = time.perf_counter()
+        try:
+            while not stop.is_set():
+                try:
+                    return source.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    continue
+            return _DONE
+        finally:
+            metrics.input_wait += time.perf_counter() - start
+
+    def _run_stage(self, name: str, body: Callable[[StageMetrics], None], stop: threading.Event,
+                   errors: List[BaseException]) -> None:
+        """Выполняет стадию, учитывая время ее работы. При ошибке запоминает ее и останавливает конвейер."""
+        metrics = self.metrics[name]
+        metrics.started_at = time.perf_counter()
+        try:
+            body(metrics)
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            metrics.finished_at = time.perf_counter()
+            metrics.busy_time = max(metrics.elapsed - metrics.input_wait - metrics.output_wait, 0.0)
+
+    def run(self, cur, pages: Iterable[Tuple[int, int, List[Dict]]],
+            rates: Optional[Dict[str, float]] = None) -> Dict[str, int]:
+        """
+        Записывает в таблицу vacancies поток страниц (employer_id, номер страницы, вакансии).
+        Получение страниц и разбор выполняются в отдельных потоках, запись — в вызывающем потоке
+        через переданный курсор. Ошибка любой стадии останавливает конвейер и пробрасывается вызывающему коду.
+        rates: Курсы валют для пересчета зарплат в рубли.
+        Возвращает суммарное количество вставленных, обновленных и пропущенных строк.
+        """
+        self.metrics = {name: StageMetrics(name) for name in ("fetch", "parse", "write")}
+        page_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        batch_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors: List[BaseException] = []
+        totals = {"inserted": 0, "updated": 0, "skipped": 0}
+        partitioned = is_partitioned(cur)  # Курсор используется только в вызывающем потоке
+
+        def fetch(metrics: StageMetrics) -> None:
+            page_iterator = iter(pages)
+            try:
+                # Время ожидания ответов API считается работой стадии получения, а не простоем
+                for page in page_iterator:
+                    metrics.items += 1
+                    if not self._put(page_queue, page, metrics, stop):
+                        return
+            finally:
+                if hasattr(page_iterator, "close"):
+                    page_iterator.close()  # Отменяет еще не начатые запросы к API
+            self._put(page_queue, _DONE, metrics, stop)
+
+        def parse(metrics: StageMetrics) -> None:
+            batch: List[Tuple] = []
+            while True:
+                page = self._get(page_queue, metrics, stop)
+                if page is _DONE:
+                    break
+                employer_id, _, vacancies = page
+                batch.extend(parse_vacancy(vacancy, employer_id, rates) for vacancy in vacancies)
+                metrics.items += len(vacancies)
+                if len(batch) >= self.batch_size:
+                    if not self._put(batch_queue, batch, metrics, stop):
+                        return
+                    batch = []
+            if stop.is_set():
+                return
+            if batch:
+                self._put(batch_queue, batch, metrics, stop)
+            self._put(batch_queue, _DONE, metrics, stop)
+
+        def write(metrics: StageMetrics) -> None:
+            while True:
+                batch = self._get(batch_queue, metrics, stop)
+                if batch is _DONE:
+                    break
+                for key, value in bulk_upsert_vacancies(cur, batch, page_size=self.batch_size,
+                                                         partitioned=partitioned).items():
+                    totals[key] += value
+                metrics.items += len(batch)
+
+        threads = [threading.Thread(target=self._run_stage, args=(name, body, stop, errors),
+                                    name=f"ingest-{name}", daemon=True)
+                   for name, body in (("fetch", fetch), ("parse", parse))]
+        for thread in threads:
+            thread.start()
+        self._run_stage("write", write, stop, errors)
+        stop.set()  # Если запись прервана, верхние стадии не должны ждать места в очередях
+        for thread in threads:
+            thread.join()
+
+        self._publish_metrics(totals)
+        if errors:
+            raise errors[0]
+        return totals
+
+    def _publish_metrics(self, totals: Dict[str, int]) -> None:
+        """Записывает метрики стадий и количество записанных строк в хранилище метрик."""
+        for name, metrics in self.metrics.items():
+            self.registry.inc("ingest_stage_items_total", metrics.items, stage=name)
+            self.registry.inc("ingest_stage_busy_seconds_total", metrics.busy_time, stage=name)
+            self.registry.inc("ingest_stage_input_wait_seconds_total", metrics.input_wait, stage=name)
+            self.registry.inc("ingest_stage_output_wait_seconds_total", metrics.output_wait, stage=name)
+            self.registry.set("ingest_stage_throughput", metrics.as_dict()["throughput"], stage=name)
+        for result, count in totals.items():
+            self.registry.inc("ingest_rows_total", count, result=result)
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Возвращает метрики стадий последнего запуска: {имя стадии: счетчики}."""
+        return {name: metrics.as_dict() for name, metrics in self.metrics.items()}
+
+    def bottleneck(self) -> Optional[str]:
+        """Возвращает имя стадии, которая дольше всех работала (а не ждала) в последнем запуске."""
+        if not self.metrics:
+            return None
+        return max(self.metrics.values(), key=lambda metrics: metrics.busy_time).name
@@ -0,0 +1,131 @@
+# Импортируем необходимые библиотеки и модули
+import math
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional
+
+import requests
+
+
+# Максимальное ожидание по заголовку Retry-After в секундах: больший срок считается ошибкой сервера
+MAX_RETRY_AFTER = 300.0
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Запрос не выполнен, потому что автомат для хоста разомкнут после серии ошибок."""
+
+
+class RateLimiter:
+    """Потокобезопасный ограничитель частоты запросов по алгоритму «ведро токенов»."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Инициализирует экземпляр класса.
+        rate: Количество запросов в секунду, которое ограничитель пропускает в среднем.
+        capacity: Размер ведра — сколько запросов можно отправить подряд без ожидания (по умолчанию rate).
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Забирает один токен, при необходимости ожидая его появления. Возвращает время ожидания."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class CircuitBreaker:
+    """
+    Автомат для одного хоста: после failure_threshold ошибок подряд размыкается и отклоняет запросы
+    на reset_timeout секунд, затем пропускает один пробный запрос.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Возвращает состояние автомата: closed, open или half-open."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Проверяет, можно ли выполнить запрос. В полуоткрытом состоянии пропускает один пробный запрос."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """Учитывает успешный запрос и замыкает автомат."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Учитывает ошибку; после failure_threshold ошибок подряд (или неудачной пробы) размыкает автомат."""
+        with self._lock:
+            self._failures += 1
+            if self._probe_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Разбирает заголовок Retry-After (секунды или HTTP-дата) и возвращает задержку в секундах.
+    Нечисловые и бесконечные значения ("inf", "nan") считаются некорректными: возвращается None.
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(0.0, seconds) if math.isfinite(seconds) else None
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after: Optional[float] = None,
+                  max_retry_after: float = MAX_RETRY_AFTER) -> float:
+    """
+    Возвращает задержку перед повторной попыткой: экспоненциальную со случайным разбросом (full jitter),
+    но не меньше, чем требует сервер в Retry-After. Требование сервера ограничивается max_retry_after секунд.
+    """
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    if retry_after is None or not math.isfinite(retry_after):
+        return delay
+    return max(delay, min(retry_after, max_retry_after))
@@ -0,0 +1,189 @@
+# Импортируем необходимые библиотеки и модули
+import multiprocessing
+import os
+import socket
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+# Импортируем нужные классы и методы
+from scr.loader import bulk_upsert_employers
+from scr.metrics import MetricsRegistry, REGISTRY
+from scr.pipeline import IngestPipeline
+from scr.sync import sync_vacancies
+from scr.sql_queries import (get_enqueue_employers_query, get_restart_ingest_queue_query, get_claim_shard_query,
+                             get_complete_shard_query, get_fail_shard_query, get_ingest_queue_status_query)
+
+# Счетчики, которые возвращает каждый обработчик
+_TOTALS = ("inserted", "updated", "skipped", "archived", "shards", "failed")
+
+
+def enqueue_employers(cur, employer_ids: Iterable[int], max_attempts: int = 3) -> Dict[str, int]:
+    """
+    Добавляет работодателей в очередь загрузки. Если в предыдущем проходе очереди не осталось работы
+    (все загружены или исчерпали max_attempts попыток), начинает новый, а незавершенный (прерванный сбоем)
+    продолжает. Возвращает количество работодателей в каждом статусе.
+    """
+    employer_ids = list(employer_ids)
+    execute_values(cur, get_enqueue_employers_query(), [(employer_id,) for employer_id in employer_ids])
+    cur.execute(get_restart_ingest_queue_query(), {"employer_ids": employer_ids, "max_attempts": max_attempts})
+    cur.execute(get_ingest_queue_status_query(), (employer_ids,))
+    return dict(cur.fetchall())
+
+
+def claim_shard(cur, worker: str, shard_size: int, lease: timedelta, max_attempts: int) -> List[int]:
+    """
+    Забирает из очереди до shard_size работодателей для обработчика worker и возвращает их ID.
+    Чтобы другие обработчики увидели, что работодатели заняты, транзакцию нужно сразу зафиксировать.
+    """
+    cur.execute(get_claim_shard_query(), {"worker": worker, "limit": shard_size, "lease": lease,
+                                          "max_attempts": max_attempts})
+    return sorted(employer_id for (employer_id,) in cur.fetchall())
+
+
+def complete_shard(cur, employer_ids: List[int]) -> None:
+    """Отмечает работодателей загруженными (в той же транзакции, что и их данные)."""
+    cur.execute(get_complete_shard_query(), (employer_ids,))
+
+
+def fail_shard(cur, employer_ids: List[int], error: str) -> None:
+    """Отмечает работодателей, загрузка которых завершилась ошибкой."""
+    cur.execute(get_fail_shard_query(), (error, employer_ids))
+
+
+def worker_name() -> str:
+    """Возвращает имя обработчика: имя машины и ID процесса."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def ingest_worker(db_name: str, params: Dict, hh_api_factory: Callable, rates: Optional[Dict[str, float]] = None,
+                  shard_size: int = 10, lease: timedelta = timedelta(minutes=30),
+                  max_attempts: int = 3) -> Dict[str, int]:
+    """
+    Обработчик очереди загрузки: забирает работодателей порциями (shard_size) и для каждой порции
+    сам получает данные из API и записывает их в базу, пока очередь не опустеет.
+    Данные порции и отметка о ее завершении фиксируются одной транзакцией, поэтому после сбоя
+    порция загружается заново целиком (по истечении lease), а завершенные порции не повторяются.
+    Работодатели, вакансии которых не удалось получить из API, отмечаются упавшими и берутся повторно,
+    пока не исчерпают max_attempts попыток; такая порция считается упавшей.
+    hh_api_factory: Функция без аргументов, создающая HHApi (у каждого процесса свой экземпляр).
+    rates: Курсы валют для пересчета зарплат в рубли.
+    Возвращает количество вставленных, обновленных, пропущенных и архивированных вакансий,
+    обработанных и упавших порций.
+    """
+    name = worker_name()
+    totals = dict.fromkeys(_TOTALS, 0)
+    hh_api = hh_api_factory()
+    conn = psycopg2.connect(dbname=db_name, **params)
+    try:
+        with conn.cursor() as cur:
+            while True:
+                shard = claim_shard(cur, name, shard_size, lease, max_attempts)
+                conn.commit()
+                if not shard:
+                    break
+                try:
+                    employer_names = hh_api.get_employers_names(shard)
+                    bulk_upsert_employers(cur, [(employer_id, employer_names[employer_id]) for employer_id in shard
+                                                if employer_names.get(employer_id)])
+                    stats = sync_vacancies(cur, hh_api, shard, rates=rates, pipeline=IngestPipeline())
+                    # Ошибки API не прерывают синхронизацию: работодатели с неполученными страницами
+                    # остаются с прежней отметкой и возвращаются в очередь как упавшие
+                    failed = stats["failed_employers"]
+                    complete_shard(cur, [employer_id for employer_id in shard if employer_id not in failed])
+                    if failed:
+                        fail_shard(cur, failed, "не удалось получить часть страниц вакансий")
+                    conn.commit()
+                except Exception as e:
+                    if conn.closed:
+                        raise  # Соединение потеряно: порция будет взята заново после истечения lease
+                    conn.rollback()
+                    print(f"Ошибка при загрузке работодателей {shard}: {e}")
+                    fail_shard(cur, shard, str(e))
+                    conn.commit()
+                    totals["failed"] += 1
+                    continue
+                for key in ("inserted", "updated", "skipped", "archived"):
+                    totals[key] += stats[key]
+                if failed:
+                    print(f"Не удалось получить вакансии работодателей {failed}: они будут загружены повторно.")
+                    totals["failed"] += 1
+                else:
+                    totals["shards"] += 1
+    finally:
+        conn.close()
+        hh_api.close()
+    return totals
+
+
+def _crashed_totals() -> Dict[str, int]:
+    """Возвращает счетчики аварийно завершившегося обработчика: одна упавшая порция."""
+    totals = dict.fromkeys(_TOTALS, 0)
+    totals["failed"] = 1
+    return totals
+
+
+def _process_worker(*args) -> Tuple[Dict[str, int], Dict[str, Dict]]:
+    """
+    Выполняет ingest_worker в дочернем процессе и возвращает его счетчики вместе с метриками процесса:
+    у каждого процесса свое хранилище REGISTRY, и без передачи метрики обработчиков не дошли бы до родителя.
+    """
+    totals = ingest_worker(*args)
+    return totals, REGISTRY.snapshot()
+
+
+def run_sharded_ingest(db_name: str, params: Dict, employer_ids: Iterable[int], workers: int,
+                       hh_api_factory: Callable, rates: Optional[Dict[str, float]] = None,
+                       shard_size: int = 10, lease: timedelta = timedelta(minutes=30),
+                       max_attempts: int = 3, metrics: Optional[MetricsRegistry] = None) -> Dict[str, int]:
+    """
+    Загружает вакансии работодателей в workers процессов через общую очередь ingest_queue.
+    Очередь хранится в базе данных, поэтому ту же команду можно одновременно запустить на нескольких машинах.
+    При workers <= 1 обработчик выполняется в текущем процессе.
+    hh_api_factory должна быть функцией уровня модуля (или functools.partial от нее): она передается
+    в дочерние процессы.
+    metrics: Хранилище, в которое добавляются метрики дочерних процессов (по умолчанию общее REGISTRY).
+    Аварийно завершившийся обработчик считается упавшей порцией; счетчики остальных обработчиков сохраняются,
+    а его незавершенная порция будет взята заново по истечении lease.
+    Возвращает суммарные счетчики обработчиков и количество работодателей в каждом статусе очереди.
+    """
+    metrics = metrics or REGISTRY
+    employer_ids = list(employer_ids)
+    with psycopg2.connect(dbname=db_name, **params) as conn:
+        with conn.cursor() as cur:
+            queued = enqueue_employers(cur, employer_ids, max_attempts)
+    conn.close()
+    print(f"Очередь загрузки: {queued}.")
+
+    args = (db_name, params, hh_api_factory, rates, shard_size, lease, max_attempts)
+    if workers <= 1:
+        try:
+            results = [ingest_worker(*args)]
+        except Exception as e:
+            print(f"Обработчик очереди загрузки завершился с ошибкой: {e}")
+            results = [_crashed_totals()]
+    else:
+        # Процессы запускаются заново (spawn), а не копируются (fork): соединения и потоки родителя им не нужны
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [executor.submit(_process_worker, *args) for _ in range(workers)]
+            results = []
+            for future in futures:
+                try:
+                    worker_totals, snapshot = future.result()
+                except Exception as e:
+                    print(f"Обработчик очереди загрузки завершился с ошибкой: {e}")
+                    worker_totals, snapshot = _crashed_totals(), None
+                if snapshot is not None:
+                    metrics.merge(snapshot)
+                results.append(worker_totals)
+
+    totals = {key: sum(result[key] for result in results) for key in _TOTALS}
+    with psycopg2.connect(dbname=db_name, **params) as conn:
+        with conn.cursor() as cur:
+            cur.execute(get_ingest_queue_status_query(), (employer_ids,))
+            totals["queue"] = dict(cur.fetchall())
+    conn.close()
+    return totals
@@ -33,18 +33,316 @@ def create_vacancies_table():
             salary_to INTEGER,
             currency VARCHAR(50),
             vacancy_url TEXT,
-            description TEXT
+            description TEXT,
+            content_hash CHAR(32),
+            published_at TIMESTAMPTZ,
+            archived BOOLEAN NOT NULL DEFAULT FALSE,
+            salary_from_rub INTEGER,
+            salary_to_rub INTEGER,
+            salary_mid_rub INTEGER
         );
     """
 
+def create_partitioned_vacancies_table():
+    """
+    Возвращает SQL-запрос для создания секционированной таблицы 'vacancies' (секции по месяцам публикации).
+    Первичный ключ секционированной таблицы обязан включать ключ секционирования, поэтому он составной
+    (vacancy_id, published_at), а дата публикации обязательна. Секция по умолчанию принимает вакансии,
+    для месяца которых секции нет (например, опубликованные до перехода на секционирование).
+    """
+    return """
+        CREATE TABLE IF NOT EXISTS vacancies (
+            vacancy_id SERIAL,
+            employer_id INTEGER REFERENCES employers(employer_id),
+            vacancy_name VARCHAR(255) NOT NULL,
+            salary_from INTEGER,
+            salary_to INTEGER,
+            currency VARCHAR(50),
+            vacancy_url TEXT,
+            description TEXT,
+            content_hash CHAR(32),
+            published_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            archived BOOLEAN NOT NULL DEFAULT FALSE,
+            salary_from_rub INTEGER,
+            salary_to_rub INTEGER,
+            salary_mid_rub INTEGER,
+            PRIMARY KEY (vacancy_id, published_at)
+        ) PARTITION BY RANGE (published_at);
+        CREATE TABLE IF NOT EXISTS vacancies_default PARTITION OF vacancies DEFAULT;
+    """
+
+def create_vacancies_partition(name: str, start: str, end: str):
+    """Возвращает SQL-запрос для создания секции таблицы 'vacancies' с датами публикации в интервале [start, end)."""
+    return f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF vacancies FOR VALUES FROM ('{start}') TO ('{end}')"
+
+def get_vacancies_partitioned_query():
+    """Возвращает SQL-запрос, проверяющий, что таблица 'vacancies' секционирована."""
+    return """
+        SELECT relkind = 'p'
+        FROM pg_class
+        WHERE oid = to_regclass('vacancies')
+    """
+
+def get_vacancies_partitions_query():
+    """Возвращает SQL-запрос для получения имен секций таблицы 'vacancies'."""
+    return """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = 'vacancies'::regclass
+        ORDER BY child.relname
+    """
+
+def rename_unpartitioned_vacancies_table():
+    """
+    Возвращает SQL-запрос, который перед переходом на секционирование переименовывает обычную таблицу
+    'vacancies' вместе с первичным ключом и удаляет зависящие от нее представления со статистикой.
+    """
+    return """
+        DROP MATERIALIZED VIEW IF EXISTS employer_stats, salary_stats;
+        ALTER TABLE vacancies RENAME TO vacancies_unpartitioned;
+        ALTER TABLE vacancies_unpartitioned RENAME CONSTRAINT vacancies_pkey TO vacancies_unpartitioned_pkey;
+    """
+
+def get_unpartitioned_vacancies_range_query():
+    """Возвращает SQL-запрос для получения самой ранней и самой поздней даты публикации в обычной таблице."""
+    return """
+        SELECT MIN(published_at), MAX(published_at)
+        FROM vacancies_unpartitioned
+    """
+
+def copy_unpartitioned_vacancies():
+    """
+    Возвращает SQL-запрос, который переносит вакансии из обычной таблицы в секционированную и удаляет обычную.
+    Вакансии без даты публикации получают текущую дату (при следующей синхронизации она заменится датой из API).
+    Счетчик vacancy_id продолжается с наибольшего перенесенного значения.
+    """
+    return """
+        INSERT INTO vacancies (vacancy_id, employer_id, vacancy_name, salary_from, salary_to, currency,
+        vacancy_url, description, content_hash, published_at, archived, salary_from_rub, salary_to_rub,
+        salary_mid_rub)
+        SELECT vacancy_id, employer_id, vacancy_name, salary_from, salary_to, currency,
+        vacancy_url, description, content_hash, COALESCE(published_at, NOW()), archived, salary_from_rub,
+        salary_to_rub, salary_mid_rub
+        FROM vacancies_unpartitioned;
+        DROP TABLE vacancies_unpartitioned;
+        SELECT setval(pg_get_serial_sequence('vacancies', 'vacancy_id'), COALESCE(MAX(vacancy_id), 1))
+        FROM vacancies;
+    """
+
+def get_default_partition_months_query():
+    """Возвращает SQL-запрос для получения месяцев (по UTC), вакансии которых попали в секцию по умолчанию."""
+    return """
+        SELECT DISTINCT date_trunc('month', published_at AT TIME ZONE 'UTC')::date
+        FROM vacancies_default
+    """
+
+def detach_default_partition():
+    """Возвращает SQL-запрос, отсоединяющий секцию по умолчанию (пока она отсоединена, создаются месячные секции)."""
+    return "ALTER TABLE vacancies DETACH PARTITION vacancies_default"
+
+def move_default_vacancies():
+    """
+    Возвращает SQL-запрос, который переносит вакансии из отсоединенной секции по умолчанию в месячные секции
+    и снова присоединяет ее.
+    """
+    return """
+        INSERT INTO vacancies (vacancy_id, employer_id, vacancy_name, salary_from, salary_to, currency,
+        vacancy_url, description, content_hash, published_at, archived, salary_from_rub, salary_to_rub,
+        salary_mid_rub)
+        SELECT vacancy_id, employer_id, vacancy_name, salary_from, salary_to, currency,
+        vacancy_url, description, content_hash, published_at, archived, salary_from_rub, salary_to_rub,
+        salary_mid_rub
+        FROM vacancies_default;
+        TRUNCATE vacancies_default;
+        ALTER TABLE vacancies ATTACH PARTITION vacancies_default DEFAULT;
+    """
+
+def get_partition_active_count_query():
+    """
+    Возвращает SQL-запрос для подсчета неархивных вакансий, опубликованных в интервале [%s, %s).
+    Условие на ключ секционирования с постоянными границами позволяет планировщику читать только одну секцию.
+    """
+    return """
+        SELECT COUNT(*)
+        FROM vacancies
+        WHERE published_at >= %s AND published_at < %s AND NOT archived
+    """
+
+def detach_vacancies_partition(name: str, schema: str):
+    """
+    Возвращает SQL-запрос, который отсоединяет секцию от таблицы 'vacancies' и переносит ее в архивную схему:
+    данные остаются доступны как отдельная таблица, но больше не участвуют в запросах к vacancies.
+    """
+    return f"""
+        CREATE SCHEMA IF NOT EXISTS {schema};
+        ALTER TABLE vacancies DETACH PARTITION {name};
+        ALTER TABLE {name} SET SCHEMA {schema};
+    """
+
+def alter_vacancies_table():
+    """
+    Возвращает SQL-запрос для добавления в таблицу 'vacancies' столбцов,
+    появившихся после ее первоначального создания.
+    """
+    return """
+        ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS content_hash CHAR(32);
+        ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS published_at TIMESTAMPTZ;
+        ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS archived BOOLEAN NOT NULL DEFAULT FALSE;
+        ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS salary_from_rub INTEGER;
+        ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS salary_to_rub INTEGER;
+        ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS salary_mid_rub INTEGER;
+    """
+
+def create_currency_rates_table():
+    """
+    Возвращает SQL-запрос для создания таблицы 'currency_rates'.
+    Таблица 'currency_rates' хранит курсы валют из справочника HH.ru: сколько единиц валюты стоит один рубль.
+    """
+    return """
+        CREATE TABLE IF NOT EXISTS currency_rates (
+            code VARCHAR(10) PRIMARY KEY,
+            rate NUMERIC NOT NULL,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+    """
+
+def create_sync_state_table():
+    """
+    Возвращает SQL-запрос для создания таблицы 'sync_state'.
+    Таблица 'sync_state' хранит для каждого работодателя отметку (watermark) последней синхронизации:
+    дату публикации самой свежей загруженной вакансии и время синхронизации.
+    """
+    return """
+        CREATE TABLE IF NOT EXISTS sync_state (
+            employer_id INTEGER PRIMARY KEY REFERENCES employers(employer_id),
+            last_published_at TIMESTAMPTZ,
+            last_synced_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+    """
+
+def create_ingest_queue_table():
+    """
+    Возвращает SQL-запрос для создания таблицы 'ingest_queue' — очереди работодателей для загрузки
+    в несколько процессов (или на нескольких машинах). Статус: pending — ждет загрузки, running — взят
+    обработчиком worker в claimed_at, done — загружен, failed — ошибка (текст в error).
+    """
+    return """
+        CREATE TABLE IF NOT EXISTS ingest_queue (
+            employer_id INTEGER PRIMARY KEY,
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            worker VARCHAR(255),
+            attempts INTEGER NOT NULL DEFAULT 0,
+            claimed_at TIMESTAMPTZ,
+            finished_at TIMESTAMPTZ,
+            error TEXT
+        );
+    """
+
+def create_meta_table():
+    """
+    Возвращает SQL-запрос для создания таблицы 'meta' со служебными значениями.
+    Значение 'data_version' увеличивается после каждой загрузки и сбрасывает кэш запросов DBManager.
+    """
+    return """
+        CREATE TABLE IF NOT EXISTS meta (
+            key VARCHAR(50) PRIMARY KEY,
+            value BIGINT NOT NULL
+        );
+        INSERT INTO meta (key, value) VALUES ('data_version', 0) ON CONFLICT (key) DO NOTHING;
+    """
+
+def create_statistics_views():
+    """
+    Возвращает SQL-запрос для создания материализованных представлений со статистикой:
+    'employer_stats' — количество неархивных вакансий у каждой компании,
+    'salary_stats' — средняя зарплата в рублях (середина вилки) по неархивным вакансиям (одна строка).
+    Уникальные индексы нужны для обновления представлений без блокировки чтения (CONCURRENTLY).
+    Представление salary_stats, созданное предыдущей версией (по salary_from), пересоздается.
+    """
+    return """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_matviews
+                       WHERE matviewname = 'salary_stats' AND definition NOT LIKE '%salary_mid_rub%') THEN
+                DROP MATERIALIZED VIEW salary_stats;
+            END IF;
+        END $$;
+
+        CREATE MATERIALIZED VIEW IF NOT EXISTS employer_stats AS
+            SELECT employers.employer_id, employer_name, COUNT(vacancy_id) AS vacancies_count
+            FROM employers
+            LEFT JOIN vacancies ON vacancies.employer_id = employers.employer_id AND NOT vacancies.archived
+            GROUP BY employers.employer_id, employer_name;
+        CREATE UNIQUE INDEX IF NOT EXISTS employer_stats_employer_id_idx ON employer_stats (employer_id);
+
+        CREATE MATERIALIZED VIEW IF NOT EXISTS salary_stats AS
+            SELECT 1 AS id, AVG(salary_mid_rub) AS avg_salary, COUNT(salary_mid_rub) AS salaries_count
+            FROM vacancies
+            WHERE salary_mid_rub IS NOT NULL AND NOT archived;
+        CREATE UNIQUE INDEX IF NOT EXISTS salary_stats_id_idx ON salary_stats (id);
+    """
+
+def refresh_statistics_views():
+    """Возвращает SQL-запрос для пересчета материализованных представлений со статистикой."""
+    return """
+        REFRESH MATERIALIZED VIEW CONCURRENTLY employer_stats;
+        REFRESH MATERIALIZED VIEW CONCURRENTLY salary_stats;
+    """
+
+def create_indexes():
+    """
+    Возвращает SQL-запрос для создания индексов таблицы 'vacancies':
+    триграммный GIN-индекс для поиска по подстроке в названии (ILIKE '%...%'),
+    B-tree индекс по employer_id для соединения с employers, частичные индексы по salary_from
+    и (salary_mid_rub, vacancy_id) для фильтров по зарплате среди неархивных вакансий
+    и частичный индекс по (employer_id, vacancy_id) для постраничного вывода.
+    Индекс по одному salary_mid_rub из предыдущей версии заменяется составным.
+    """
+    return """
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS vacancies_name_trgm_idx ON vacancies USING GIN (vacancy_name gin_trgm_ops);
+        CREATE INDEX IF NOT EXISTS vacancies_employer_id_idx ON vacancies (employer_id);
+        CREATE INDEX IF NOT EXISTS vacancies_salary_from_idx ON vacancies (salary_from)
+            WHERE salary_from IS NOT NULL AND NOT archived;
+        CREATE INDEX IF NOT EXISTS vacancies_salary_mid_rub_id_idx ON vacancies (salary_mid_rub, vacancy_id)
+            WHERE salary_mid_rub IS NOT NULL AND NOT archived;
+        DROP INDEX IF EXISTS vacancies_salary_mid_rub_idx;
+        CREATE INDEX IF NOT EXISTS vacancies_employer_vacancy_idx ON vacancies (employer_id, vacancy_id)
+            WHERE NOT archived;
+    """
+
+def create_search_vector():
+    """
+    Возвращает SQL-запрос для создания вычисляемого столбца search_vector (tsvector по названию и описанию,
+    название весомее описания) и GIN-индекса по нему для полнотекстового поиска с ранжированием.
+    """
+    return """
+        ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('russian', coalesce(vacancy_name, '')), 'A') ||
+                setweight(to_tsvector('russian', coalesce(description, '')), 'B')
+            ) STORED;
+        CREATE INDEX IF NOT EXISTS vacancies_search_vector_idx ON vacancies USING GIN (search_vector);
+    """
+
 # db_manager.py
+def get_data_version_query():
+    """Возвращает SQL-запрос для получения текущей версии данных."""
+    return """
+        SELECT value
+        FROM meta
+        WHERE key = 'data_version'
+    """
+
 def get_companies_and_vacancies_count():
-    """Возвращает SQL-запрос для получения списка компаний и количества вакансий у каждой компании."""
+    """
+    Возвращает SQL-запрос для получения списка компаний и количества вакансий у каждой компании.
+    Данные берутся из представления employer_stats, которое пересчитывается в конце загрузки.
+    """
     return """
-        SELECT employer_name, COUNT(vacancy_id) AS vacancies_count
-        FROM employers
-        LEFT JOIN vacancies USING(employer_id)
-        GROUP BY employer_name
+        SELECT employer_name, vacancies_count
+        FROM employer_stats
         ORDER BY vacancies_count DESC
     """
 
@@ -54,23 +352,31 @@ def get_all_vacancies():
         SELECT employer_name, vacancy_name, salary_from, salary_to, currency, vacancy_url
         FROM vacancies
         JOIN employers USING(employer_id)
+        WHERE NOT archived
     """
 
 def get_avg_salary():
-    """Возвращает SQL-запрос для получения средней зарплаты по вакансиям."""
+    """
+    Возвращает SQL-запрос для получения средней зарплаты по вакансиям в рублях (по середине вилки).
+    Значение берется из представления salary_stats, которое пересчитывается в конце загрузки.
+    """
     return """
-        SELECT AVG(salary_from)
-        FROM vacancies
-        WHERE salary_from IS NOT NULL
+        SELECT avg_salary
+        FROM salary_stats
     """
 
 def get_vacancies_with_higher_salary():
-    """Возвращает SQL-запрос для получения списка вакансий с зарплатой выше средней."""
+    """
+    Возвращает SQL-запрос для получения списка вакансий с зарплатой выше средней.
+    Зарплаты сравниваются в рублях: средняя берется из salary_stats,
+    отбор выполняется по частичному индексу salary_mid_rub.
+    """
     return """
         SELECT employer_name, vacancy_name, salary_from, salary_to, currency, vacancy_url
         FROM vacancies
         JOIN employers USING(employer_id)
-        WHERE salary_from > (SELECT AVG(salary_from) FROM vacancies WHERE salary_from IS NOT NULL)
+        WHERE NOT archived
+            AND salary_mid_rub > (SELECT avg_salary FROM salary_stats)
     """
 
 def get_vacancies_with_keyword():
@@ -82,13 +388,428 @@ def get_vacancies_with_keyword():
         SELECT employer_name, vacancy_name, salary_from, salary_to, currency, vacancy_url
         FROM vacancies
         JOIN employers USING(employer_id)
-        WHERE vacancy_name ILIKE %s 
+        WHERE vacancy_name ILIKE %s AND NOT archived
+    """
+
+def get_all_vacancies_page(after: bool):
+    """
+    Возвращает SQL-запрос для получения страницы списка всех вакансий (постраничный вывод по ключу).
+    Вакансии упорядочены по (employer_id, vacancy_id); последние два столбца — ключ строки.
+    after: Добавить условие "после ключа (employer_id, vacancy_id)" — для всех страниц, кроме первой.
+    Параметры: [employer_id, vacancy_id,] размер страницы.
+    """
+    keyset = "AND (vacancies.employer_id, vacancy_id) > (%s, %s)" if after else ""
+    return f"""
+        SELECT employer_name, vacancy_name, salary_from, salary_to, currency, vacancy_url,
+               vacancies.employer_id, vacancy_id
+        FROM vacancies
+        JOIN employers USING(employer_id)
+        WHERE NOT archived {keyset}
+        ORDER BY vacancies.employer_id, vacancy_id
+        LIMIT %s
+    """
+
+def get_vacancies_with_higher_salary_page(after: bool):
+    """
+    Возвращает SQL-запрос для получения страницы списка вакансий с зарплатой выше средней.
+    Вакансии упорядочены по убыванию (salary_mid_rub, vacancy_id); последние два столбца — ключ строки.
+    after: Добавить условие "после ключа (salary_mid_rub, vacancy_id)" — для всех страниц, кроме первой.
+    Параметры: [salary_mid_rub, vacancy_id,] размер страницы.
+    """
+    keyset = "AND (salary_mid_rub, vacancy_id) < (%s, %s)" if after else ""
+    return f"""
+        SELECT employer_name, vacancy_name, salary_from, salary_to, currency, vacancy_url,
+               salary_mid_rub, vacancy_id
+        FROM vacancies
+        JOIN employers USING(employer_id)
+        WHERE NOT archived
+            AND salary_mid_rub > (SELECT avg_salary FROM salary_stats) {keyset}
+        ORDER BY salary_mid_rub DESC, vacancy_id DESC
+        LIMIT %s
+    """
+
+def get_vacancies_with_keyword_page(after: bool):
+    """
+    Возвращает SQL-запрос для получения страницы списка вакансий, содержащих ключевое слово.
+    Вакансии упорядочены по (employer_id, vacancy_id); последние два столбца — ключ строки.
+    after: Добавить условие "после ключа (employer_id, vacancy_id)" — для всех страниц, кроме первой.
+    Параметры: шаблон ILIKE, [employer_id, vacancy_id,] размер страницы.
+    """
+    keyset = "AND (vacancies.employer_id, vacancy_id) > (%s, %s)" if after else ""
+    return f"""
+        SELECT employer_name, vacancy_name, salary_from, salary_to, currency, vacancy_url,
+               vacancies.employer_id, vacancy_id
+        FROM vacancies
+        JOIN employers USING(employer_id)
+        WHERE vacancy_name ILIKE %s AND NOT archived {keyset}
+        ORDER BY vacancies.employer_id, vacancy_id
+        LIMIT %s
+    """
+
+def search_vacancies_fulltext():
+    """
+    Возвращает SQL-запрос для полнотекстового поиска вакансий по названию и описанию.
+    Запрос пользователя разбирается websearch_to_tsquery (слова, "фразы", -исключения, or),
+    результаты упорядочены по релевантности ts_rank.
+    """
+    return """
+        SELECT employer_name, vacancy_name, salary_from, salary_to, currency, vacancy_url
+        FROM vacancies
+        JOIN employers USING(employer_id),
+        websearch_to_tsquery('russian', %(query)s) AS query
+        WHERE search_vector @@ query AND NOT archived
+        ORDER BY ts_rank(search_vector, query) DESC, vacancy_id
+        LIMIT %(limit)s
+    """
+
+def search_vacancies_trigram(words_count: int):
+    """
+    Возвращает SQL-запрос для поиска вакансий, в названии которых есть все переданные слова.
+    Каждое слово проверяется через ILIKE (использует триграммный индекс),
+    результаты упорядочены по сходству названия со всей строкой запроса.
+    """
+    conditions = " AND ".join(["vacancy_name ILIKE %s"] * words_count)
+    return f"""
+        SELECT employer_name, vacancy_name, salary_from, salary_to, currency, vacancy_url
+        FROM vacancies
+        JOIN employers USING(employer_id)
+        WHERE {conditions} AND NOT archived
+        ORDER BY similarity(vacancy_name, %s) DESC, vacancy_id
+        LIMIT %s
     """
+
 # main.py
+def bump_data_version_query():
+    """Возвращает SQL-запрос, увеличивающий версию данных после загрузки."""
+    return """
+        UPDATE meta
+        SET value = value + 1
+        WHERE key = 'data_version'
+    """
+
+def get_currency_rates_query():
+    """
+    Возвращает SQL-запрос для получения сохраненных курсов валют с признаком свежести:
+    обновлен ли курс не раньше заданного времени.
+    """
+    return """
+        SELECT code, rate, updated_at >= NOW() - %s AS fresh
+        FROM currency_rates
+    """
+
+def get_backfill_salary_rub_query():
+    """
+    Возвращает SQL-запрос, который заполняет зарплаты в рублях у вакансий, загруженных до их появления,
+    по сохраненным курсам (как loader.normalize_salary). Вакансии в валюте без курса не изменяются.
+    """
+    return """
+        UPDATE vacancies
+        SET salary_from_rub = converted.from_rub,
+            salary_to_rub = converted.to_rub,
+            salary_mid_rub = CASE WHEN converted.from_rub IS NOT NULL AND converted.to_rub IS NOT NULL
+                                  THEN (converted.from_rub + converted.to_rub) / 2
+                                  ELSE COALESCE(converted.from_rub, converted.to_rub) END
+        FROM (
+            SELECT vacancy_id,
+                   CASE WHEN currency IS NULL OR currency IN ('RUR', 'RUB') THEN salary_from
+                        ELSE ROUND(salary_from / rate)::INTEGER END AS from_rub,
+                   CASE WHEN currency IS NULL OR currency IN ('RUR', 'RUB') THEN salary_to
+                        ELSE ROUND(salary_to / rate)::INTEGER END AS to_rub
+            FROM vacancies
+            LEFT JOIN currency_rates ON currency_rates.code = vacancies.currency
+            WHERE salary_mid_rub IS NULL
+              AND (salary_from IS NOT NULL OR salary_to IS NOT NULL)
+              AND (currency IS NULL OR currency IN ('RUR', 'RUB') OR currency_rates.rate > 0)
+        ) AS converted
+        WHERE vacancies.vacancy_id = converted.vacancy_id
+    """
+
+def get_upsert_currency_rates_query():
+    """Возвращает SQL-запрос для пакетного сохранения курсов валют через execute_values."""
+    return """
+        INSERT INTO currency_rates (code, rate, updated_at)
+        VALUES %s
+        ON CONFLICT (code) DO UPDATE SET
+            rate = EXCLUDED.rate,
+            updated_at = EXCLUDED.updated_at
+    """
+
+def get_employer_names_query():
+    """Возвращает SQL-запрос для получения имен всех сохраненных работодателей."""
+    return """
+        SELECT employer_id, employer_name
+        FROM employers
+    """
+
 def get_insert_vacancy_query():
     """Возвращает SQL-запрос для вставки вакансии."""
     return """
         INSERT INTO vacancies (vacancy_id, employer_id, vacancy_name, salary_from, salary_to, 
         currency, vacancy_url, description)
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-    """
\ No newline at end of file
+    """
+
+def get_upsert_employers_query():
+    """
+    Возвращает SQL-запрос для пакетной вставки работодателей через execute_values.
+    Имя существующего работодателя обновляется только если оно изменилось.
+    """
+    return """
+        INSERT INTO employers (employer_id, employer_name)
+        VALUES %s
+        ON CONFLICT (employer_id) DO UPDATE SET
+            employer_name = EXCLUDED.employer_name
+        WHERE employers.employer_name IS DISTINCT FROM EXCLUDED.employer_name
+        RETURNING (xmax = 0) AS inserted
+    """
+
+def get_upsert_vacancies_query(partitioned: bool = False):
+    """
+    Возвращает SQL-запрос для пакетной вставки вакансий через execute_values.
+    Существующие вакансии обновляются только если изменился хэш их содержимого
+    или вакансия была помечена как архивная и снова появилась на сайте.
+    RETURNING возвращает True для вставленных строк и False для обновленных.
+    partitioned: Запрос для секционированной таблицы, первичный ключ которой (vacancy_id, published_at).
+    """
+    conflict = "vacancy_id, published_at" if partitioned else "vacancy_id"
+    return f"""
+        INSERT INTO vacancies (vacancy_id, employer_id, vacancy_name, salary_from, salary_to,
+        currency, vacancy_url, description, published_at, salary_from_rub, salary_to_rub, salary_mid_rub,
+        content_hash)
+        VALUES %s
+        ON CONFLICT ({conflict}) DO UPDATE SET
+            employer_id = EXCLUDED.employer_id,
+            vacancy_name = EXCLUDED.vacancy_name,
+            salary_from = EXCLUDED.salary_from,
+            salary_to = EXCLUDED.salary_to,
+            currency = EXCLUDED.currency,
+            vacancy_url = EXCLUDED.vacancy_url,
+            description = EXCLUDED.description,
+            published_at = EXCLUDED.published_at,
+            salary_from_rub = EXCLUDED.salary_from_rub,
+            salary_to_rub = EXCLUDED.salary_to_rub,
+            salary_mid_rub = EXCLUDED.salary_mid_rub,
+            content_hash = EXCLUDED.content_hash,
+            archived = FALSE
+        WHERE vacancies.content_hash IS DISTINCT FROM EXCLUDED.content_hash OR vacancies.archived
+        RETURNING (xmax = 0) AS inserted
+    """
+
+def get_delete_moved_vacancies_query():
+    """
+    Возвращает SQL-запрос для execute_values, удаляющий из секционированной таблицы вакансии,
+    дата публикации которых изменилась (вакансию опубликовали повторно). Иначе вакансия с новой датой
+    была бы вставлена в другую секцию второй строкой; после удаления она вставляется заново.
+    """
+    return """
+        DELETE FROM vacancies
+        USING (VALUES %s) AS loaded (vacancy_id, published_at)
+        WHERE vacancies.vacancy_id = loaded.vacancy_id AND vacancies.published_at < loaded.published_at
+    """
+
+# sync.py
+def get_watermarks_query():
+    """Возвращает SQL-запрос для получения отметок последней синхронизации работодателей."""
+    return """
+        SELECT employer_id, last_published_at
+        FROM sync_state
+        WHERE employer_id = ANY(%s) AND last_published_at IS NOT NULL
+    """
+
+def get_update_watermarks_query():
+    """
+    Возвращает SQL-запрос для обновления отметок синхронизации.
+    Отметкой становится дата публикации самой свежей вакансии работодателя в базе.
+    Второй параметр — нижняя граница дат публикации (самая ранняя из прежних отметок): отметки только растут,
+    поэтому более старые вакансии (и секции) не читаются.
+    """
+    return """
+        INSERT INTO sync_state (employer_id, last_published_at, last_synced_at)
+        SELECT employer_id, MAX(published_at), NOW()
+        FROM vacancies
+        WHERE employer_id = ANY(%s) AND published_at >= %s
+        GROUP BY employer_id
+        ON CONFLICT (employer_id) DO UPDATE SET
+            last_published_at = EXCLUDED.last_published_at,
+            last_synced_at = EXCLUDED.last_synced_at
+    """
+
+def get_active_vacancies_count_query():
+    """Возвращает SQL-запрос для подсчета неархивных вакансий работодателя."""
+    return """
+        SELECT COUNT(*)
+        FROM vacancies
+        WHERE employer_id = %s AND NOT archived
+    """
+
+def get_active_vacancy_ids_query():
+    """Возвращает SQL-запрос для получения ID неархивных вакансий работодателя."""
+    return """
+        SELECT vacancy_id
+        FROM vacancies
+        WHERE employer_id = %s AND NOT archived
+    """
+
+def get_archive_vacancies_query():
+    """Возвращает SQL-запрос, помечающий архивными переданные вакансии работодателя (которых больше нет на сайте)."""
+    return """
+        UPDATE vacancies
+        SET archived = TRUE
+        WHERE employer_id = %s AND NOT archived AND vacancy_id = ANY(%s)
+    """
+
+# sharded_ingest.py
+def get_enqueue_employers_query():
+    """Возвращает SQL-запрос для execute_values, добавляющий работодателей в очередь загрузки."""
+    return """
+        INSERT INTO ingest_queue (employer_id)
+        VALUES %s
+        ON CONFLICT (employer_id) DO NOTHING
+    """
+
+def get_restart_ingest_queue_query():
+    """
+    Возвращает SQL-запрос, который начинает новый проход очереди: если среди работодателей %(employer_ids)s
+    не осталось ни одного, которого можно забрать или который еще обрабатывается (все загружены или исчерпали
+    %(max_attempts)s попыток), загруженные и упавшие снова получают статус pending. Иначе очередь навсегда
+    остановилась бы на работодателях, исчерпавших попытки.
+    Незавершенный проход (после сбоя) не сбрасывается и продолжается с того места, где остановился.
+    """
+    return """
+        UPDATE ingest_queue
+        SET status = 'pending', worker = NULL, attempts = 0, claimed_at = NULL, finished_at = NULL, error = NULL
+        WHERE employer_id = ANY(%(employer_ids)s)
+          AND status IN ('done', 'failed')
+          AND NOT EXISTS (
+              SELECT 1
+              FROM ingest_queue
+              WHERE employer_id = ANY(%(employer_ids)s)
+                AND (status = 'pending'
+                     OR (status = 'failed' AND attempts < %(max_attempts)s)
+                     OR status = 'running')
+          )
+    """
+
+def get_claim_shard_query():
+    """
+    Возвращает SQL-запрос, который забирает из очереди до %(limit)s работодателей для обработчика %(worker)s.
+    Берутся ожидающие, упавшие с ошибкой (меньше %(max_attempts)s попыток) и взятые раньше %(lease)s назад
+    (их обработчик, по-видимому, завершился аварийно). FOR UPDATE SKIP LOCKED позволяет нескольким
+    обработчикам забирать работодателей одновременно, не ожидая друг друга и не получая одних и тех же.
+    """
+    return """
+        UPDATE ingest_queue
+        SET status = 'running', worker = %(worker)s, attempts = attempts + 1, claimed_at = NOW(), error = NULL
+        WHERE employer_id IN (
+            SELECT employer_id
+            FROM ingest_queue
+            WHERE status = 'pending'
+               OR (status = 'failed' AND attempts < %(max_attempts)s)
+               OR (status = 'running' AND claimed_at < NOW() - %(lease)s)
+            ORDER BY employer_id
+            LIMIT %(limit)s
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING employer_id
+    """
+
+def get_complete_shard_query():
+    """Возвращает SQL-запрос, отмечающий работодателей загруженными."""
+    return """
+        UPDATE ingest_queue
+        SET status = 'done', finished_at = NOW(), error = NULL
+        WHERE employer_id = ANY(%s)
+    """
+
+def get_fail_shard_query():
+    """Возвращает SQL-запрос, отмечающий работодателей, загрузка которых завершилась ошибкой."""
+    return """
+        UPDATE ingest_queue
+        SET status = 'failed', finished_at = NOW(), error = %s
+        WHERE employer_id = ANY(%s)
+    """
+
+def get_ingest_queue_status_query():
+    """Возвращает SQL-запрос для подсчета работодателей из списка в каждом статусе очереди."""
+    return """
+        SELECT status, COUNT(*)
+        FROM ingest_queue
+        WHERE employer_id = ANY(%s)
+        GROUP BY status
+    """
+
+# analytics.py
+def get_salary_count_query():
+    """Возвращает SQL-запрос для получения количества неархивных вакансий с зарплатой в рублях (из salary_stats)."""
+    return """
+        SELECT salaries_count
+        FROM salary_stats
+    """
+
+def get_salary_columns_query():
+    """
+    Возвращает SQL-запрос, который одной строкой отдает два массива: employer_id и зарплаты в рублях
+    (середина вилки) неархивных вакансий. Массивы сразу превращаются в массивы NumPy без построчной обработки.
+    """
+    return """
+        SELECT COALESCE(array_agg(employer_id), '{}'), COALESCE(array_agg(salary_mid_rub), '{}')
+        FROM vacancies
+        WHERE salary_mid_rub IS NOT NULL AND NOT archived
+    """
+
+def get_salary_percentiles_query():
+    """
+    Возвращает SQL-запрос для расчета процентилей зарплаты на стороне базы данных.
+    Параметр — массив долей от 0 до 1; percentile_cont интерполирует так же, как numpy.percentile.
+    """
+    return """
+        SELECT percentile_cont(%s::float8[]) WITHIN GROUP (ORDER BY salary_mid_rub)
+        FROM vacancies
+        WHERE salary_mid_rub IS NOT NULL AND NOT archived
+    """
+
+def get_salary_range_query():
+    """Возвращает SQL-запрос для получения минимальной и максимальной зарплаты в рублях."""
+    return """
+        SELECT MIN(salary_mid_rub), MAX(salary_mid_rub)
+        FROM vacancies
+        WHERE salary_mid_rub IS NOT NULL AND NOT archived
+    """
+
+def get_salary_histogram_query():
+    """
+    Возвращает SQL-запрос для построения гистограммы зарплат на стороне базы данных.
+    Параметры: %(low)s, %(high)s — границы, %(bins)s — количество интервалов.
+    Максимальное значение попадает в последний интервал, как в numpy.histogram.
+    """
+    return """
+        SELECT LEAST(width_bucket(salary_mid_rub, %(low)s, %(high)s, %(bins)s), %(bins)s) AS bucket, COUNT(*)
+        FROM vacancies
+        WHERE salary_mid_rub IS NOT NULL AND NOT archived
+        GROUP BY bucket
+        ORDER BY bucket
+    """
+
+def get_employer_median_salaries_query():
+    """Возвращает SQL-запрос для расчета медианной зарплаты в рублях у каждой компании."""
+    return """
+        SELECT employer_id, percentile_cont(0.5) WITHIN GROUP (ORDER BY salary_mid_rub)
+        FROM vacancies
+        WHERE salary_mid_rub IS NOT NULL AND NOT archived
+        GROUP BY employer_id
+        ORDER BY employer_id
+    """
+
+def get_salary_bands_query():
+    """
+    Возвращает SQL-запрос для подсчета вакансий по диапазонам зарплат.
+    Параметр — массив нижних границ диапазонов по возрастанию; width_bucket возвращает номер диапазона
+    (0 — зарплата ниже первой границы).
+    """
+    return """
+        SELECT width_bucket(salary_mid_rub, %s::integer[]) AS band, COUNT(*)
+        FROM vacancies
+        WHERE salary_mid_rub IS NOT NULL AND NOT archived
+        GROUP BY band
+        ORDER BY band
+    """
@@ -0,0 +1,94 @@
+# Импортируем необходимые библиотеки и модули
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+# Импортируем нужные классы и методы
+from scr.api_function import HHApi
+from scr.loader import load_vacancy_pages
+from scr.pipeline import IngestPipeline
+from scr.sql_queries import (
+    get_watermarks_query,
+    get_update_watermarks_query,
+    get_active_vacancies_count_query,
+    get_active_vacancy_ids_query,
+    get_archive_vacancies_query
+)
+
+
+def get_watermarks(cur, employer_ids: List[int]) -> Dict[int, datetime]:
+    """Возвращает отметки последней синхронизации {employer_id: дата публикации}."""
+    cur.execute(get_watermarks_query(), (employer_ids,))
+    return dict(cur.fetchall())
+
+
+def archive_vanished_vacancies(cur, hh_api: HHApi, employer_id: int) -> int:
+    """
+    Помечает архивными вакансии работодателя, которые исчезли с сайта. Возвращает их количество.
+    Если загружаются все вакансии (max_vacancies = None), после загрузки в базе есть каждая открытая вакансия,
+    поэтому совпадение количества неархивных вакансий с количеством на сайте означает, что ничего не исчезло:
+    проверка стоит одного запроса, а полный список ID запрашивается только при расхождении.
+    Если в базе хранится только часть вакансий работодателя (max_vacancies), по количеству исчезновение
+    не определить, и ID сравниваются всегда.
+    """
+    if hh_api.max_vacancies is None:
+        found = hh_api.get_employer_vacancy_count(employer_id)
+        if found is None:
+            return 0
+        cur.execute(get_active_vacancies_count_query(), (employer_id,))
+        if cur.fetchone()[0] == found:
+            return 0
+
+    vacancy_ids = hh_api.get_employer_vacancy_ids(employer_id)
+    if vacancy_ids is None:
+        return 0  # Без полного списка нельзя понять, какие вакансии исчезли
+
+    cur.execute(get_active_vacancy_ids_query(), (employer_id,))
+    vanished = sorted(vacancy_id for (vacancy_id,) in cur.fetchall() if vacancy_id not in vacancy_ids)
+    if not vanished:
+        return 0
+    cur.execute(get_archive_vacancies_query(), (employer_id, vanished))
+    return cur.rowcount
+
+
+def sync_vacancies(cur, hh_api: HHApi, employer_ids: Iterable[int], batch_size: int = 1000,
+                   rates: Optional[Dict[str, float]] = None,
+                   pipeline: Optional[IngestPipeline] = None) -> Dict[str, int]:
+    """
+    Инкрементально синхронизирует вакансии работодателей.
+    Для работодателей с сохраненной отметкой запрашиваются только вакансии, опубликованные не раньше нее
+    (граничные вакансии приходят повторно и пропускаются по хэшу). Затем исчезнувшие вакансии
+    помечаются архивными, а отметки сдвигаются на самую свежую загруженную вакансию.
+    Если количество вакансий не ограничено (max_vacancies = None), поиск каждого работодателя
+    делится на окна дат публикации, чтобы обойти предел пагинации API.
+    rates: Курсы валют для пересчета зарплат в рубли.
+    pipeline: Конвейер, в котором получение, разбор и запись страниц выполняются одновременно
+              (по умолчанию страницы записываются в вызывающем потоке по мере получения).
+    Если часть страниц работодателя получить не удалось, его отметка не сдвигается (иначе вакансии
+    с пропущенных страниц оказались бы старше нее и больше не запрашивались) и архивация для него не выполняется.
+    Возвращает количество вставленных, обновленных, пропущенных и архивированных вакансий
+    и список таких работодателей (failed_employers).
+    """
+    employer_ids = list(employer_ids)
+    watermarks = get_watermarks(cur, employer_ids)
+
+    failed: Set[int] = set()
+    if hh_api.max_vacancies is None:
+        pages = hh_api.iter_partitioned_vacancy_pages(employer_ids, date_from=watermarks, failed=failed)
+    else:
+        filters = {employer_id: {"date_from": watermark.isoformat()} for employer_id, watermark in watermarks.items()}
+        pages = hh_api.iter_employers_vacancy_pages(employer_ids, limit=hh_api.max_vacancies, filters=filters,
+                                                    failed=failed)
+    if pipeline is not None:
+        stats = pipeline.run(cur, pages, rates)
+    else:
+        stats = load_vacancy_pages(cur, pages, batch_size, rates)
+    loaded = [employer_id for employer_id in employer_ids if employer_id not in failed]
+    stats["archived"] = sum(archive_vanished_vacancies(cur, hh_api, employer_id) for employer_id in loaded)
+
+    if loaded:
+        # Отметки только растут: вакансии старше самой ранней из них при пересчете не читаются
+        known = [watermarks[employer_id] for employer_id in loaded if employer_id in watermarks]
+        since = min(known) if len(known) == len(loaded) else "-infinity"
+        cur.execute(get_update_watermarks_query(), (loaded, since))
+    stats["failed_employers"] = sorted(failed)
+    return stats
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from scr.analytics import SalaryAnalytics, percentiles, histogram, employer_medians, salary_bands
+
+EMPLOYER_IDS = np.array([1, 2, 1, 2, 1, 3], dtype=np.int64)
+SALARIES = np.array([100000, 40000, 300000, 60000, 200000, 150000], dtype=np.float64)
+
+
+def test_percentiles():
+    result = percentiles(SALARIES, (0, 50, 100))
+    assert result == {0: 40000, 50: 125000, 100: 300000}
+    assert percentiles(np.empty(0)) == {}
+
+
+def test_histogram():
+    result = histogram(SALARIES, bins=4)
+    assert result['counts'] == [3, 1, 1, 1]
+    assert result['edges'][0] == 40000 and result['edges'][-1] == 300000
+    assert histogram(np.empty(0)) == {'counts': [], 'edges': []}
+
+
+def test_employer_medians_match_numpy():
+    rng = np.random.default_rng(0)
+    employer_ids = rng.integers(1, 50, size=10000)
+    salaries = rng.integers(20000, 500000, size=10000).astype(np.float64)
+
+    result = employer_medians(employer_ids, salaries)
+
+    for employer_id in (1, 17, 49):
+        assert result[employer_id] == np.median(salaries[employer_ids == employer_id])
+    assert employer_medians(EMPLOYER_IDS, SALARIES) == {1: 200000, 2: 50000, 3: 150000}
+
+
+def test_salary_bands():
+    result = salary_bands(SALARIES, (50000, 150000, 250000))
+    assert result == [
+        {'salary_from': 50000, 'salary_to': 150000, 'count': 2},
+        {'salary_from': 150000, 'salary_to': 250000, 'count': 2},
+        {'salary_from': 250000, 'salary_to': None, 'count': 1},  # 40000 ниже первой границы
+    ]
+
+
+@pytest.fixture
+def db_manager(mocker):
+    """DBManager, который отдает тестовые массивы вместо запроса к базе данных."""
+    manager = mocker.MagicMock()
+
+    def query(sql, params, convert):
+        if convert is SalaryAnalytics._process_salary_columns:
+            return EMPLOYER_IDS, SALARIES
+        if convert is SalaryAnalytics._process_first_value:
+            return len(SALARIES)
+        raise AssertionError("Агрегаты должны считаться на стороне Python")
+
+    manager.query.side_effect = query
+    return manager
+
+
+def test_analytics_computes_small_data_locally(db_manager):
+    analytics = SalaryAnalytics(db_manager, pushdown_threshold=100)
+    assert analytics.get_percentiles((50,)) == {50: 125000}
+    assert analytics.get_employer_medians()[2] == 50000
+    assert sum(band['count'] for band in analytics.get_salary_bands()) == len(SALARIES)
+
+
+def test_analytics_pushes_down_large_data(mocker):
+    db_manager = mocker.MagicMock()
+    db_manager.query.side_effect = [len(SALARIES), [100000.0, 200000.0]]
+    analytics = SalaryAnalytics(db_manager, pushdown_threshold=5)
+
+    assert analytics.get_percentiles((25, 75)) == {25: 100000.0, 75: 200000.0}
+    sql, params, _ = db_manager.query.call_args.args
+    assert "percentile_cont" in sql
+    assert params == ([0.25, 0.75],)
+
+
+def test_salary_columns_are_read_only(mocker):
+    """Массивы зарплат хранятся в кэше DBManager, поэтому изменить их на стороне вызывающего кода нельзя."""
+    cursor = mocker.MagicMock()
+    cursor.fetchone.return_value = ([1, 2], [100000.0, 200000.0])
+
+    employer_ids, salaries = SalaryAnalytics._process_salary_columns(cursor)
+
+    with pytest.raises(ValueError):
+        salaries[0] = 0
+    assert not employer_ids.flags.writeable
+    assert employer_medians(employer_ids, salaries) == {1: 100000.0, 2: 200000.0}
+
+
+def test_large_salary_columns_not_cached(mocker):
+    """Массивы зарплат учитываются в cache_max_rows так же, как списки строк."""
+    from contextlib import contextmanager
+    from scr.db_manager import DBManager
+
+    db_manager = DBManager("test", {}, cache_max_rows=len(SALARIES) - 1)
+    mocker.patch.object(db_manager, "_check_data_version", return_value=True)
+    cursor = mocker.MagicMock(rowcount=1)
+    cursor.fetchone.return_value = (EMPLOYER_IDS.tolist(), SALARIES.tolist())
+
+    @contextmanager
+    def get_cursor(name=None):
+        yield cursor
+
+    mocker.patch.object(db_manager, "_cursor", get_cursor)
+    analytics = SalaryAnalytics(db_manager, pushdown_threshold=None)
+
+    assert analytics.get_percentiles((50,)) == {50: 125000}
+    assert db_manager.cache_stats()['size'] == 0
+    db_manager.cache_max_rows = len(SALARIES)
+    analytics.fetch_salaries()
+    assert db_manager.cache_stats()['size'] == 1
@@ -1,5 +1,16 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from math import ceil
+from urllib.parse import urlparse, parse_qs
+
 import pytest
-from scr.api_function import HHApi
+from scr.api_function import HHApi, create_session
+from scr.http_cache import HTTPCache
+from scr.metrics import MetricsRegistry
+from scr.resilience import CircuitOpenError, RateLimiter
 import requests
 
 def test_hh_api_init():
@@ -9,7 +20,7 @@ def test_hh_api_init():
 
 @pytest.fixture
 def hh_api():
-    return HHApi()
+    return HHApi(backoff_base=0)  # Повторы без ожидания, чтобы не замедлять тесты
 
 def test_get_employer_vacancies_success(mocker, hh_api):
     # Мокируем успешный ответ от API
@@ -18,9 +29,9 @@ def test_get_employer_vacancies_success(mocker, hh_api):
         "found": 1
     }
 
-    # Используем mocker.patch для замены requests.get
-    mocker.patch("scr.api_function.requests.get", return_value=mocker.MagicMock(json=lambda: mock_response,
-                                                                            raise_for_status=lambda: None))
+    # Используем mocker.patch для замены запроса через сессию
+    mocker.patch.object(hh_api.session, "get", return_value=mocker.MagicMock(json=lambda: mock_response,
+                                                                             raise_for_status=lambda: None))
 
     vacancies = hh_api.get_employer_vacancies(12345)
     assert len(vacancies) == 1
@@ -28,7 +39,389 @@ def test_get_employer_vacancies_success(mocker, hh_api):
 
 def test_get_employer_vacancies_failure(mocker, hh_api):
     # Имитируем ошибку API
-    mocker.patch("scr.api_function.requests.get", side_effect=requests.exceptions.RequestException("API Error"))
+    mocker.patch.object(hh_api.session, "get", side_effect=requests.exceptions.RequestException("API Error"))
 
     vacancies = hh_api.get_employer_vacancies(12345)
-    assert len(vacancies) == 0  # Ожидаем пустой список в случае ошибки
\ No newline at end of file
+    assert len(vacancies) == 0  # Ожидаем пустой список в случае ошибки
+
+# Локальный HTTP-сервер, имитирующий API HH.ru
+STUB_DELAY = 0.1  # Задержка ответа сервера в секундах
+STUB_EMPLOYERS = {1: "Employer 1", 2: "Employer 2", 3: "Employer 3", 4: "Employer 4"}
+STUB_NOW = datetime(2025, 3, 1, tzinfo=timezone.utc)
+# У работодателей 1-4 по 25 вакансий, у работодателя 5 — 60, по одной в час
+STUB_VACANCIES = {
+    employer_id: [{"id": str(employer_id * 1000 + i), "name": f"Vacancy {i}",
+                   "published_at": (STUB_NOW - timedelta(hours=i)).isoformat()} for i in range(total)]
+    for employer_id, total in {1: 25, 2: 25, 3: 25, 4: 25, 5: 60}.items()
+}
+
+
+class StubHHHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов к заглушке API HH.ru."""
+
+    def do_GET(self):
+        time.sleep(STUB_DELAY)
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        if parsed.path == "/vacancies":
+            employer_id = int(query["employer_id"][0])
+            page = int(query["page"][0])
+            per_page = int(query["per_page"][0])
+            vacancies = STUB_VACANCIES[employer_id]
+            if "date_from" in query:
+                date_from = datetime.fromisoformat(query["date_from"][0])
+                vacancies = [v for v in vacancies if datetime.fromisoformat(v["published_at"]) >= date_from]
+            if "date_to" in query:
+                date_to = datetime.fromisoformat(query["date_to"][0])
+                vacancies = [v for v in vacancies if datetime.fromisoformat(v["published_at"]) <= date_to]
+            start = page * per_page
+            items = vacancies[start:start + per_page]
+            body = {"items": items, "found": len(vacancies), "pages": ceil(len(vacancies) / per_page), "page": page}
+        elif parsed.path.startswith("/employers/"):
+            employer_id = int(parsed.path.rsplit("/", 1)[1])
+            if employer_id not in STUB_EMPLOYERS:
+                self.send_response(404)
+                self.end_headers()
+                return
+            etag = f'"employer-{employer_id}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)  # Данные работодателя не изменились
+                self.end_headers()
+                return
+            body = {"id": str(employer_id), "name": STUB_EMPLOYERS[employer_id]}
+        elif parsed.path == "/dictionaries":
+            body = {"currency": [{"code": "RUR", "rate": 1}, {"code": "USD", "rate": 0.0125},
+                                 {"code": "EUR", "rate": 0.0115}]}
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        if parsed.path.startswith("/employers/"):
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass  # Не засоряем вывод тестов
+
+
+@pytest.fixture(scope="module")
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHHHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_employers_vacancies_concurrent(stub_server):
+    hh_api = HHApi(base_url=stub_server, max_workers=8)
+    hh_api.max_vacancies = 25
+    hh_api.per_page = 10  # По 3 страницы на работодателя
+
+    start = time.perf_counter()
+    result = hh_api.get_employers_vacancies(STUB_EMPLOYERS)
+    elapsed = time.perf_counter() - start
+
+    assert set(result) == set(STUB_EMPLOYERS)
+    for employer_id, vacancies in result.items():
+        assert [v["id"] for v in vacancies] == [str(employer_id * 1000 + i) for i in range(25)]
+    # Последовательно было бы 12 запросов, конкурентно — первая страница и остальные страницы
+    assert elapsed < STUB_DELAY * 6
+
+
+def test_get_employers_vacancies_respects_limit(stub_server):
+    hh_api = HHApi(base_url=stub_server, max_workers=2)
+    result = hh_api.get_employers_vacancies([1, 2])
+    assert all(len(vacancies) == hh_api.max_vacancies for vacancies in result.values())
+
+
+def test_get_employers_names_concurrent(stub_server):
+    hh_api = HHApi(base_url=stub_server, max_workers=8)
+    start = time.perf_counter()
+    names = hh_api.get_employers_names([1, 2, 3, 4, 999])
+    elapsed = time.perf_counter() - start
+
+    assert names == {1: "Employer 1", 2: "Employer 2", 3: "Employer 3", 4: "Employer 4", 999: None}
+    assert elapsed < STUB_DELAY * 3
+
+
+def test_shared_session_reused(stub_server):
+    session = create_session(pool_maxsize=4)
+    first = HHApi(base_url=stub_server, session=session)
+    second = HHApi(base_url=stub_server, session=session)
+    assert first.session is second.session
+
+    first.get_employer_name(1)
+    second.get_employer_name(2)
+    # Оба экземпляра ведут свою статистику, но используют общий пул соединений
+    assert first.get_stats()["requests"] == 1
+    assert second.get_stats()["requests"] == 1
+    session.close()
+
+
+def test_latency_stats(stub_server):
+    hh_api = HHApi(base_url=stub_server)
+    hh_api.get_employer_name(1)
+    hh_api.get_employer_name(999)  # 404 — запрос выполнен, но ответ с ошибкой
+
+    stats = hh_api.get_stats()
+    assert stats["requests"] == 2
+    assert stats["max_time"] >= STUB_DELAY
+    assert stats["avg_time"] == pytest.approx(stats["total_time"] / 2)
+
+    hh_api.reset_stats()
+    assert hh_api.get_stats()["requests"] == 0
+    hh_api.close()
+
+
+def test_request_error_counted(mocker, hh_api):
+    mocker.patch.object(hh_api.session, "get", side_effect=requests.exceptions.ConnectionError("down"))
+    assert hh_api.get_employer_name(1) is None
+    stats = hh_api.get_stats()
+    assert stats["errors"] == hh_api.max_retries + 1  # Первая попытка и все повторы
+    assert stats["retries"] == hh_api.max_retries
+
+
+def test_employer_name_cached(stub_server):
+    hh_api = HHApi(base_url=stub_server)
+    assert hh_api.get_employer_name(1) == "Employer 1"
+    assert hh_api.get_employer_name(1) == "Employer 1"
+    assert hh_api.get_stats()["requests"] == 1  # Второй раз имя взято из кэша
+
+
+def test_employer_name_not_cached_on_error(stub_server):
+    hh_api = HHApi(base_url=stub_server)
+    assert hh_api.get_employer_name(999) is None
+    assert hh_api.get_employer_name(999) is None
+    assert hh_api.get_stats()["requests"] == 2
+
+
+def test_preload_employer_names(stub_server):
+    hh_api = HHApi(base_url=stub_server)
+    hh_api.preload_employer_names({1: "Stored Employer", 2: None})
+    names = hh_api.get_employers_names([1, 2])
+    assert names == {1: "Stored Employer", 2: "Employer 2"}
+    assert hh_api.get_stats()["requests"] == 1
+
+
+def test_iter_employer_vacancies_streams_all_pages(stub_server):
+    hh_api = HHApi(base_url=stub_server)
+    hh_api.per_page = 10
+    vacancies = hh_api.iter_employer_vacancies(1)
+    assert next(vacancies)["id"] == "1000"  # Первая вакансия доступна сразу после первой страницы
+    assert hh_api.get_stats()["requests"] == 1
+    assert len(list(vacancies)) == 24
+    assert hh_api.get_stats()["requests"] == 3
+
+
+def test_iter_employer_vacancies_limit_and_ceiling(stub_server):
+    hh_api = HHApi(base_url=stub_server)
+    hh_api.per_page = 10
+    assert len(list(hh_api.iter_employer_vacancies(1, limit=12))) == 12
+    hh_api.max_results = 20  # Предел пагинации API
+    assert len(list(hh_api.iter_employer_vacancies(1))) == 20
+
+
+def test_iter_employers_vacancy_pages_unlimited(stub_server):
+    hh_api = HHApi(base_url=stub_server, max_workers=4)
+    hh_api.per_page = 10
+    pages = list(hh_api.iter_employers_vacancy_pages([1, 2]))
+    assert sorted((employer_id, page) for employer_id, page, _ in pages) == [(1, 0), (1, 1), (1, 2),
+                                                                           (2, 0), (2, 1), (2, 2)]
+    assert sum(len(items) for _, _, items in pages) == 50
+
+
+def test_iter_employers_vacancy_pages_reports_failed(mocker, hh_api):
+    def get_page(employer_id, page, per_page, filters=None):
+        if employer_id == 2:
+            raise requests.exceptions.ConnectionError("API Error")
+        return {"items": [{"id": "1"}], "pages": 1}
+
+    mocker.patch.object(hh_api, "_get_vacancies_page", side_effect=get_page)
+    failed = set()
+
+    pages = list(hh_api.iter_employers_vacancy_pages([1, 2], failed=failed))
+
+    assert [(employer_id, page) for employer_id, page, _ in pages] == [(1, 0)]
+    assert failed == {2}
+
+
+def test_get_employer_vacancy_count_and_ids(stub_server, mocker):
+    hh_api = HHApi(base_url=stub_server)
+    assert hh_api.get_employer_vacancy_count(1) == 25
+    assert hh_api.get_employer_vacancy_ids(1) == {1000 + i for i in range(25)}
+    hh_api.max_results = 10  # Полный список не помещается в предел пагинации и собирается по окнам дат
+    hh_api.per_page = 5
+    hh_api.partition_lookback = timedelta(hours=24)
+    mocker.patch("scr.api_function.datetime", wraps=datetime, now=lambda tz=None: STUB_NOW)
+    assert hh_api.get_employer_vacancy_ids(1) == {1000 + i for i in range(25)}
+    hh_api.min_partition_window = timedelta(days=365)  # Окно нельзя разбить: список неполон
+    assert hh_api.get_employer_vacancy_ids(1) is None
+
+
+def test_plan_vacancy_partitions_small_employer(stub_server):
+    hh_api = HHApi(base_url=stub_server)
+    assert hh_api.plan_vacancy_partitions(1) == [{}]  # Разбиение не требуется
+
+
+def test_plan_vacancy_partitions_splits_under_cap(stub_server, mocker):
+    hh_api = HHApi(base_url=stub_server)
+    hh_api.max_results = 20
+    hh_api.partition_lookback = timedelta(hours=24)
+    mocker.patch("scr.api_function.datetime", wraps=datetime, now=lambda tz=None: STUB_NOW)
+
+    partitions = hh_api.plan_vacancy_partitions(5)
+
+    assert len(partitions) > 1
+    assert all(hh_api._count_vacancies(5, filters) <= 20 for filters in partitions)
+
+
+def test_iter_partitioned_vacancy_pages_dedup(stub_server, mocker):
+    hh_api = HHApi(base_url=stub_server, max_workers=8)
+    hh_api.max_results = 20
+    hh_api.per_page = 10
+    hh_api.partition_lookback = timedelta(hours=24)
+    mocker.patch("scr.api_function.datetime", wraps=datetime, now=lambda tz=None: STUB_NOW)
+
+    pages = list(hh_api.iter_partitioned_vacancy_pages([1, 5]))
+
+    ids = [item["id"] for _, _, items in pages for item in items]
+    assert len(ids) == len(set(ids))  # Вакансии на границах окон не дублируются
+    # Оба работодателя превышают предел в 20 вакансий, но получены полностью
+    assert set(ids) == {v["id"] for v in STUB_VACANCIES[5]} | {v["id"] for v in STUB_VACANCIES[1]}
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    """Заглушка API, которая отвечает 429 на первые запросы и 503 на запросы к /employers/503."""
+    rejections_left = 0
+    requests_seen = 0
+
+    def do_GET(self):
+        FlakyHandler.requests_seen += 1
+        if self.path.startswith("/employers/503"):
+            self.send_response(503)
+            self.end_headers()
+            return
+        if FlakyHandler.rejections_left > 0:
+            FlakyHandler.rejections_left -= 1
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+        payload = json.dumps({"id": "1", "name": "Employer 1"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_server():
+    FlakyHandler.rejections_left = 0
+    FlakyHandler.requests_seen = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_retry_after_429(flaky_server):
+    FlakyHandler.rejections_left = 2
+    hh_api = HHApi(base_url=flaky_server, backoff_base=0.01)
+    assert hh_api.get_employer_name(1) == "Employer 1"
+    assert hh_api.get_stats()["retries"] == 2
+
+
+def test_retries_exhausted(flaky_server):
+    FlakyHandler.rejections_left = 10
+    hh_api = HHApi(base_url=flaky_server, max_retries=2, backoff_base=0.01)
+    assert hh_api.get_employer_name(1) is None
+    assert FlakyHandler.requests_seen == 3
+
+
+def test_circuit_breaker_opens(flaky_server):
+    hh_api = HHApi(base_url=flaky_server, max_retries=0, failure_threshold=3, reset_timeout=60)
+    for _ in range(3):
+        assert hh_api.get_employer_name(503) is None
+    assert FlakyHandler.requests_seen == 3
+
+    with pytest.raises(CircuitOpenError):
+        hh_api._get(f"{flaky_server}/employers/1")
+    assert FlakyHandler.requests_seen == 3  # Запрос не дошел до сервера
+
+
+def test_shared_rate_limiter(flaky_server):
+    limiter = RateLimiter(rate=20, capacity=1)
+    first = HHApi(base_url=flaky_server, rate_limiter=limiter)
+    second = HHApi(base_url=flaky_server, rate_limiter=limiter)
+    start = time.perf_counter()
+    first.get_employers_names(range(5))
+    second.get_employers_names(range(5, 10))
+    # 10 запросов при 20 запросах в секунду и ведре на 1 токен занимают не меньше 0.45 с
+    assert time.perf_counter() - start >= 0.4
+
+
+def test_conditional_get_served_from_cache(stub_server, tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    hh_api = HHApi(base_url=stub_server, cache=cache, employer_cache_size=0)
+    assert hh_api.get_employer_name(1) == "Employer 1"
+    assert hh_api.get_employer_name(1) == "Employer 1"  # Сервер ответил 304, тело взято из кэша
+    assert cache.stats["revalidated"] == 1
+    assert cache.stats["stored"] == 1
+
+
+def test_offline_replay(stub_server, tmp_path):
+    online = HHApi(base_url=stub_server, cache=HTTPCache(str(tmp_path)))
+    online.per_page = 10
+    expected = list(online.iter_employer_vacancies(1))
+
+    # В автономном режиме все ответы берутся из кэша
+    offline = HHApi(base_url=stub_server, cache=HTTPCache(str(tmp_path), offline=True))
+    offline.per_page = 10
+    offline.session.get = None  # Любое обращение к сети завершилось бы ошибкой
+    assert list(offline.iter_employer_vacancies(1)) == expected
+    assert offline.get_employer_name(2) is None  # Этого ответа в кэше нет
+
+
+def test_get_currency_rates(stub_server):
+    hh_api = HHApi(base_url=stub_server)
+    assert hh_api.get_currency_rates() == {"RUR": 1.0, "USD": 0.0125, "EUR": 0.0115}
+
+
+def test_get_currency_rates_failure(mocker, hh_api):
+    mocker.patch.object(hh_api.session, "get", side_effect=requests.exceptions.RequestException("API Error"))
+    assert hh_api.get_currency_rates() == {}
+
+
+def test_http_metrics(stub_server):
+    metrics = MetricsRegistry()
+    hh_api = HHApi(base_url=stub_server, metrics=metrics)
+    hh_api.get_employer_name(1)
+    hh_api.get_employer_name(404)
+
+    assert metrics.get("hh_http_requests_total", endpoint="/employers", status=200) == 1
+    assert metrics.get("hh_http_requests_total", endpoint="/employers", status=404) == 1
+    assert metrics.get("hh_http_response_bytes_total", endpoint="/employers") > 0
+    assert metrics.get_histogram("hh_http_request_seconds", endpoint="/employers")["count"] == 2
+
+
+def test_retry_metrics(flaky_server):
+    metrics = MetricsRegistry()
+    hh_api = HHApi(base_url=flaky_server, backoff_base=0, metrics=metrics)
+    FlakyHandler.rejections_left = 2
+    hh_api._get(f"{flaky_server}/employers/1")
+    assert metrics.get("hh_http_retries_total", endpoint="/employers") == 2
+    assert metrics.get("hh_http_requests_total", endpoint="/employers", status=429) == 2
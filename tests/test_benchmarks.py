@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+
+import pytest
+import requests
+
+from benchmarks.fake_server import FakeHHServer
+from benchmarks.run import bench_fetch
+from benchmarks.synthetic import SyntheticData, MAX_VACANCY_ID
+from scr.api_function import HHApi
+
+NOW = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+
+def test_synthetic_data_is_deterministic():
+    data = SyntheticData(employers=2, vacancies_per_employer=100, seed=1, now=NOW)
+    assert data.vacancy(1, 5) == SyntheticData(2, 100, seed=1, now=NOW).vacancy(1, 5)
+    assert data.vacancy(1, 5)["id"] != data.vacancy(2, 5)["id"]
+    assert data.employer(3) is None
+
+
+def test_synthetic_index_range_matches_dates():
+    data = SyntheticData(employers=1, vacancies_per_employer=1000, now=NOW)
+    start, stop = data.index_range(data.published_at(700), data.published_at(200))
+    assert (start, stop) == (200, 701)
+    published = [datetime.fromisoformat(v["published_at"]) for v in data.vacancies(1, start, stop)]
+    assert all(data.published_at(700) <= date <= data.published_at(200) for date in published)
+
+
+def test_fetch_beyond_search_limit():
+    """Все вакансии работодателя получаются, хотя сервер, как и API, отдает не больше 2000 на поиск."""
+    data = SyntheticData(employers=2, vacancies_per_employer=2500)
+    with FakeHHServer(data) as server:
+        result = bench_fetch(data, server, max_workers=4)
+    assert result["rows"] == data.total_vacancies
+
+
+def test_vacancy_ids_beyond_search_limit():
+    """Список ID вакансий работодателя полон, хотя их больше, чем отдает один поиск: иначе живые вакансии
+    были бы помечены архивными."""
+    data = SyntheticData(employers=1, vacancies_per_employer=3000)
+    with FakeHHServer(data) as server:
+        hh_api = HHApi(base_url=server.url)
+        vacancy_ids = hh_api.get_employer_vacancy_ids(1)
+        hh_api.close()
+    assert vacancy_ids == {int(data.vacancy(1, index)["id"]) for index in range(3000)}
+
+
+def test_synthetic_ids_fit_integer_column():
+    data = SyntheticData(employers=5000, vacancies_per_employer=2000, now=NOW)
+    ids = {int(data.vacancy(employer_id, index)["id"]) for employer_id in (1, 5000) for index in (0, 1999)}
+    assert ids == {1, 2000, 4999 * 2000 + 1, 5000 * 2000}
+    with pytest.raises(ValueError):
+        SyntheticData(employers=MAX_VACANCY_ID, vacancies_per_employer=2)
+
+
+def test_fake_server_rejects_search_without_employer():
+    data = SyntheticData(employers=1, vacancies_per_employer=10, now=NOW)
+    with FakeHHServer(data) as server:
+        assert requests.get(f"{server.url}/vacancies", timeout=5).status_code == 400
@@ -0,0 +1,32 @@
+import time
+
+from scr.cache import TTLCache
+
+
+def test_cache_get_set():
+    cache = TTLCache(maxsize=10)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("b", "default") == "default"
+    assert cache.stats() == {"hits": 1, "misses": 2, "size": 1}
+
+
+def test_cache_lru_eviction():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "a" становится самой свежей записью
+    cache.set("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert len(cache) == 2
+
+
+def test_cache_ttl_expiration():
+    cache = TTLCache(maxsize=10, ttl=0.05)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert len(cache) == 0
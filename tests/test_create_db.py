@@ -89,4 +89,40 @@ def test_create_tables_success(db_creator):
         conn.close()
         assert True #Если дошли до сюда, таблицы есть
     except psycopg2.Error as e:
-        pytest.fail(f"Ошибка при проверке создания таблиц: {e}")
\ No newline at end of file
+        pytest.fail(f"Ошибка при проверке создания таблиц: {e}")
+
+def test_create_indexes_success(db_creator):
+    """Проверяет, что индексы и столбец полнотекстового поиска создаются."""
+    db_creator.create_indexes()
+    test_params = TEST_DB_PARAMS.copy()
+    test_params['dbname'] = TEST_DB_NAME
+    conn = psycopg2.connect(**test_params)
+    cur = conn.cursor()
+    cur.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'vacancies'")
+    indexes = {row[0] for row in cur.fetchall()}
+    cur.close()
+    conn.close()
+    assert {'vacancies_name_trgm_idx', 'vacancies_employer_id_idx', 'vacancies_salary_from_idx',
+            'vacancies_search_vector_idx'} <= indexes
+
+def test_create_partitioned_tables_migrates_data(db_creator):
+    """Проверяет перевод существующей таблицы vacancies на секционирование с сохранением данных."""
+    test_params = TEST_DB_PARAMS.copy()
+    test_params['dbname'] = TEST_DB_NAME
+    conn = psycopg2.connect(**test_params)
+    cur = conn.cursor()
+    cur.execute("INSERT INTO employers (employer_id, employer_name) VALUES (1, 'Company') ON CONFLICT DO NOTHING")
+    cur.execute("INSERT INTO vacancies (vacancy_id, employer_id, vacancy_name, published_at) "
+                "VALUES (1, 1, 'Old', '2024-01-15T10:00:00+00:00'), (2, 1, 'New', NOW())")
+    conn.commit()
+
+    DatabaseCreator(TEST_DB_NAME, TEST_DB_PARAMS, partitioned=True).create_tables()
+
+    cur.execute("SELECT relkind FROM pg_class WHERE relname = 'vacancies'")
+    assert cur.fetchone()[0] == 'p'
+    cur.execute("SELECT tableoid::regclass::text, vacancy_name FROM vacancies ORDER BY vacancy_id")
+    rows = cur.fetchall()
+    assert rows[0] == ('vacancies_p2024_01', 'Old')
+    assert rows[1][1] == 'New'
+    cur.close()
+    conn.close()
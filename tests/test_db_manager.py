@@ -0,0 +1,254 @@
+import pytest
+import psycopg2
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from scr.db_manager import DBManager, VacancyRow
+from scr.sql_queries import (create_employers_table, create_vacancies_table, create_indexes, create_search_vector,
+                             create_statistics_views, create_meta_table)
+
+load_dotenv()
+
+# Параметры для тестовой базы данных (замените на свои)
+TEST_DB_NAME = 'test_db_manager_test_db'
+TEST_DB_PARAMS = {
+    'host': '127.0.0.1',
+    'port': '5432',
+    'user': 'postgres',
+    'password': os.getenv('POSTGRES_PASSWORD')  # Пароль из .env
+}
+
+# Sample data for testing
+SAMPLE_EMPLOYERS = [
+    ("Employer A",),
+]
+
+SAMPLE_VACANCIES = [
+    (1, "Vacancy 1 for A", 1000, 2000, "USD", "http://example.com/a1", 100000, 200000, 150000),
+]
+
+@pytest.fixture(scope="module")
+def db_manager():
+    """Фикстура для создания экземпляра DBManager."""
+    test_params = TEST_DB_PARAMS.copy()
+    test_params['dbname'] = TEST_DB_NAME
+    manager = DBManager(TEST_DB_NAME, test_params)
+    return manager
+
+@pytest.fixture(scope="module", autouse=True)
+def setup_teardown_db(db_manager):
+    """Фикстура для создания и удаления тестовой базы данных и таблиц."""
+    conn = None
+    try:
+        # Connect to postgres to drop/create database
+        test_params_no_db = TEST_DB_PARAMS.copy()
+        test_params_no_db['dbname'] = 'postgres'
+        conn = psycopg2.connect(**test_params_no_db)
+        conn.autocommit = True
+        cur = conn.cursor()
+
+        # Drop test database if it exists
+        cur.execute(f"DROP DATABASE IF EXISTS {TEST_DB_NAME}")
+
+        # Create test database
+        cur.execute(f"CREATE DATABASE {TEST_DB_NAME}")
+        cur.close()
+        conn.close()
+
+        # Connect to the new database
+        test_params = TEST_DB_PARAMS.copy()
+        test_params['dbname'] = TEST_DB_NAME
+        conn = psycopg2.connect(**test_params)
+        conn.autocommit = True
+        cur = conn.cursor()
+
+        # Create employers and vacancies tables
+        cur.execute(create_employers_table())
+        cur.execute(create_vacancies_table())
+        cur.execute(create_indexes())
+        cur.execute(create_search_vector())
+
+        # Insert sample data
+        for employer in SAMPLE_EMPLOYERS:
+            cur.execute("INSERT INTO employers (employer_name) VALUES (%s)", employer)
+        for vacancy in SAMPLE_VACANCIES:
+            cur.execute("INSERT INTO vacancies (employer_id, vacancy_name, salary_from, salary_to, currency, vacancy_url, "
+                        "salary_from_rub, salary_to_rub, salary_mid_rub) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                        vacancy)
+        cur.execute(create_statistics_views())
+        cur.execute(create_meta_table())
+
+        conn.commit()
+        cur.close()
+        conn.close()
+
+    except psycopg2.Error as e:
+        pytest.fail(f"Error setting up test database: {e}")
+
+    yield
+
+    try:
+        # Connect to postgres to drop the database
+        test_params_no_db = TEST_DB_PARAMS.copy()
+        test_params_no_db['dbname'] = 'postgres'
+        conn = psycopg2.connect(**test_params_no_db)
+        conn.autocommit = True
+        cur = conn.cursor()
+        cur.execute(f"DROP DATABASE {TEST_DB_NAME}")
+        cur.close()
+        conn.close()
+
+    except psycopg2.Error as e:
+        pytest.fail(f"Error tearing down test database: {e}")
+
+def test_get_companies_and_vacancies_count(db_manager):
+    """Проверяет, что метод get_companies_and_vacancies_count возвращает правильные результаты."""
+    result = db_manager.get_companies_and_vacancies_count()
+    assert isinstance(result, list)
+    assert len(result) == 1  # One company
+
+def test_connections_reused(db_manager):
+    """Проверяет, что повторные запросы используют одно соединение из пула."""
+    db_manager.get_avg_salary()
+    first_conn = db_manager._pool._pool[0]
+    db_manager.get_avg_salary()
+    assert db_manager._pool._pool == [first_conn]
+
+
+def test_concurrent_queries(db_manager):
+    """Проверяет, что одновременные запросы из нескольких потоков не превышают размер пула."""
+    with ThreadPoolExecutor(max_workers=db_manager.maxconn * 2) as executor:
+        results = list(executor.map(lambda _: db_manager.get_companies_and_vacancies_count(), range(50)))
+    assert all(len(result) == 1 for result in results)
+    assert len(db_manager._pool._pool) <= db_manager.maxconn
+
+
+def test_context_manager_closes_pool():
+    """Проверяет, что при выходе из блока with пул закрывается."""
+    with DBManager(TEST_DB_NAME, TEST_DB_PARAMS) as manager:
+        assert manager.get_avg_salary() is not None
+    assert manager._pool is None
+
+
+def test_iter_all_vacancies(db_manager):
+    """Проверяет, что потоковый метод возвращает те же вакансии, что и get_all_vacancies."""
+    vacancies = db_manager.iter_all_vacancies(itersize=1)
+    assert not isinstance(vacancies, list)
+    assert list(vacancies) == db_manager.get_all_vacancies()
+
+
+def test_iter_vacancies_with_keyword(db_manager):
+    """Проверяет потоковый поиск вакансий по ключевому слову."""
+    assert [v['vacancy_name'] for v in db_manager.iter_vacancies_with_keyword("vacancy")] == ["Vacancy 1 for A"]
+    assert list(db_manager.iter_vacancies_with_keyword("missing")) == []
+
+
+def test_iter_partially_consumed_releases_connection(db_manager):
+    """Проверяет, что незавершенный итератор после закрытия возвращает соединение в пул."""
+    vacancies = db_manager.iter_all_vacancies()
+    next(vacancies)
+    vacancies.close()
+    assert db_manager.get_avg_salary() is not None
+
+
+def test_compact_rows(db_manager):
+    """Проверяет, что компактные строки содержат те же данные, что и словари."""
+    rows = db_manager.get_all_vacancies(compact=True)
+    assert all(isinstance(row, VacancyRow) for row in rows)
+    assert [row._asdict() for row in rows] == db_manager.get_all_vacancies()
+    assert rows[0].vacancy_name == "Vacancy 1 for A"
+    assert list(db_manager.iter_all_vacancies(compact=True)) == rows
+
+
+def test_search_vacancies_trigram(db_manager):
+    """Проверяет поиск по нескольким словам в названии."""
+    assert [v['vacancy_name'] for v in db_manager.search_vacancies("vacancy for", mode='trigram')] == ["Vacancy 1 for A"]
+    assert db_manager.search_vacancies("vacancy python", mode='trigram') == []
+    assert db_manager.search_vacancies("100%", mode='trigram') == []  # Спецсимволы LIKE ищутся буквально
+
+
+def test_search_vacancies_fulltext(db_manager):
+    """Проверяет полнотекстовый поиск с ранжированием."""
+    result = db_manager.search_vacancies("vacancy", mode='fulltext', compact=True)
+    assert [row.vacancy_name for row in result] == ["Vacancy 1 for A"]
+
+
+def test_search_vacancies_unknown_mode(db_manager):
+    """Проверяет, что неизвестный режим поиска приводит к ошибке."""
+    with pytest.raises(ValueError):
+        db_manager.search_vacancies("vacancy", mode='regex')
+
+
+def test_statistics_views(db_manager):
+    """Проверяет, что статистика читается из материализованных представлений."""
+    assert db_manager.get_companies_and_vacancies_count() == [{'employer_name': "Employer A", 'vacancies_count': 1}]
+    assert db_manager.get_avg_salary() == 150000  # Средняя считается по середине вилки в рублях
+    assert db_manager.get_vacancies_with_higher_salary() == []
+
+
+def test_query_cache_invalidated_by_data_version(db_manager):
+    """Проверяет, что результаты кэшируются до увеличения версии данных."""
+    db_manager.version_check_interval = 0
+    db_manager.get_avg_salary()
+    hits = db_manager.cache_stats()['hits']
+    db_manager.get_avg_salary()
+    assert db_manager.cache_stats()['hits'] == hits + 1
+
+    test_params = TEST_DB_PARAMS.copy()
+    test_params['dbname'] = TEST_DB_NAME
+    with psycopg2.connect(**test_params) as conn, conn.cursor() as cur:
+        cur.execute("UPDATE meta SET value = value + 1 WHERE key = 'data_version'")
+    conn.close()
+
+    db_manager.get_avg_salary()
+    stats = db_manager.cache_stats()
+    assert stats['invalidations'] >= 1
+    assert stats['hits'] == hits + 1  # После смены версии запрос выполнен заново
+
+
+def test_vacancy_pages(db_manager):
+    """Проверяет постраничный вывод по ключу: страница, курсор следующей страницы и продолжение после ключа."""
+    page = db_manager.get_vacancies_page(page_size=1, compact=True)
+    assert [row.vacancy_name for row in page.items] == ["Vacancy 1 for A"]
+    assert page.next_cursor is None  # Других вакансий нет
+
+    employer_id, vacancy_id = 1, 1
+    assert db_manager.get_vacancies_page(after=(employer_id, vacancy_id)).items == []
+    assert db_manager.get_vacancies_page(after=(employer_id, vacancy_id - 1)).items == db_manager.get_all_vacancies()
+    assert db_manager.get_vacancies_with_keyword_page("Vacancy").items == db_manager.get_all_vacancies()
+    # Зарплата единственной вакансии равна средней, поэтому выше средней вакансий нет
+    assert db_manager.get_vacancies_with_higher_salary_page().items == []
+
+
+def test_query_cache_returns_copies(db_manager):
+    """Изменение результата на стороне вызывающего кода не попадает в кэш."""
+    companies = db_manager.get_companies_and_vacancies_count()
+    companies[0]['vacancies_count'] = 100
+    companies.clear()
+    assert db_manager.get_companies_and_vacancies_count() == [{'employer_name': "Employer A", 'vacancies_count': 1}]
+
+
+def test_full_listings_not_cached(db_manager):
+    """Полные списки вакансий не хранятся в кэше: он не должен держать копии всей таблицы."""
+    size = db_manager.cache_stats()['size']
+    db_manager.get_all_vacancies()
+    db_manager.get_vacancies_with_keyword("Vacancy")
+    assert db_manager.cache_stats()['size'] == size
+
+
+def test_queries_work_without_meta_table(db_manager):
+    """Без таблицы meta версия данных неизвестна: запросы выполняются без кэша, а не возвращают пустой результат."""
+    test_params = TEST_DB_PARAMS.copy()
+    test_params['dbname'] = TEST_DB_NAME
+    with psycopg2.connect(**test_params) as conn, conn.cursor() as cur:
+        cur.execute("ALTER TABLE meta RENAME TO meta_backup")
+    conn.close()
+    try:
+        with DBManager(TEST_DB_NAME, test_params) as manager:
+            assert manager.get_avg_salary() == 150000
+            assert manager.get_avg_salary() == 150000
+            assert manager.cache_stats()['hits'] == 0
+    finally:
+        with psycopg2.connect(**test_params) as conn, conn.cursor() as cur:
+            cur.execute("ALTER TABLE meta_backup RENAME TO meta")
+        conn.close()
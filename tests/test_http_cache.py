@@ -0,0 +1,44 @@
+import os
+import time
+
+from scr.http_cache import HTTPCache
+
+
+def make_entry(body: str) -> dict:
+    return {"url": "https://api.hh.ru/vacancies", "etag": '"v1"', "last_modified": None, "body": body}
+
+
+def test_cache_roundtrip(tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    key = HTTPCache.make_key("https://api.hh.ru/vacancies", {"page": 0, "employer_id": 80})
+    assert key == HTTPCache.make_key("https://api.hh.ru/vacancies", {"employer_id": 80, "page": 0})
+    assert cache.get(key) is None
+
+    cache.set(key, make_entry('{"items": []}'))
+    entry = cache.get(key)
+    assert entry["etag"] == '"v1"'
+    response = HTTPCache.to_response(entry)
+    assert response.status_code == 200
+    assert response.json() == {"items": []}
+
+
+def test_cache_size_restored_on_restart(tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    cache.set("a", make_entry("x" * 100))
+    assert HTTPCache(str(tmp_path)).size == cache.size > 100
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = HTTPCache(str(tmp_path), max_bytes=800)
+    for key in ("a", "b", "c"):
+        cache.set(key, make_entry("x" * 150))
+        time.sleep(0.01)
+    cache.get("a")  # "a" использована последней и не должна быть вытеснена
+    cache.set("d", make_entry("x" * 150))
+
+    assert cache.size <= 800
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("d") is not None
+    assert cache.stats["evicted"] >= 1
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
@@ -0,0 +1,135 @@
+from scr.loader import (parse_vacancy, bulk_upsert_employers, bulk_upsert_vacancies, load_vacancy_pages,
+                        load_currency_rates, backfill_salary_rub)
+
+SAMPLE_VACANCY = {
+    "id": "101",
+    "name": "Python developer",
+    "salary": {"from": 100000, "to": 150000, "currency": "RUR"},
+    "alternate_url": "https://hh.ru/vacancy/101",
+    "snippet": {"requirement": "Опыт работы с Python"},
+    "published_at": "2025-02-01T10:00:00+0300",
+}
+
+
+def test_parse_vacancy():
+    row = parse_vacancy(SAMPLE_VACANCY, 80)
+    assert row[:-1] == (101, 80, "Python developer", 100000, 150000, "RUR",
+                        "https://hh.ru/vacancy/101", "Опыт работы с Python", "2025-02-01T10:00:00+0300",
+                        100000, 150000, 125000)
+    assert len(row[-1]) == 32
+
+
+def test_parse_vacancy_hash_tracks_changes():
+    same = parse_vacancy(dict(SAMPLE_VACANCY), 80)
+    changed = parse_vacancy(dict(SAMPLE_VACANCY, salary={"from": 120000, "to": 150000, "currency": "RUR"}), 80)
+    assert parse_vacancy(SAMPLE_VACANCY, 80)[-1] == same[-1]
+    assert changed[-1] != same[-1]
+
+
+def test_parse_vacancy_normalizes_salary():
+    rates = {"RUR": 1, "USD": 0.01}
+    usd = dict(SAMPLE_VACANCY, salary={"from": 1000, "to": None, "currency": "USD"})
+    assert parse_vacancy(usd, 80, rates)[9:12] == (100000, None, 100000)
+    # Без курса валюты зарплата в рублях неизвестна
+    assert parse_vacancy(usd, 80)[9:12] == (None, None, None)
+
+
+def test_parse_vacancy_without_salary():
+    row = parse_vacancy({"id": "7", "name": "Tester", "salary": None, "snippet": None}, 1)
+    assert row[3:6] == (None, None, None)
+    assert row[7] is None
+
+
+def test_bulk_upsert_vacancies_counts(mocker):
+    # execute_values возвращает флаг вставки только для вставленных и обновленных строк
+    execute_values = mocker.patch("scr.loader.execute_values", return_value=[(True,), (False,)])
+    rows = [(1, 80, "A"), (2, 80, "B"), (3, 80, "C"), (1, 80, "A")]
+
+    stats = bulk_upsert_vacancies(mocker.MagicMock(), rows)
+
+    assert stats == {"inserted": 1, "updated": 1, "skipped": 2}
+    sent_rows = execute_values.call_args.args[2]
+    assert [row[0] for row in sent_rows] == [1, 2, 3]  # Повтор внутри пачки отброшен
+
+
+def test_bulk_upsert_vacancies_empty(mocker):
+    execute_values = mocker.patch("scr.loader.execute_values")
+    assert bulk_upsert_vacancies(mocker.MagicMock(), []) == {"inserted": 0, "updated": 0, "skipped": 0}
+    execute_values.assert_not_called()
+
+
+def test_bulk_upsert_vacancies_partitioned(mocker):
+    execute_values = mocker.patch("scr.loader.execute_values", return_value=[(True,)])
+    row = parse_vacancy(SAMPLE_VACANCY, 80)
+
+    cur = mocker.MagicMock()
+    cur.fetchall.return_value = [("vacancies_default",)]
+
+    bulk_upsert_vacancies(cur, [row], partitioned=True)
+
+    # Секция месяца публикации создается до записи, чтобы вакансия не попала в секцию по умолчанию
+    assert "CREATE TABLE IF NOT EXISTS vacancies_p2025_02 PARTITION OF vacancies" in cur.execute.call_args.args[0]
+    delete_call, upsert_call = execute_values.call_args_list
+    # Повторно опубликованная вакансия удаляется из секции прежнего месяца перед вставкой
+    assert "DELETE FROM vacancies" in delete_call.args[1]
+    assert delete_call.args[2] == [(row[0], row[8])]
+    assert "ON CONFLICT (vacancy_id, published_at)" in upsert_call.args[1]
+
+
+def test_bulk_upsert_employers(mocker):
+    execute_values = mocker.patch("scr.loader.execute_values", return_value=[(True,)])
+    stats = bulk_upsert_employers(mocker.MagicMock(), [(80, "Альфа-Банк"), (1740, "Яндекс")])
+    assert stats == {"inserted": 1, "updated": 0, "skipped": 1}
+    assert "ON CONFLICT (employer_id)" in execute_values.call_args.args[1]
+
+
+def test_load_vacancy_pages_in_batches(mocker):
+    execute_values = mocker.patch("scr.loader.execute_values",
+                                  side_effect=lambda cur, query, rows, **kwargs: [(True,)] * len(rows))
+    pages = ((80, page, [dict(SAMPLE_VACANCY, id=str(page * 10 + i)) for i in range(3)]) for page in range(5))
+
+    stats = load_vacancy_pages(mocker.MagicMock(), pages, batch_size=4)
+
+    assert stats == {"inserted": 15, "updated": 0, "skipped": 0}
+    batch_sizes = [len(call.args[2]) for call in execute_values.call_args_list]
+    assert batch_sizes == [6, 6, 3]  # Пачка записывается, как только набирается batch_size строк
+
+
+def test_load_currency_rates_uses_fresh_db_rates(mocker):
+    cur = mocker.MagicMock()
+    cur.fetchall.return_value = [("USD", 0.0125, True)]
+    hh_api = mocker.MagicMock()
+
+    assert load_currency_rates(cur, hh_api) == {"USD": 0.0125}
+    hh_api.get_currency_rates.assert_not_called()
+
+
+def test_load_currency_rates_refreshes_stale_rates(mocker):
+    execute_values = mocker.patch("scr.loader.execute_values")
+    cur = mocker.MagicMock()
+    cur.fetchall.return_value = []
+    hh_api = mocker.MagicMock()
+    hh_api.get_currency_rates.return_value = {"RUR": 1.0, "USD": 0.0125}
+
+    assert load_currency_rates(cur, hh_api) == {"RUR": 1.0, "USD": 0.0125}
+    assert execute_values.call_args.args[2] == [("RUR", 1.0), ("USD", 0.0125)]
+
+
+def test_load_currency_rates_falls_back_to_stale_rates(mocker):
+    execute_values = mocker.patch("scr.loader.execute_values")
+    cur = mocker.MagicMock()
+    cur.fetchall.return_value = [("USD", 0.0125, False)]
+    hh_api = mocker.MagicMock()
+    hh_api.get_currency_rates.return_value = {}  # Справочник недоступен
+
+    assert load_currency_rates(cur, hh_api) == {"USD": 0.0125}
+    execute_values.assert_not_called()
+
+
+def test_backfill_salary_rub_runs_every_load(mocker):
+    """Пересчет не отмечается выполненным: вакансии в валюте, курс которой появился позже, тоже заполняются."""
+    cur = mocker.MagicMock(rowcount=7)
+    assert backfill_salary_rub(cur) == 7
+    query = cur.execute.call_args.args[0]
+    assert "UPDATE vacancies" in query and "salary_mid_rub IS NULL" in query
+    assert "meta" not in query
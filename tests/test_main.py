@@ -2,11 +2,14 @@ import pytest
 import psycopg2
 from dotenv import load_dotenv
 import os
+import subprocess
+import sys
 
 # Импортируем классы и функции из вашего основного скрипта
 from scr.api_function import HHApi
 from scr.create_db import DatabaseCreator
 from scr.db_manager import DBManager
+import main
 
 # Загружаем переменные окружения
 load_dotenv()
@@ -51,7 +54,8 @@ def test_database_creation(db_creator):
     cur = conn.cursor()
     cur.execute("SELECT table_name FROM information_schema.tables WHERE table_schema = 'public'")
     tables = cur.fetchall()
-    assert len(tables) == 2, "Должны быть созданы две таблицы: employers и vacancies"
+    assert len(tables) == 6, ("Должны быть созданы шесть таблиц: employers, vacancies, sync_state, meta, currency_rates "
+                              "и ingest_queue")
     conn.close()
 
 def test_db_manager_methods(db_manager):
@@ -70,4 +74,62 @@ def test_db_manager_methods(db_manager):
 
     # Проверка метода get_vacancies_with_keyword
     keyword_vacancies = db_manager.get_vacancies_with_keyword("Python")
-    assert isinstance(keyword_vacancies, list), "Метод get_vacancies_with_keyword должен возвращать список"
\ No newline at end of file
+    assert isinstance(keyword_vacancies, list), "Метод get_vacancies_with_keyword должен возвращать список"
+
+def test_import_main_has_no_side_effects():
+    """Импорт main.py не загружает модули для работы с API и базой данных."""
+    code = "import sys, main; print(any(name in sys.modules for name in ('requests', 'psycopg2', 'scr.create_db')))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert result.stdout.strip() == "False"
+
+def test_query_command_skips_api_and_ddl(mocker):
+    """Команда query только читает данные: таблицы не создаются, API не вызывается."""
+    mocker.patch("main.get_db_params", return_value={})
+    db_manager_class = mocker.patch("scr.db_manager.DBManager")
+    db_creator_class = mocker.patch("scr.create_db.DatabaseCreator")
+    hh_api_class = mocker.patch("scr.api_function.HHApi")
+
+    main.main(["query", "--keyword", "Python", "--limit", "5"])
+
+    db_manager = db_manager_class.return_value.__enter__.return_value
+    db_manager.search_vacancies.assert_called_once_with("Python", mode='trigram', limit=5, compact=True)
+    db_creator_class.assert_not_called()
+    hh_api_class.assert_not_called()
+
+def test_ingest_command_runs_ingest(mocker):
+    """Команда ingest создает таблицы и загружает данные."""
+    mocker.patch("main.get_db_params", return_value={"password": "secret"})
+    run_ingest = mocker.patch("main.run_ingest")
+
+    main.main(["ingest"])
+
+    run_ingest.assert_called_once_with({"password": "secret"}, False, None, None, None)
+
+def test_ingest_command_max_vacancies(mocker):
+    """По умолчанию загружаются все вакансии; --max-vacancies ограничивает их количество."""
+    mocker.patch("main.get_db_params", return_value={"password": "secret"})
+    run_ingest = mocker.patch("main.run_ingest")
+
+    main.main(["ingest", "--max-vacancies", "100"])
+
+    assert run_ingest.call_args.args[4] == 100
+    assert main.create_hh_api().max_vacancies is None
+    assert main.create_hh_api(max_vacancies=100).max_vacancies == 100
+
+def test_keyword_menu_pages_results(mocker):
+    """Поиск по ключевому слову в меню выводит все найденные вакансии постранично, а не первые 100."""
+    mocker.patch("builtins.input", side_effect=["5", "Python", "", "0"])
+    db_manager = mocker.MagicMock()
+    db_manager.get_vacancies_with_keyword_page.side_effect = [
+        mocker.MagicMock(items=[], next_cursor=(1, 10)),
+        mocker.MagicMock(items=[], next_cursor=None),
+    ]
+
+    main.user_interaction(db_manager)
+
+    assert db_manager.get_vacancies_with_keyword_page.call_args_list == [
+        mocker.call("Python", None, main.PAGE_SIZE, compact=True),
+        mocker.call("Python", (1, 10), main.PAGE_SIZE, compact=True),
+    ]
+    db_manager.search_vacancies.assert_not_called()
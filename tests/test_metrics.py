@@ -0,0 +1,124 @@
+import json
+import time
+from contextlib import contextmanager
+
+from scr.db_manager import DBManager
+from scr.metrics import MetricsRegistry, SlowQueryLog
+from scr.sql_queries import get_all_vacancies
+
+
+def test_counters_and_gauges():
+    metrics = MetricsRegistry()
+    metrics.inc("requests_total", endpoint="/vacancies")
+    metrics.inc("requests_total", 2, endpoint="/vacancies")
+    metrics.set("throughput", 12.5, stage="parse")
+    assert metrics.get("requests_total", endpoint="/vacancies") == 3
+    assert metrics.get("requests_total", endpoint="/employers") == 0
+    assert metrics.get("throughput", stage="parse") == 12.5
+
+
+def test_histogram_prometheus_export():
+    metrics = MetricsRegistry(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        metrics.observe("latency_seconds", value, endpoint="/vacancies")
+
+    text = metrics.to_prometheus()
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{endpoint="/vacancies",le="0.1"} 2' in text  # Граница входит в интервал
+    assert 'latency_seconds_bucket{endpoint="/vacancies",le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{endpoint="/vacancies",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{endpoint="/vacancies"} 4' in text
+    assert metrics.get_histogram("latency_seconds", endpoint="/vacancies") == {"count": 4, "sum": 3.65}
+
+
+def test_json_export_and_write(tmp_path):
+    metrics = MetricsRegistry()
+    metrics.inc("rows_total", 5, result="inserted")
+    with metrics.time("step_seconds", step="fill"):
+        pass
+
+    path = tmp_path / "metrics.json"
+    metrics.write(str(path))
+    data = json.loads(path.read_text(encoding="utf-8"))
+
+    assert data["counters"]["rows_total"] == [{"labels": {"result": "inserted"}, "value": 5}]
+    assert data["histograms"]["step_seconds"][0]["count"] == 1
+
+
+def test_label_values_escaped():
+    metrics = MetricsRegistry()
+    metrics.inc("queries_total", query='say "hi"\n')
+    assert 'queries_total{query="say \\"hi\\"\\n"} 1' in metrics.to_prometheus()
+
+
+def test_slow_query_log_file(tmp_path):
+    path = tmp_path / "slow.jsonl"
+    log = SlowQueryLog(threshold=0.1, path=str(path), maxlen=1)
+    log.record("first", "SELECT 1", None, 0.2)
+    log.record("second", "SELECT\n    2", (1,), 0.3, plan=[{"Plan": {}}])
+
+    assert [entry["query"] for entry in log.entries()] == ["second"]  # В памяти только последние maxlen
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [line["sql"] for line in lines] == ["SELECT 1", "SELECT 2"]
+
+
+def test_db_manager_traces_queries(mocker):
+    metrics = MetricsRegistry()
+    slow_query_log = SlowQueryLog(threshold=0)
+    db_manager = DBManager("test", {}, metrics=metrics, slow_query_log=slow_query_log)
+    cur = mocker.MagicMock(rowcount=3)
+    explain_cur = cur.connection.cursor.return_value.__enter__.return_value
+    explain_cur.fetchone.return_value = ([{"Plan": {"Node Type": "Seq Scan"}}],)
+
+    db_manager._execute(cur, get_all_vacancies(), None)
+
+    assert metrics.get("db_query_rows_total", query="get_all_vacancies") == 3
+    assert metrics.get_histogram("db_query_seconds", query="get_all_vacancies")["count"] == 1
+    assert explain_cur.execute.call_args.args[0].startswith("EXPLAIN (FORMAT JSON)")
+    assert slow_query_log.entries()[0]["plan"] == [{"Plan": {"Node Type": "Seq Scan"}}]
+
+
+
+def test_iter_vacancies_times_server_fetches(mocker):
+    metrics = MetricsRegistry()
+    slow_query_log = SlowQueryLog(threshold=0.05, explain=False)
+    db_manager = DBManager("test", {}, metrics=metrics, slow_query_log=slow_query_log)
+    row = ("Employer A", "Vacancy 1", 1000, 2000, "USD", "http://example.com/1")
+
+    def fetch_rows():
+        time.sleep(0.05)  # Запрос выполняется при получении первой порции строк, а не в DECLARE
+        yield row
+        yield row
+
+    cur = mocker.MagicMock()
+    cur.__iter__.side_effect = fetch_rows
+
+    @contextmanager
+    def cursor(name=None):
+        yield cur
+
+    mocker.patch.object(db_manager, "_cursor", cursor)
+    for _ in db_manager.iter_all_vacancies():
+        time.sleep(0.1)  # Время обработки строк вызывающим кодом не учитывается
+
+    histogram = metrics.get_histogram("db_query_seconds", query="get_all_vacancies")
+    assert histogram["count"] == 1
+    assert 0.05 <= histogram["sum"] < 0.15
+    assert metrics.get("db_query_rows_total", query="get_all_vacancies") == 2
+    assert [entry["query"] for entry in slow_query_log.entries()] == ["get_all_vacancies"]
+
+
+def test_merge_snapshot_from_other_registry():
+    worker = MetricsRegistry(buckets=(0.1, 1.0))
+    worker.inc("rows_total", 5, result="inserted")
+    worker.observe("latency_seconds", 0.5)
+    parent = MetricsRegistry(buckets=(0.1, 1.0))
+    parent.inc("rows_total", 2, result="inserted")
+    parent.observe("latency_seconds", 0.05)
+
+    parent.merge(worker.snapshot())
+
+    assert parent.get("rows_total", result="inserted") == 7
+    assert parent.get_histogram("latency_seconds") == {"count": 2, "sum": 0.55}
+    assert 'latency_seconds_bucket{le="0.1"} 1' in parent.to_prometheus()
@@ -0,0 +1,90 @@
+from datetime import date, datetime, timedelta, timezone
+
+from scr.create_db import DatabaseCreator
+from scr.partitions import (add_months, month_start, partition_name, partition_month, ensure_partitions,
+                            detach_old_partitions, ensure_partitions_for, move_default_rows)
+
+
+def test_month_arithmetic():
+    assert add_months(date(2024, 11, 1), 2) == date(2025, 1, 1)
+    assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+    # Начало февраля по Москве — еще январь по UTC, а границы секций заданы по UTC
+    moscow = timezone(timedelta(hours=3))
+    assert month_start(datetime(2025, 2, 1, 1, 0, tzinfo=moscow)) == date(2025, 1, 1)
+    assert partition_name(date(2025, 3, 1)) == "vacancies_p2025_03"
+    assert partition_month("vacancies_p2025_03") == date(2025, 3, 1)
+    assert partition_month("vacancies_default") is None
+
+
+def test_ensure_partitions_creates_missing_months(mocker):
+    cur = mocker.MagicMock()
+    cur.fetchall.return_value = [("vacancies_default",), ("vacancies_p2025_01",)]
+
+    created = ensure_partitions(cur, date(2024, 12, 15), date(2025, 2, 1))
+
+    assert created == ["vacancies_p2024_12", "vacancies_p2025_02"]
+    query = cur.execute.call_args.args[0]
+    assert "PARTITION OF vacancies FOR VALUES FROM ('2025-02-01 00:00:00+00') TO ('2025-03-01 00:00:00+00')" in query
+
+
+def test_ensure_partitions_for_batch_months(mocker):
+    cur = mocker.MagicMock()
+    cur.fetchall.return_value = [("vacancies_default",), ("vacancies_p2025_01",)]
+
+    # 1 января 01:00 по Москве — еще декабрь по UTC
+    created = ensure_partitions_for(cur, ["2025-01-01T01:00:00+0300", None, "2025-02-10T12:00:00+0300"])
+
+    assert created == ["vacancies_p2024_12", "vacancies_p2025_02"]
+    assert ensure_partitions_for(cur, [None]) == []
+
+
+def test_move_default_rows(mocker):
+    cur = mocker.MagicMock()
+    cur.fetchall.side_effect = [[(date(2024, 3, 1),)], [("vacancies_default",)]]
+
+    assert move_default_rows(cur) == ["vacancies_p2024_03"]
+
+    queries = [" ".join(call.args[0].split()) for call in cur.execute.call_args_list]
+    detach = queries.index("ALTER TABLE vacancies DETACH PARTITION vacancies_default")
+    create = next(i for i, query in enumerate(queries) if "vacancies_p2024_03 PARTITION OF" in query)
+    assert detach < create  # Секцию месяца нельзя создать, пока строки этого месяца лежат в секции по умолчанию
+    assert "ATTACH PARTITION vacancies_default DEFAULT" in queries[-1]
+
+
+def test_move_default_rows_noop_when_empty(mocker):
+    cur = mocker.MagicMock()
+    cur.fetchall.return_value = []
+    assert move_default_rows(cur) == []
+    assert cur.execute.call_count == 1
+
+
+def test_detach_old_partitions_keeps_active(mocker):
+    cur = mocker.MagicMock()
+    cur.fetchall.return_value = [("vacancies_default",), ("vacancies_p2024_10",), ("vacancies_p2024_11",),
+                                 ("vacancies_p2025_01",)]
+    cur.fetchone.side_effect = [(0,), (3,)]  # В ноябрьской секции остались неархивные вакансии
+
+    detached = detach_old_partitions(cur, keep_months=1, today=date(2025, 2, 10))
+
+    assert detached == ["vacancies_p2024_10"]
+    queries = [call.args[0] for call in cur.execute.call_args_list]
+    assert sum("DETACH PARTITION vacancies_p2024_10" in query for query in queries) == 1
+    assert not any("DETACH PARTITION vacancies_p2024_11" in query for query in queries)
+    # Подсчет неархивных вакансий ограничен месяцем секции
+    assert cur.execute.call_args_list[1].args[1] == ("2024-10-01 00:00:00+00", "2024-11-01 00:00:00+00")
+
+
+def test_partitioned_migration_upgrades_old_schema(mocker):
+    """Перед переносом в секционированную таблицу обычная таблица дополняется недостающими столбцами."""
+    connect = mocker.patch("scr.create_db.psycopg2.connect")
+    cur = connect.return_value.cursor.return_value
+    # Таблица есть, она не секционирована, данных нет
+    cur.fetchone.side_effect = [(True,), (False,), (None, None), (True,)]
+    cur.fetchall.return_value = []
+
+    DatabaseCreator("test", {}, partitioned=True).create_tables()
+
+    queries = [call.args[0] for call in cur.execute.call_args_list]
+    alter = next(i for i, query in enumerate(queries) if "ADD COLUMN IF NOT EXISTS published_at" in query)
+    rename = next(i for i, query in enumerate(queries) if "RENAME TO vacancies_unpartitioned" in query)
+    assert alter < rename
@@ -0,0 +1,86 @@
+import time
+
+import pytest
+
+from scr.metrics import MetricsRegistry
+from scr.pipeline import IngestPipeline
+
+
+def make_pages(pages_count, per_page=10, delay=0.0):
+    """Генерирует страницы (employer_id, номер страницы, вакансии), имитируя задержку ответа API."""
+    for page in range(pages_count):
+        time.sleep(delay)
+        yield 80, page, [{"id": str(page * per_page + i), "name": f"Vacancy {i}"} for i in range(per_page)]
+
+
+def test_pipeline_writes_all_rows_in_batches(mocker):
+    execute_values = mocker.patch("scr.loader.execute_values",
+                                  side_effect=lambda cur, query, rows, **kwargs: [(True,)] * len(rows))
+    pipeline = IngestPipeline(queue_size=2, batch_size=25)
+
+    stats = pipeline.run(mocker.MagicMock(), make_pages(10))
+
+    assert stats == {"inserted": 100, "updated": 0, "skipped": 0}
+    assert [len(call.args[2]) for call in execute_values.call_args_list] == [30, 30, 30, 10]
+    metrics = pipeline.get_metrics()
+    assert metrics["fetch"]["items"] == 10
+    assert metrics["parse"]["items"] == metrics["write"]["items"] == 100
+
+
+def test_pipeline_overlaps_fetch_and_write(mocker):
+    def slow_write(cur, query, rows, **kwargs):
+        time.sleep(0.05)
+        return [(True,)] * len(rows)
+
+    mocker.patch("scr.loader.execute_values", side_effect=slow_write)
+    pipeline = IngestPipeline(queue_size=2, batch_size=10)
+
+    start = time.perf_counter()
+    pipeline.run(mocker.MagicMock(), make_pages(10, delay=0.05))
+    elapsed = time.perf_counter() - start
+
+    # Последовательно заняло бы 10 * (0.05 + 0.05) = 1 с, в конвейере — примерно время одной стадии
+    assert elapsed < 0.8
+
+
+def test_pipeline_back_pressure(mocker):
+    fetched = []
+
+    def pages():
+        for page in make_pages(20):
+            fetched.append(page[1])
+            yield page
+
+    written = []
+
+    def slow_write(cur, query, rows, **kwargs):
+        written.append(len(fetched))
+        time.sleep(0.02)
+        return []
+
+    mocker.patch("scr.loader.execute_values", side_effect=slow_write)
+    IngestPipeline(queue_size=1, batch_size=10).run(mocker.MagicMock(), pages())
+
+    # Пока идет первая запись, получение страниц останавливается на заполненных очередях
+    assert written[0] < 20
+    assert len(written) == 20
+
+
+def test_pipeline_propagates_errors(mocker):
+    mocker.patch("scr.loader.execute_values", side_effect=RuntimeError("DB error"))
+    pipeline = IngestPipeline(queue_size=1, batch_size=10, poll_interval=0.01)
+
+    with pytest.raises(RuntimeError, match="DB error"):
+        pipeline.run(mocker.MagicMock(), make_pages(100))
+    assert pipeline.metrics["fetch"].items < 100  # Получение страниц остановлено после ошибки записи
+
+
+def test_pipeline_publishes_metrics(mocker):
+    mocker.patch("scr.loader.execute_values", side_effect=lambda cur, query, rows, **kwargs: [(True,)] * len(rows))
+    registry = MetricsRegistry()
+
+    IngestPipeline(batch_size=10, metrics=registry).run(mocker.MagicMock(), make_pages(3))
+
+    assert registry.get("ingest_stage_items_total", stage="fetch") == 3
+    assert registry.get("ingest_stage_items_total", stage="write") == 30
+    assert registry.get("ingest_rows_total", result="inserted") == 30
@@ -0,0 +1,60 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from scr.resilience import RateLimiter, CircuitBreaker, backoff_delay, parse_retry_after
+
+
+def test_rate_limiter_throughput():
+    limiter = RateLimiter(rate=50, capacity=5)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda _: limiter.acquire(), range(30)))
+    elapsed = time.perf_counter() - start
+    # 5 токенов доступны сразу, остальные 25 появляются со скоростью 50 в секунду
+    assert 0.45 <= elapsed < 1.0
+
+
+def test_circuit_breaker_states():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.state == "half-open"
+    assert breaker.allow()  # Пробный запрос
+    assert not breaker.allow()  # Второй запрос ждет результата пробного
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_circuit_breaker_failed_probe_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_backoff_delay():
+    assert all(0 <= backoff_delay(3, 0.5, 2.0) <= 2.0 for _ in range(100))
+    assert backoff_delay(0, 0.5, 2.0, retry_after=5) == 5
+    assert backoff_delay(0, 0.5, 2.0, retry_after=10 ** 9, max_retry_after=60) == 60
+    assert backoff_delay(0, 0.5, 2.0, retry_after=float("inf")) <= 0.5
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("3", 3.0),
+    (None, None),
+    ("garbage", None),
+    ("inf", None),
+    ("nan", None),
+    ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),  # Дата в прошлом
+])
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
@@ -0,0 +1,137 @@
+from datetime import timedelta
+
+import pytest
+
+from scr.sharded_ingest import claim_shard, enqueue_employers, ingest_worker, run_sharded_ingest
+from scr.sql_queries import get_complete_shard_query, get_fail_shard_query
+
+STATS = {"inserted": 2, "updated": 1, "skipped": 0, "archived": 1, "failed_employers": []}
+
+
+def test_claim_shard_skips_locked_rows(mocker):
+    cur = mocker.MagicMock()
+    cur.fetchall.return_value = [(3529,), (80,)]
+
+    shard = claim_shard(cur, "host:1", 10, timedelta(minutes=30), 3)
+
+    assert shard == [80, 3529]
+    query, params = cur.execute.call_args.args
+    assert "FOR UPDATE SKIP LOCKED" in query
+    assert params == {"worker": "host:1", "limit": 10, "lease": timedelta(minutes=30), "max_attempts": 3}
+
+
+def test_enqueue_employers_restarts_finished_round(mocker):
+    execute_values = mocker.patch("scr.sharded_ingest.execute_values")
+    cur = mocker.MagicMock()
+    cur.fetchall.return_value = [("pending", 2)]
+
+    assert enqueue_employers(cur, [80, 1740]) == {"pending": 2}
+    assert execute_values.call_args.args[2] == [(80,), (1740,)]
+    restart_query, restart_params = cur.execute.call_args_list[0].args
+    assert "SET status = 'pending'" in restart_query
+    assert restart_params == {"employer_ids": [80, 1740], "max_attempts": 3}
+
+
+def test_restart_includes_exhausted_failures():
+    """Работодатели, исчерпавшие попытки, не останавливают очередь: новый проход сбрасывает и их."""
+    from scr.sql_queries import get_restart_ingest_queue_query
+
+    query = " ".join(get_restart_ingest_queue_query().split())
+    assert "status IN ('done', 'failed')" in query
+    # Проход не начинается заново, пока есть работа: ожидающие, упавшие с попытками в запасе или в обработке
+    assert "(status = 'failed' AND attempts < %(max_attempts)s)" in query
+    assert "OR status = 'running'" in query
+
+
+def test_ingest_worker_commits_each_shard(mocker):
+    conn = mocker.patch("scr.sharded_ingest.psycopg2.connect").return_value
+    conn.closed = 0
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchall.side_effect = [[(80,), (1740,)], [(2180,)], []]  # Две порции, затем очередь пуста
+    mocker.patch("scr.sharded_ingest.bulk_upsert_employers")
+    mocker.patch("scr.sharded_ingest.IngestPipeline")
+    sync = mocker.patch("scr.sharded_ingest.sync_vacancies", side_effect=[dict(STATS), RuntimeError("API недоступен")])
+    hh_api = mocker.MagicMock()
+    hh_api.get_employers_names.return_value = {80: "Альфа-Банк", 1740: "Яндекс"}
+
+    totals = ingest_worker("test", {}, lambda: hh_api)
+
+    assert totals == {"inserted": 2, "updated": 1, "skipped": 0, "archived": 1, "shards": 1, "failed": 1}
+    assert [call.args[2] for call in sync.call_args_list] == [[80, 1740], [2180]]
+    queries = [call.args[0] for call in cur.execute.call_args_list]
+    assert sum("SET status = 'done'" in query for query in queries) == 1
+    assert sum("SET status = 'failed'" in query for query in queries) == 1
+    conn.rollback.assert_called_once()  # Данные упавшей порции не сохраняются
+    hh_api.close.assert_called_once()
+    conn.close.assert_called_once()
+
+
+def test_run_sharded_ingest_single_worker_runs_inline(mocker):
+    connect = mocker.patch("scr.sharded_ingest.psycopg2.connect")
+    cur = connect.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value
+    cur.fetchall.return_value = [("done", 2)]
+    mocker.patch("scr.sharded_ingest.enqueue_employers", return_value={"pending": 2})
+    worker = mocker.patch("scr.sharded_ingest.ingest_worker", return_value=dict(STATS, shards=1, failed=0))
+    factory = mocker.MagicMock()
+
+    totals = run_sharded_ingest("test", {}, [80, 1740], workers=1, hh_api_factory=factory, rates={"USD": 0.01})
+
+    worker.assert_called_once_with("test", {}, factory, {"USD": 0.01}, 10, timedelta(minutes=30), 3)
+    assert totals["inserted"] == 2 and totals["shards"] == 1
+    assert totals["queue"] == {"done": 2}
+
+
+def test_run_sharded_ingest_survives_crashed_worker(mocker):
+    from concurrent.futures import Future
+    from scr.metrics import MetricsRegistry
+
+    connect = mocker.patch("scr.sharded_ingest.psycopg2.connect")
+    cur = connect.return_value.__enter__.return_value.cursor.return_value.__enter__.return_value
+    cur.fetchall.return_value = [("done", 1), ("running", 1)]
+    mocker.patch("scr.sharded_ingest.enqueue_employers", return_value={"pending": 2})
+    worker_metrics = MetricsRegistry()
+    worker_metrics.inc("ingest_rows_total", 2, result="inserted")
+    succeeded, crashed = Future(), Future()
+    succeeded.set_result((dict(STATS, shards=1, failed=0), worker_metrics.snapshot()))
+    crashed.set_exception(ConnectionError("server closed the connection"))
+    executor = mocker.patch("scr.sharded_ingest.ProcessPoolExecutor").return_value.__enter__.return_value
+    executor.submit.side_effect = [succeeded, crashed]
+    metrics = MetricsRegistry()
+
+    totals = run_sharded_ingest("test", {}, [80, 1740], workers=2, hh_api_factory=mocker.MagicMock(),
+                                metrics=metrics)
+
+    assert totals["inserted"] == 2 and totals["shards"] == 1  # Счетчики успешного обработчика сохранены
+    assert totals["failed"] == 1
+    assert metrics.get("ingest_rows_total", result="inserted") == 2  # Метрики дочернего процесса получены
+
+
+def test_ingest_worker_fails_employers_with_api_errors(mocker):
+    """Ошибки API не видны как исключения: упавшими отмечаются работодатели, чьи страницы не получены."""
+    conn = mocker.patch("scr.sharded_ingest.psycopg2.connect").return_value
+    conn.closed = 0
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchall.side_effect = [[(80,), (1740,)], []]
+    mocker.patch("scr.sharded_ingest.bulk_upsert_employers")
+    mocker.patch("scr.sharded_ingest.IngestPipeline")
+    mocker.patch("scr.sharded_ingest.sync_vacancies", return_value=dict(STATS, failed_employers=[1740]))
+
+    totals = ingest_worker("test", {}, mocker.MagicMock)
+
+    assert totals["shards"] == 0 and totals["failed"] == 1
+    params = {query: params for query, params in (call.args for call in cur.execute.call_args_list)}
+    assert params[get_complete_shard_query()] == ([80],)
+    assert params[get_fail_shard_query()][1] == [1740]
+
+
+def test_ingest_worker_reraises_on_lost_connection(mocker):
+    """Если соединение потеряно, пробрасывается исходная ошибка, а не ошибка отката."""
+    conn = mocker.patch("scr.sharded_ingest.psycopg2.connect").return_value
+    conn.closed = 2
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchall.return_value = [(80,)]
+    mocker.patch("scr.sharded_ingest.bulk_upsert_employers", side_effect=ConnectionError("server closed"))
+
+    with pytest.raises(ConnectionError):
+        ingest_worker("test", {}, mocker.MagicMock)
+    conn.rollback.assert_not_called()
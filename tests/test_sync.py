@@ -0,0 +1,137 @@
+from datetime import datetime, timezone
+
+from scr.sync import archive_vanished_vacancies, sync_vacancies
+
+
+def test_archive_skipped_when_counts_match(mocker):
+    cur = mocker.MagicMock()
+    cur.fetchone.return_value = (5,)
+    hh_api = mocker.MagicMock()
+    hh_api.max_vacancies = None  # В базе все вакансии работодателя
+    hh_api.get_employer_vacancy_count.return_value = 5
+
+    assert archive_vanished_vacancies(cur, hh_api, 80) == 0
+    hh_api.get_employer_vacancy_ids.assert_not_called()  # Полный список ID не запрашивается
+
+
+def test_archive_compares_ids_when_counts_differ(mocker):
+    cur = mocker.MagicMock()
+    cur.fetchone.return_value = (3,)
+    cur.fetchall.return_value = [(1,), (2,), (4,)]
+    cur.rowcount = 1
+    hh_api = mocker.MagicMock()
+    hh_api.max_vacancies = None
+    hh_api.get_employer_vacancy_count.return_value = 2
+    hh_api.get_employer_vacancy_ids.return_value = {1, 2}
+
+    assert archive_vanished_vacancies(cur, hh_api, 80) == 1
+    assert cur.execute.call_args.args[1] == (80, [4])
+
+
+def test_archive_skipped_when_ids_match(mocker):
+    cur = mocker.MagicMock()
+    cur.fetchall.return_value = [(1,), (2,)]
+    hh_api = mocker.MagicMock()
+    hh_api.max_vacancies = 10
+    hh_api.get_employer_vacancy_ids.return_value = {1, 2, 3}  # Вакансия 3 еще не загружена
+
+    assert archive_vanished_vacancies(cur, hh_api, 80) == 0
+    assert cur.execute.call_count == 1  # Только чтение ID, без UPDATE
+
+
+def test_archive_vanished_vacancies(mocker):
+    cur = mocker.MagicMock()
+    cur.fetchall.return_value = [(1,), (4,), (5,)]
+    cur.rowcount = 2
+    hh_api = mocker.MagicMock()
+    hh_api.max_vacancies = 10  # В базе часть вакансий: количество не сравнивается
+    hh_api.get_employer_vacancy_ids.return_value = {1, 2, 3}  # Столько же вакансий, сколько в базе
+
+    assert archive_vanished_vacancies(cur, hh_api, 80) == 2
+    query, params = cur.execute.call_args.args
+    assert "SET archived = TRUE" in query
+    assert params == (80, [4, 5])
+
+
+def test_archive_skipped_without_full_id_list(mocker):
+    cur = mocker.MagicMock()
+    hh_api = mocker.MagicMock()
+    hh_api.max_vacancies = 10
+    hh_api.get_employer_vacancy_ids.return_value = None
+
+    assert archive_vanished_vacancies(cur, hh_api, 80) == 0
+    cur.execute.assert_not_called()
+
+
+def test_sync_vacancies_uses_watermarks(mocker):
+    cur = mocker.MagicMock()
+    cur.fetchall.return_value = [(80, datetime(2025, 2, 1, 7, 0, tzinfo=timezone.utc))]
+    hh_api = mocker.MagicMock()
+    hh_api.max_vacancies = 10
+    load = mocker.patch("scr.sync.load_vacancy_pages", return_value={"inserted": 1, "updated": 0, "skipped": 1})
+    mocker.patch("scr.sync.archive_vanished_vacancies", return_value=0)
+
+    stats = sync_vacancies(cur, hh_api, [80, 1740])
+
+    assert stats == {"inserted": 1, "updated": 0, "skipped": 1, "archived": 0, "failed_employers": []}
+    filters = hh_api.iter_employers_vacancy_pages.call_args.kwargs["filters"]
+    assert filters == {80: {"date_from": "2025-02-01T07:00:00+00:00"}}  # У 1740 отметки нет — полная загрузка
+    load.assert_called_once()
+    query, params = cur.execute.call_args.args
+    assert "INSERT INTO sync_state" in query  # Отметки обновлены в конце
+    assert params == ([80, 1740], "-infinity")  # У 1740 отметки нет — читаются все вакансии
+
+
+def test_sync_vacancies_unlimited_uses_partitions(mocker):
+    cur = mocker.MagicMock()
+    watermark = datetime(2025, 2, 1, 7, 0, tzinfo=timezone.utc)
+    cur.fetchall.return_value = [(80, watermark)]
+    hh_api = mocker.MagicMock()
+    hh_api.max_vacancies = None
+    mocker.patch("scr.sync.load_vacancy_pages", return_value={"inserted": 0, "updated": 0, "skipped": 0})
+    mocker.patch("scr.sync.archive_vanished_vacancies", return_value=0)
+
+    sync_vacancies(cur, hh_api, [80])
+
+    hh_api.iter_partitioned_vacancy_pages.assert_called_once_with([80], date_from={80: watermark}, failed=set())
+    hh_api.iter_employers_vacancy_pages.assert_not_called()
+    assert cur.execute.call_args.args[1] == ([80], watermark)  # Пересчет отметки не читает вакансии старше нее
+
+
+def test_sync_vacancies_keeps_watermark_of_failed_employer(mocker):
+    cur = mocker.MagicMock()
+    watermark = datetime(2025, 2, 1, 7, 0, tzinfo=timezone.utc)
+    cur.fetchall.return_value = [(80, watermark), (1740, watermark)]
+    hh_api = mocker.MagicMock()
+    hh_api.max_vacancies = 10
+
+    def pages(employer_ids, limit, filters, failed):
+        failed.add(1740)  # Страница работодателя 1740 не получена
+        return iter([])
+
+    hh_api.iter_employers_vacancy_pages.side_effect = pages
+    mocker.patch("scr.sync.load_vacancy_pages", return_value={"inserted": 0, "updated": 0, "skipped": 0})
+    archive = mocker.patch("scr.sync.archive_vanished_vacancies", return_value=0)
+
+    stats = sync_vacancies(cur, hh_api, [80, 1740])
+
+    assert stats["failed_employers"] == [1740]
+    archive.assert_called_once_with(cur, hh_api, 80)
+    assert cur.execute.call_args.args[1] == ([80], watermark)  # Отметка 1740 не сдвигается
+
+
+def test_sync_vacancies_runs_pages_through_pipeline(mocker):
+    cur = mocker.MagicMock()
+    cur.fetchall.return_value = []
+    hh_api = mocker.MagicMock()
+    hh_api.max_vacancies = 10
+    load = mocker.patch("scr.sync.load_vacancy_pages")
+    mocker.patch("scr.sync.archive_vanished_vacancies", return_value=0)
+    pipeline = mocker.MagicMock()
+    pipeline.run.return_value = {"inserted": 2, "updated": 0, "skipped": 0}
+
+    stats = sync_vacancies(cur, hh_api, [80], rates={"USD": 0.01}, pipeline=pipeline)
+
+    assert stats["inserted"] == 2
+    pipeline.run.assert_called_once_with(cur, hh_api.iter_employers_vacancy_pages.return_value, {"USD": 0.01})
+    load.assert_not_called()